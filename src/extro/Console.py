@@ -2,7 +2,10 @@
 
 import time
 import pyray
+from collections import deque
 from enum import Enum
+from itertools import islice
+from typing import Any
 
 import extro.Window as Window
 from extro.assets.Fonts import Arial
@@ -28,40 +31,52 @@ class LogType(Enum):
 TEXT_COLOR: RGBAColor = RGBAColor(255, 255, 255)
 BACKGROUND_COLOR: RGBAColor = RGBAColor(0, 0, 0, 150)
 
-logs: list[tuple[LogType, str]] = []
 is_visible: bool = False
 is_enabled: bool = True
 last_frame_at: float = time.perf_counter()
 max_log_count: int = 25
 log_priority: LogPriority = LogPriority.CUSTOM
+# Newest first, the oldest log falls off the end once `max_log_count` is reached. Messages are only formatted when drawn
+logs: "deque[tuple[LogType, str, tuple[Any, ...]]]" = deque(maxlen=max_log_count)
 
 
 def _trim_logs():
-    """Trim the logs to the maximum log count and remove logs above the current priority."""
+    """Remove logs above the current priority."""
     global logs
 
-    for log in list(logs):
-        priority, _, _ = log[0].value
+    # Logs are newest first, so the newest `max_log_count` are the first ones
+    kept = (entry for entry in logs if entry[0].value[0].value <= log_priority.value)
+    logs = deque(islice(kept, max_log_count), maxlen=max_log_count)
 
-        if priority.value > log_priority.value:
-            logs.remove(log)
 
-    if len(logs) > max_log_count:
-        logs = logs[:max_log_count]
+def log(text: str, type: LogType = LogType.DEBUG, *args: Any):
+    """
+    Print a message to the console.
 
+    Extra arguments are substituted into the `{}` fields of `text` only if the message is ever drawn, so hot paths should pass them instead of building an f-string. When the console is disabled this is a no-op.
+    """
+    # No need to save logs that are above the current log priority
+    if type.value[0].value > log_priority.value:
+        return
 
-def log(text: str, type: LogType = LogType.DEBUG):
-    """Print a message to the console."""
-    global logs
+    logs.appendleft((type, text, args))
 
-    [priority, _, _] = type.value
 
-    # No need to save logs that are above the current log priority
-    if priority.value > log_priority.value:
-        return
+def _discard(text: str, type: LogType = LogType.DEBUG, *args: Any):
+    pass
 
-    logs.insert(0, (type, text))
-    _trim_logs()
+
+_log = log
+
+
+def _format(text: str, args: "tuple[Any, ...]") -> str:
+    return text.format(*args) if len(args) > 0 else text
+
+
+def _update_log_function():
+    """Swap `log` for a function that does nothing while logs can never be shown."""
+    global log
+    log = _log if is_enabled and log_priority != LogPriority.NONE else _discard  # type: ignore
 
 
 def _draw():
@@ -79,11 +94,11 @@ def _draw():
     # Background
     pyray.draw_rectangle(0, 0, int(Window.size.x), int(Window.size.y), (0, 0, 0, 150))
 
-    for index, (type, text) in enumerate(logs):
+    for index, (type, text, args) in enumerate(logs):
         [_, prefix, color] = type.value
         pyray.draw_text_ex(
             Arial(),
-            f"[{prefix}]: {text}",
+            f"[{prefix}]: {_format(text, args)}",
             (0, int(Window.size.y - ((index + 1) * 20))),
             20,
             1,
@@ -118,15 +133,23 @@ def set_log_priority(priority: LogPriority):
     global log_priority
     log_priority = priority
     _trim_logs()
+    _update_log_function()
 
 
 def set_max_log_count(count: int):
     """Set the maximum number of logs to keep in memory."""
-    global max_log_count, logs
+    global max_log_count
     max_log_count = count
     _trim_logs()
 
 
+def set_enabled(enabled: bool):
+    """Enable or disable the console. While disabled, nothing is logged or drawn and `log` costs a single call."""
+    global is_enabled
+    is_enabled = enabled
+    _update_log_function()
+
+
 __all__ = [
     "is_enabled",
     "LogType",
@@ -134,5 +157,6 @@ __all__ = [
     "log",
     "set_log_priority",
     "set_max_log_count",
+    "set_enabled",
     "_draw",
 ]
@@ -64,8 +64,9 @@ class Tween(Instance, Generic[LerpableType]):
     def play(self, start: LerpableType | None = None, end: LerpableType | None = None):
         if self._is_active:
             Console.log(
-                f"Cannot play tween {self._id} because its already playing",
+                "Cannot play tween {} because its already playing",
                 Console.LogType.WARNING,
+                self._id,
             )
             return
 
@@ -88,8 +89,9 @@ class Tween(Instance, Generic[LerpableType]):
     def cancel(self):
         if not self._is_active:
             Console.log(
-                f"Cannot cancel tween {self._id} because its not playing",
+                "Cannot cancel tween {} because its not playing",
                 Console.LogType.WARNING,
+                self._id,
             )
             return
 
@@ -1,3 +1,5 @@
+from typing import TYPE_CHECKING, Any
+
 from extro.instances.core.Instance import Instance
 from extro.shared.RGBAColor import RGBAColor
 from extro.shared.Coord import Coord
@@ -6,6 +8,9 @@ from extro.instances.core.components.Drawable import Drawable
 from extro.instances.core.components.Transform import Transform
 from extro.instances.core.components.Hierarchy import Hierarchy
 
+if TYPE_CHECKING:
+    from extro.shared.types import BatchFunction
+
 
 class Renderable(Instance):
     __slots__ = Instance.__slots__ + ("drawable", "transform", "hierarchy")
@@ -14,6 +19,9 @@ class Renderable(Instance):
     transform: "Transform"
     hierarchy: "Hierarchy"
 
+    # Subclasses that can draw many instances in one pass set this to a static method taking those instances
+    draw_batch: "BatchFunction | None" = None
+
     def __init__(
         self,
         position: Coord,
@@ -44,6 +52,8 @@ class Renderable(Instance):
             color=color,
             zindex=zindex,
             is_visible=is_visible,
+            batch_command=self.draw_batch,
+            batch_key=type(self) if self.draw_batch is not None else None,
         )
         self.add_component(drawable)
         self.drawable = drawable
@@ -3,6 +3,7 @@ from typing import Any
 from extro.utils.Signal import Signal
 from extro.utils.Janitor import Janitor
 import extro.internal.InstanceManager as InstanceManager
+import extro.internal.CommandBuffer as CommandBuffer
 
 
 class Instance:
@@ -31,6 +32,10 @@ class Instance:
         self._janitor.add(self.on_destroy)
 
     def destroy(self):
+        # Destroying twice in the same frame only destroys once
+        if CommandBuffer.defer_once(self.destroy):
+            return
+
         self._janitor.destroy()
         InstanceManager.unregister(self._id)
 
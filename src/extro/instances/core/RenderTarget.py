@@ -4,14 +4,19 @@ from extro.instances.core.Instance import Instance
 from extro.internal.utils.BitMask import BitMask
 import extro.internal.systems.Render as RenderSystem
 import extro.services.Render as RenderService
-from extro.internal.utils.InstanceRegistry import InstanceRegistry
+from extro.internal.utils.InstanceRegistry import InstanceRegistry, batch_changes
 import extro.internal.InstanceManager as InstanceManager
 import extro.Console as Console
+import extro.internal.CommandBuffer as CommandBuffer
+from extro.internal.utils.SpatialHash import SpatialHash
+from extro.internal.utils.DrawOrder import DrawOrder
 
 if TYPE_CHECKING:
     from extro.instances.core.Instance import Instance
     import extro.internal.InstanceManager as InstanceManager
     from extro.instances.core.components.Hierarchy import Hierarchy
+    from extro.instances.core.components.Transform import Transform
+    from extro.instances.core.components.Drawable import Drawable
 
 
 def is_instance_valid(instance_id: "InstanceManager.InstanceID") -> bool:
@@ -31,6 +36,8 @@ class RenderTarget(Instance):
         "is_visible",
         "_zindex",
         "instances",
+        "_culling_index",
+        "_draw_order",
     )
 
     _id: int
@@ -39,7 +46,9 @@ class RenderTarget(Instance):
     _instances: InstanceRegistry
     _type: RenderService.RenderTargetType
     bitmask: BitMask
-    _render_order: "list[InstanceManager.InstanceID]"
+    _draw_order: DrawOrder
+    # Only world targets are culled against the camera
+    _culling_index: SpatialHash | None
 
     def __init__(
         self,
@@ -52,45 +61,74 @@ class RenderTarget(Instance):
         self._instances = InstanceRegistry(
             f"RenderTarget({self._id})",
             preregister_check=is_instance_valid,
-            on_list_change=lambda: self.bitmask.add_flag(
-                RenderSystem.RenderTargetDirtyFlags.RENDER_ORDER
-            ),
         )
         self._type = type
         self._zindex = zindex
         self.is_visible = is_visible
-        self.bitmask = BitMask()
-        self._render_order = []
+        self.bitmask = BitMask(RenderSystem.dirty_targets, self._id)
+        self._draw_order = DrawOrder(f"RenderTarget({self._id})")
+        self._culling_index = (
+            SpatialHash(RenderSystem.CULLING_CELL_SIZE)
+            if type == RenderService.RenderTargetType.WORLD
+            else None
+        )
 
         RenderSystem.render_targets.register(self._id)
 
     def destroy(self):
+        # Queued as a whole, otherwise only the base destroy would wait for the commit
+        if CommandBuffer.defer_once(self.destroy):
+            return
+
         super().destroy()
 
-        for instance_id in self._instances.instances[:]:
-            instance: "Instance" = InstanceManager.instances[instance_id]  # type: ignore
-            self.remove(instance)
+        with batch_changes():
+            for instance_id in list(self._instances.instances):
+                instance: "Instance" = InstanceManager.instances[instance_id]  # type: ignore
+                self.remove(instance)
 
         RenderSystem.render_targets.unregister(self._id)
+        RenderSystem.dirty_targets.discard(self._id)
 
     def add(self, instance: "Instance"):
+        if CommandBuffer.defer(self.add, instance):
+            return
+
         self._instances.register(instance._id)
 
         hierarchy: "Hierarchy | None" = instance.get_component("hierarchy")
-        if hierarchy and instance._id in self._instances.instances:
+        if hierarchy and instance._id in self._instances:
             hierarchy._render_target = self._id
+            drawable: "Drawable" = instance.get_component_unsafe("drawable")
+            self._draw_order.add(
+                instance._id, drawable._zindex, drawable._get_batch_group()
+            )
+
+            if self._culling_index is not None:
+                transform: "Transform" = instance.get_component_unsafe("transform")
+                self._culling_index.update(
+                    instance._id, *RenderSystem.get_drawn_bounds(transform)
+                )
 
             for child_id in hierarchy.children:
                 child_instance: "Instance" = InstanceManager.instances[child_id]  # type: ignore
                 self.add(child_instance)
 
     def remove(self, instance: "Instance"):
+        if CommandBuffer.defer(self.remove, instance):
+            return
+
         self._instances.unregister(instance._id)
 
         hierarchy: "Hierarchy | None" = instance.get_component("hierarchy")
-        if hierarchy and instance._id not in self._instances.instances:
+        if hierarchy and instance._id not in self._instances:
             hierarchy._render_target = None
 
+        self._draw_order.remove(instance._id)
+
+        if self._culling_index is not None:
+            self._culling_index.remove(instance._id)
+
     # A RenderTarget is an Instance, but it cannot have components
     def add_component(self, component: Any):
         Console.log("`RenderTarget` cannot have components", Console.LogType.ERROR)
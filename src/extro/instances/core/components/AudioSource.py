@@ -48,7 +48,11 @@ class AudioSource(Component):
         source_type: AudioService.AudioSourceType = AudioService.AudioSourceType.EFFECT,
         behavior: AudioService.AudioSourceBehaviorType = AudioService.AudioSourceBehaviorType.NON_SPATIAL,
     ):
-        super().__init__(owner, ComponentManager.ComponentType.AUDIO_SOURCE)
+        super().__init__(
+            owner,
+            ComponentManager.ComponentType.AUDIO_SOURCE,
+            AudioSystem.dirty_sources,
+        )
 
         self._volume = volume
         self._actual_volume = volume
@@ -64,6 +68,8 @@ class AudioSource(Component):
 
     def destroy(self):
         super().destroy()
+        AudioSystem.dirty_sources.discard(self._owner)
+        AudioSystem.playing_sources.discard(self._owner)
         self._unload()
 
     def _load(self):
@@ -113,8 +119,10 @@ class AudioSource(Component):
 
     def play(self):
         self._is_playing = True
+        AudioSystem.playing_sources.add(self._owner)
         self.add_flag(AudioSystem.AudioSourceDirtyFlags.IS_PLAYING)
 
     def stop(self):
         self._is_playing = False
+        AudioSystem.playing_sources.discard(self._owner)
         self.add_flag(AudioSystem.AudioSourceDirtyFlags.IS_PLAYING)
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 from extro.utils.Signal import Signal
 import extro.services.CollisionGroup as CollisionGroupService
+import extro.services.Physics as PhysicsService
 import extro.Console as Console
 from extro.instances.core.components.Component import Component
 import extro.internal.ComponentManager as ComponentManager
@@ -14,7 +15,10 @@ if TYPE_CHECKING:
 
 class Collider(Component):
     __slots__ = Component.__slots__ + (
-        "is_collidable",
+        "_is_collidable",
+        "_is_static",
+        "_shape",
+        "_points",
         "_collision_group",
         "on_collision",
         "on_collision_end",
@@ -22,7 +26,10 @@ class Collider(Component):
 
     _key = "collider"
 
-    is_collidable: bool
+    _is_collidable: bool
+    _is_static: bool
+    _shape: PhysicsService.ColliderShape
+    _points: list[Vector2]
     _collision_group: "CollisionGroupService.CollisionGroupID"
 
     on_collision: Signal
@@ -33,12 +40,12 @@ class Collider(Component):
         owner: "InstanceManager.InstanceID",
         is_collidable: bool = True,
         collision_group: str = CollisionGroupService.DEFAULT_COLLISION_GROUP,
+        is_static: bool = False,
+        shape: PhysicsService.ColliderShape = PhysicsService.ColliderShape.BOX,
+        points: list[Vector2] | None = None,
     ):
         super().__init__(owner, ComponentManager.ComponentType.COLLIDER)
 
-        self.is_collidable = is_collidable
-        self.collision_group = collision_group
-
         self.on_collision = Signal()
         self.on_collision_end = Signal()
 
@@ -48,8 +55,24 @@ class Collider(Component):
             transform._actual_size,
             transform._actual_position,
             transform._rotation,
+            is_collidable,
+            is_static,
+            CollisionGroupService.name_to_id(
+                CollisionGroupService.DEFAULT_COLLISION_GROUP
+            ),
         )
 
+        self._is_static = is_static
+        self._shape = PhysicsService.ColliderShape.BOX
+        self._points = []
+
+        if shape != PhysicsService.ColliderShape.BOX:
+            self.set_shape(shape, points)
+
+        # Both are synced to the collision mask by their setters
+        self.is_collidable = is_collidable
+        self.collision_group = collision_group
+
     def destroy(self):
         super().destroy()
 
@@ -57,6 +80,53 @@ class Collider(Component):
         self.on_collision_end.destroy()
         CollisionSolver.destroy_collision_mask(self._owner)
 
+    @property
+    def is_collidable(self) -> bool:
+        return self._is_collidable
+
+    @is_collidable.setter
+    def is_collidable(self, is_collidable: bool):
+        self._is_collidable = is_collidable
+        CollisionSolver.set_collidable(self._owner, is_collidable)
+
+    @property
+    def is_static(self) -> bool:
+        """Static colliders are kept apart from moving ones and never collide with each other. Use it for level geometry that rarely moves."""
+        return self._is_static
+
+    @is_static.setter
+    def is_static(self, is_static: bool):
+        self._is_static = is_static
+        CollisionSolver.set_static(self._owner, is_static)
+
+    @property
+    def shape(self) -> PhysicsService.ColliderShape:
+        return self._shape
+
+    @property
+    def points(self) -> list[Vector2]:
+        """Points of a `ColliderShape.POLYGON` shape, relative to the size of the transform."""
+        return self._points
+
+    def set_shape(
+        self, shape: PhysicsService.ColliderShape, points: list[Vector2] | None = None
+    ):
+        """Changes the shape used for collisions. `ColliderShape.POLYGON` needs between 3 and 8 points forming a convex polygon."""
+        points = points or []
+
+        if shape == PhysicsService.ColliderShape.POLYGON and not _is_convex(points):
+            Console.log(
+                "Collider polygons need 3 to 8 points forming a convex shape (got {} points). Keeping {}",
+                Console.LogType.ERROR,
+                len(points),
+                self._shape.name,
+            )
+            return
+
+        self._shape = shape
+        self._points = [point.copy() for point in points]
+        CollisionSolver.set_shape(self._owner, shape.value, self._points)
+
     @property
     def collision_group(self) -> str:
         return CollisionGroupService.id_to_name(self._collision_group)
@@ -65,9 +135,38 @@ class Collider(Component):
     def collision_group(self, collision_group: str):
         if not CollisionGroupService.is_group(collision_group):
             Console.log(
-                f"Collision group '{collision_group}' does not exist. Defaulting to '{CollisionGroupService.DEFAULT_COLLISION_GROUP}'",
+                "Collision group '{}' does not exist. Defaulting to '{}'",
                 Console.LogType.WARNING,
+                collision_group,
+                CollisionGroupService.DEFAULT_COLLISION_GROUP,
             )
             collision_group = CollisionGroupService.DEFAULT_COLLISION_GROUP
 
         self._collision_group = CollisionGroupService.name_to_id(collision_group)
+        CollisionSolver.set_collision_group(self._owner, self._collision_group)
+
+
+def _is_convex(points: list[Vector2]) -> bool:
+    count: int = len(points)
+
+    if count < 3 or count > 8:
+        return False
+
+    winding: float = 0
+
+    # Every turn has to go the same way
+    for index in range(count):
+        point1 = points[index]
+        point2 = points[(index + 1) % count]
+        point3 = points[(index + 2) % count]
+        turn: float = (point2.x - point1.x) * (point3.y - point2.y) - (
+            point2.y - point1.y
+        ) * (point3.x - point2.x)
+
+        if turn * winding < 0:
+            return False
+
+        if turn != 0:
+            winding = turn
+
+    return True
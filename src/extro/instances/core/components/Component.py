@@ -17,8 +17,9 @@ class Component(BitMask):
         self,
         owner: "InstanceManager.InstanceID",
         type: ComponentManager.ComponentType,
+        dirty_set: "set[InstanceManager.InstanceID] | None" = None,
     ):
-        super().__init__()
+        super().__init__(dirty_set, owner)
 
         self._owner = owner
         self._type = type
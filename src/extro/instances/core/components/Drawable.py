@@ -1,12 +1,14 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Hashable
 
 from extro.instances.core.components.Component import Component
 from extro.shared.RGBAColor import RGBAColor
 import extro.internal.ComponentManager as ComponentManager
+import extro.internal.InstanceManager as InstanceManager
 
 if TYPE_CHECKING:
-    from extro.shared.types import EmptyFunction
+    from extro.shared.types import EmptyFunction, BatchFunction
     import extro.internal.InstanceManager as InstanceManager
+    from extro.instances.core.RenderTarget import RenderTarget
 
 
 class Drawable(Component):
@@ -15,6 +17,8 @@ class Drawable(Component):
         "_zindex",
         "is_visible",
         "_render_command",
+        "_batch_command",
+        "_batch_key",
     )
 
     _key = "drawable"
@@ -23,6 +27,9 @@ class Drawable(Component):
     _zindex: int
     is_visible: bool
     _render_command: "EmptyFunction"
+    _batch_command: "BatchFunction | None"
+    # Drawables with the same key and batch command are drawn together, usually the texture they sample
+    _batch_key: Hashable | None
 
     def __init__(
         self,
@@ -31,14 +38,42 @@ class Drawable(Component):
         color: RGBAColor = RGBAColor(255, 255, 255),
         zindex: int = 0,
         is_visible: bool = True,
+        batch_command: "BatchFunction | None" = None,
+        batch_key: Hashable | None = None,
     ):
         super().__init__(owner, ComponentManager.ComponentType.DRAWABLE)
 
         self._render_command = render_command
+        self._batch_command = batch_command
+        self._batch_key = batch_key
         self.color = color
         self._zindex = zindex
         self.is_visible = is_visible
 
+    def _get_batch_group(self) -> Hashable:
+        """Drawables in the same group are drawn in one batch. Drawables without a batch command are their own group."""
+        if self._batch_command is None:
+            return self._owner
+
+        return (self._batch_command, self._batch_key)
+
+    def _update_draw_order(self):
+        hierarchy = ComponentManager.hierarchies.get(self._owner)
+
+        if hierarchy is None or hierarchy._render_target is None:
+            return
+
+        render_target: "RenderTarget | None" = InstanceManager.instances.get(hierarchy._render_target)  # type: ignore
+
+        if render_target is not None:
+            render_target._draw_order.move(
+                self._owner, self._zindex, self._get_batch_group()
+            )
+
+    def _set_batch_key(self, batch_key: Hashable | None):
+        self._batch_key = batch_key
+        self._update_draw_order()
+
     @property
     def zindex(self) -> int:
         return self._zindex
@@ -46,3 +81,4 @@ class Drawable(Component):
     @zindex.setter
     def zindex(self, zindex: int):
         self._zindex = zindex
+        self._update_draw_order()
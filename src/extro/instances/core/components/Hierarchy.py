@@ -5,6 +5,7 @@ import extro.internal.ComponentManager as ComponentManager
 from extro.instances.core.Instance import Instance
 import extro.Console as Console
 import extro.internal.InstanceManager as InstanceManager
+import extro.internal.CommandBuffer as CommandBuffer
 
 if TYPE_CHECKING:
     from extro.instances.core.RenderTarget import RenderTarget
@@ -34,6 +35,7 @@ class Hierarchy(Component):
 
         self._owner = owner
         self._children = []
+        self._parent = None
         self.parent = parent
         self._render_target = None
 
@@ -53,20 +55,24 @@ class Hierarchy(Component):
 
     @parent.setter
     def parent(self, parent: Instance | None):
-        if parent is None:
+        if CommandBuffer.defer(Hierarchy.parent.fset, self, parent):  # type: ignore
+            return
+        elif parent is None:
             self._parent = None
             return
 
         if parent._id not in ComponentManager.hierarchies:
             Console.log(
-                f"Cannot set parent to instance {parent._id} as it has no Hierarchy component",
+                "Cannot set parent to instance {} as it has no Hierarchy component",
                 Console.LogType.ERROR,
+                parent._id,
             )
             return
         elif parent._id == self._owner:
             Console.log(
-                f"Cannot set parent to instance {parent._id} as it is the same as the owner",
+                "Cannot set parent to instance {} as it is the same as the owner",
                 Console.LogType.ERROR,
+                parent._id,
             )
             return
 
@@ -78,16 +84,20 @@ class Hierarchy(Component):
         return self._children
 
     def add_child(self, child: Instance):
-        if child._id not in ComponentManager.hierarchies:
+        if CommandBuffer.defer(self.add_child, child):
+            return
+        elif child._id not in ComponentManager.hierarchies:
             Console.log(
-                f"Cannot add child instance {child._id} as it has no Hierarchy component",
+                "Cannot add child instance {} as it has no Hierarchy component",
                 Console.LogType.ERROR,
+                child._id,
             )
             return
         elif child._id == self._owner:
             Console.log(
-                f"Cannot add child instance {child._id} as it is the same as the owner",
+                "Cannot add child instance {} as it is the same as the owner",
                 Console.LogType.ERROR,
+                child._id,
             )
             return
 
@@ -95,10 +105,14 @@ class Hierarchy(Component):
         ComponentManager.hierarchies[child._id]._parent = self._owner
 
     def remove_child(self, child: Instance):
-        if child._id not in self._children:
+        if CommandBuffer.defer(self.remove_child, child):
+            return
+        elif child._id not in self._children:
             Console.log(
-                f"Cannot remove child instance {child._id} as it is not a child of owner {self._owner}",
+                "Cannot remove child instance {} as it is not a child of owner {}",
                 Console.LogType.ERROR,
+                child._id,
+                self._owner,
             )
             return
 
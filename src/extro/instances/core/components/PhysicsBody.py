@@ -19,8 +19,7 @@ class PhysicsBody(Component):
         "_mass",
         "_inverse_mass",
         "_is_anchored",
-        "_forces",
-        "_impulses",
+        "_is_bullet",
         "_velocity",
         "_body_type",
         "_angular_velocity",
@@ -33,8 +32,7 @@ class PhysicsBody(Component):
     _mass: float
     _inverse_mass: float
     _is_anchored: bool
-    _forces: list[tuple[Vector2, Vector2]]
-    _impulses: list[tuple[Vector2, Vector2]]
+    _is_bullet: bool
     _velocity: Vector2
     _angular_velocity: Angle
     _body_type: PhysicsService.PhysicsBodyType
@@ -47,11 +45,14 @@ class PhysicsBody(Component):
         restitution: float = PhysicsSystem.DEFAULT_RESTITUTION,
         is_anchored: bool = False,
         body_type: PhysicsService.PhysicsBodyType = PhysicsService.PhysicsBodyType.DYNAMIC,
+        is_bullet: bool = False,
     ):
-        super().__init__(owner, ComponentManager.ComponentType.PHYSICS_BODY)
+        super().__init__(
+            owner,
+            ComponentManager.ComponentType.PHYSICS_BODY,
+            PhysicsSystem.dirty_bodies,
+        )
 
-        self._forces = []
-        self._impulses = []
         self._velocity = Vector2(0, 0)
         self._angular_velocity = Angle(0)
         self.mass = mass
@@ -69,12 +70,19 @@ class PhysicsBody(Component):
             self._angular_velocity,
         )
 
+        # Synced to the solver by its setter, so it has to come after the body exists
+        self.is_bullet = is_bullet
+
     def destroy(self):
         super().destroy()
 
-        self._forces.clear()
+        PhysicsSystem.dirty_bodies.discard(self._owner)
         PhysicsSolver.destroy_physics_body(self._owner)
 
+    def _wake(self):
+        if not self._is_anchored:
+            PhysicsSolver.wake(self._owner)
+
     def add_force(self, force: Vector2, point: Vector2 = Vector2(0.5, 0.5)):
         """Applies a continuous force to the physics body."""
         if force.magnitude() == 0:
@@ -84,7 +92,9 @@ class PhysicsBody(Component):
             )
             return
 
-        self._forces.append((force.copy(), Vector2(point.x - 0.5, point.y - 0.5)))
+        PhysicsSolver.add_force(
+            self._owner, force, Vector2(point.x - 0.5, point.y - 0.5)
+        )
 
     def add_impulse(self, impulse: Vector2, point: Vector2 = Vector2(0.5, 0.5)):
         """Applies an instantaneous change in velocity to the physics body."""
@@ -95,11 +105,13 @@ class PhysicsBody(Component):
             )
             return
 
-        self._impulses.append((impulse.copy(), Vector2(point.x - 0.5, point.y - 0.5)))
+        PhysicsSolver.add_impulse(
+            self._owner, impulse, Vector2(point.x - 0.5, point.y - 0.5)
+        )
 
     def clear_forces(self):
         """Clears all forces applied to the physics body."""
-        self._forces.clear()
+        PhysicsSolver.clear_forces(self._owner)
 
     @property
     def body_type(self) -> PhysicsService.PhysicsBodyType:
@@ -120,6 +132,13 @@ class PhysicsBody(Component):
 
     @is_anchored.setter
     def is_anchored(self, is_anchored: bool):
+        self._anchor(is_anchored)
+
+        if is_anchored:
+            self.clear_forces()
+
+    def _anchor(self, is_anchored: bool):
+        """Anchors or frees the body but keeps its forces, pooled instances get their gravity back once they are reused."""
         self._is_anchored = is_anchored
         self.add_flag(PhysicsSystem.PhysicsBodyDirtyFlags.MASS)
 
@@ -127,12 +146,30 @@ class PhysicsBody(Component):
             self._velocity.x = 0
             self._velocity.y = 0
             self._angular_velocity.radians = 0
-            self.clear_forces()
 
     @property
     def is_dynamic(self) -> bool:
         return self._is_dynamic
 
+    @property
+    def is_bullet(self) -> bool:
+        """Bullets sweep their movement against other colliders so they cannot pass through them at high speed. Only enable it for small, fast bodies."""
+        return self._is_bullet
+
+    @is_bullet.setter
+    def is_bullet(self, is_bullet: bool):
+        self._is_bullet = is_bullet
+        PhysicsSolver.set_bullet(self._owner, is_bullet)
+
+    @property
+    def is_sleeping(self) -> bool:
+        """Bodies that rested long enough are put to sleep together with the bodies they touch, until a force, an impulse or a collision wakes them."""
+        return PhysicsSolver.is_sleeping(self._owner)
+
+    def wake(self):
+        """Wakes the body and every body sleeping with it."""
+        self._wake()
+
     @property
     def restitution(self) -> float:
         return self._restitution
@@ -150,6 +187,7 @@ class PhysicsBody(Component):
     def velocity(self, velocity: Vector2):
         self._velocity.x = velocity.x
         self._velocity.y = velocity.y
+        self._wake()
     
     @property
     def angular_velocity(self) -> Angle:
@@ -158,3 +196,4 @@ class PhysicsBody(Component):
     @angular_velocity.setter
     def angular_velocity(self, angular_velocity: float):
         self._angular_velocity.degrees = angular_velocity
+        self._wake()
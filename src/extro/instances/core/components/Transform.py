@@ -7,6 +7,7 @@ from extro.shared.Coord import Coord
 import extro.shared.Angle as Angle
 import extro.Console as Console
 import extro.internal.systems.Transform as TransformSystem
+import extro.internal.systems.Transform.TransformSolver as TransformSolver
 import extro.internal.ComponentManager as ComponentManager
 
 if TYPE_CHECKING:
@@ -22,6 +23,7 @@ class Transform(Component):
         "_anchor",
         "_position_offset",
         "_bounding",
+        "_render_bounding",
         "_actual_position",
         "_actual_size",
         "_parent",
@@ -38,6 +40,8 @@ class Transform(Component):
     _anchor: Vector2
     _position_offset: list[float]
     _bounding: list[float]
+    # Same list as `_bounding`, unless the physics system is interpolating between fixed steps
+    _render_bounding: list[float]
     _actual_position: Vector2
     _actual_size: Vector2
     _parent: "InstanceManager.InstanceID | None"
@@ -54,7 +58,11 @@ class Transform(Component):
         scale: Vector2 = Vector2(1, 1),
         anchor: Vector2 = Vector2(0, 0),
     ):
-        super().__init__(owner, ComponentManager.ComponentType.TRANSFORM)
+        super().__init__(
+            owner,
+            ComponentManager.ComponentType.TRANSFORM,
+            TransformSystem.dirty_transforms,
+        )
 
         self._position = position
         self._size = size
@@ -63,17 +71,24 @@ class Transform(Component):
         self._anchor = anchor
         self._position_offset = [0.0, 0.0]
         self._bounding = [0.0, 0.0, 0.0, 0.0]
+        self._render_bounding = self._bounding
         self._actual_position = Vector2(0, 0)
         self._actual_size = Vector2(0, 0)
 
         self.on_update = Signal()
 
+        TransformSolver.create_transform(
+            owner, self._actual_size, self._actual_position
+        )
+
         # Force an initial calculation, only need size because it will trigger position recalculation
         self.add_flag(TransformSystem.TransformDirtyFlags.SIZE)
 
     def destroy(self):
         super().destroy()
         self.on_update.destroy()
+        TransformSystem.dirty_transforms.discard(self._owner)
+        TransformSolver.destroy_transform(self._owner)
 
     def translate(self, translation: Coord):
         self._position.absolute_x += translation.absolute_x
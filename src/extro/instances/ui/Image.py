@@ -82,7 +82,7 @@ class Image(UIInstance):
         self._image_file = image_file
         self._load_texture()
         Console.log(
-            f"{self.id} image was changed to {image_file}", Console.LogType.DEBUG
+            "{} image was changed to {}", Console.LogType.DEBUG, self.id, image_file
         )
 
     @property
@@ -6,8 +6,21 @@ from extro.instances.core.Instance.Renderable import Renderable
 class Rectangle(Renderable):
     def draw(self):
         pyray.draw_rectangle_pro(
-            self.transform._bounding,
+            self.transform._render_bounding,
             self.transform._position_offset,
             self.transform.rotation,
             self.drawable.color.list,
         )
+
+    @staticmethod
+    def draw_batch(rectangles: "list[Rectangle]"):
+        draw_rectangle_pro = pyray.draw_rectangle_pro
+
+        for rectangle in rectangles:
+            transform = rectangle.transform
+            draw_rectangle_pro(
+                transform._render_bounding,
+                transform._position_offset,
+                transform._rotation.degrees,
+                rectangle.drawable.color.list,
+            )
@@ -47,12 +47,27 @@ class Sprite(Renderable):
         pyray.draw_texture_pro(
             self._texture,
             self._texture_source,
-            self.transform._bounding,
+            self.transform._render_bounding,
             self.transform._position_offset,
             self.transform.rotation,
             self.drawable.color.list,
         )
 
+    @staticmethod
+    def draw_batch(sprites: "list[Sprite]"):
+        draw_texture_pro = pyray.draw_texture_pro
+
+        for sprite in sprites:
+            transform = sprite.transform
+            draw_texture_pro(
+                sprite._texture,
+                sprite._texture_source,
+                transform._render_bounding,
+                transform._position_offset,
+                transform._rotation.degrees,
+                sprite.drawable.color.list,
+            )
+
     def _unload_texture(self):
         if getattr(self, "texture", None) is None:
             return
@@ -67,6 +82,8 @@ class Sprite(Renderable):
             self._texture, pyray.TextureFilter.TEXTURE_FILTER_POINT
         )
         pyray.set_texture_wrap(self._texture, pyray.TextureWrap.TEXTURE_WRAP_CLAMP)
+        # Sprites sharing a texture are batched together
+        self.drawable._set_batch_key(self._texture.id)
 
         if self._use_texture_for_source_size:
             self._texture_source.width = self._texture.width
@@ -80,7 +97,9 @@ class Sprite(Renderable):
     def image(self, image_file: str):
         self._image_file = image_file
         self._load_texture()
-        Console.log(f"{self.id} image was changed to {image_file}")
+        Console.log(
+            "{} image was changed to {}", Console.LogType.DEBUG, self.id, image_file
+        )
 
     @property
     def source_position(self) -> Vector2:
@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING, Any
+
+import extro.Console as Console
+
+if TYPE_CHECKING:
+    from extro.shared.types import EmptyFunction
+
+# When enabled, destroys, `InstanceRegistry` (un)registration, render target membership and reparenting are queued during the frame and applied together by `commit`.
+# Spawning instances and adding or removing components stay immediate
+is_deferring: bool = False
+_is_committing: bool = False
+_commands: "list[tuple[EmptyFunction, tuple[Any, ...]]]" = []
+# Commands queued through `defer_once`, so the same command is not queued twice before a commit
+_unique_commands: "set[tuple[EmptyFunction, tuple[Any, ...]]]" = set()
+
+
+def defer(command: "EmptyFunction", *args: Any) -> bool:
+    """
+    Queue `command(*args)` for the next commit if structural changes are deferred.
+
+    Returns whether the command was queued, callers apply the change themselves otherwise. Commands run during a commit are never queued, so a command can safely call the method that queued it.
+    """
+    if not is_deferring or _is_committing:
+        return False
+
+    _commands.append((command, args))
+    return True
+
+
+def defer_once(command: "EmptyFunction", *args: Any) -> bool:
+    """Same as `defer`, but a command that is already queued with the same arguments is not queued again."""
+    if not is_deferring or _is_committing:
+        return False
+
+    if (command, args) not in _unique_commands:
+        _unique_commands.add((command, args))
+        _commands.append((command, args))
+
+    return True
+
+
+def commit():
+    """Apply every queued structural change in order, notifying each changed registry once."""
+    # Imported here since `InstanceRegistry` queues its own changes through this module
+    import extro.internal.utils.InstanceRegistry as InstanceRegistry
+
+    global _is_committing
+
+    if len(_commands) == 0:
+        return
+
+    _is_committing = True
+
+    try:
+        with InstanceRegistry.batch_changes():
+            for command, args in _commands:
+                command(*args)
+    finally:
+        _commands.clear()
+        _unique_commands.clear()
+        _is_committing = False
+
+
+def set_deferring(enabled: bool):
+    global is_deferring
+
+    if not enabled:
+        commit()
+
+    is_deferring = enabled
+    Console.log(
+        "Structural changes are {}",
+        Console.LogType.DEBUG,
+        "deferred to the end of the frame" if enabled else "applied immediately",
+    )
@@ -24,6 +24,8 @@ class ComponentType(Enum):
     AUDIO_SOURCE = auto()
 
 
+# Components are kept as objects rather than in typed columns. The native solvers hold shared pointers to their Vector2 and
+# Angle fields and read them in place, and systems only visit their dirty sets, so a columnar copy would only be written to
 transforms: "dict[InstanceManager.InstanceID, Transform]" = {}
 colliders: "dict[InstanceManager.InstanceID, Collider]" = {}
 drawables: "dict[InstanceManager.InstanceID, Drawable]" = {}
@@ -45,7 +47,13 @@ component_list_map: "dict[ComponentType, dict[InstanceManager.InstanceID, Any]]"
 
 def register(instance_id: "InstanceManager.InstanceID", type: ComponentType, component):
     component_list_map[type][instance_id] = component
-    Console.log(f"Registered component {type.name} for instance {instance_id}")
+
+    Console.log(
+        "Registered component {} for instance {}",
+        Console.LogType.DEBUG,
+        type.name,
+        instance_id,
+    )
 
 
 def unregister(instance_id: "InstanceManager.InstanceID", type: ComponentType):
@@ -53,10 +61,18 @@ def unregister(instance_id: "InstanceManager.InstanceID", type: ComponentType):
 
     if instance_id not in component_list:
         Console.log(
-            f"Instance {instance_id} has no component {type.name}",
+            "Instance {} has no component {}",
             Console.LogType.ERROR,
+            instance_id,
+            type.name,
         )
         return
 
     del component_list[instance_id]
-    Console.log(f"Unregistered component {type.name} for instance {instance_id}")
+
+    Console.log(
+        "Unregistered component {} for instance {}",
+        Console.LogType.DEBUG,
+        type.name,
+        instance_id,
+    )
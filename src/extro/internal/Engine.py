@@ -13,6 +13,10 @@ import extro.internal.systems.Collision as CollisionSystem
 import extro.internal.systems.Physics as PhysicsSystem
 import extro.internal.systems.Timing as TimingSystem
 import extro.internal.InstanceManager as InstanceManager
+import extro.internal.CommandBuffer as CommandBuffer
+from extro.internal.utils.InstanceRegistry import batch_changes
+import extro.services.Physics as PhysicsService
+import extro.services.Timing as TimingService
 import extro.Window as Window
 import extro.Profiler as Profiler
 
@@ -27,6 +31,56 @@ def run_system(update: "AnyFunction", system_name: str, *args: Any) -> Any:
     return result
 
 
+# Transforms updated since the last fixed step, they still have to go through collision detection
+pending_transform_updates: "TransformSystem.TransformUpdates" = []
+
+
+def step_physics(transform_updates: "TransformSystem.TransformUpdates"):
+    global pending_transform_updates
+
+    fixed_timestep: float = PhysicsService.fixed_timestep
+
+    pending_transform_updates.extend(transform_updates)
+
+    if fixed_timestep <= 0:
+        collisions_data: "CollisionSystem.CollisionsData" = run_system(
+            CollisionSystem.update,
+            "collision",
+            list(dict.fromkeys(pending_transform_updates)),
+        )
+        pending_transform_updates = []
+        run_system(
+            PhysicsSystem.update, "physics", collisions_data, TimingService.delta
+        )
+        PhysicsService.interpolation_alpha = 1
+        PhysicsSystem.interpolate(1)
+        return
+
+    accumulator: float = PhysicsService.accumulator + TimingService.delta
+    substeps: int = 0
+
+    while accumulator >= fixed_timestep and substeps < PhysicsService.max_substeps:
+        collisions_data = run_system(
+            CollisionSystem.update,
+            "collision",
+            list(dict.fromkeys(pending_transform_updates)),
+        )
+        run_system(PhysicsSystem.update, "physics", collisions_data, fixed_timestep)
+
+        # The next step has to see where this one moved everything
+        pending_transform_updates = run_system(TransformSystem.update, "transform")
+        accumulator -= fixed_timestep
+        substeps += 1
+
+    # Drop the time that could not be simulated instead of trying to catch up on it next frame
+    if substeps == PhysicsService.max_substeps:
+        accumulator = min(accumulator, fixed_timestep)
+
+    PhysicsService.accumulator = accumulator
+    PhysicsService.interpolation_alpha = accumulator / fixed_timestep
+    PhysicsSystem.interpolate(PhysicsService.interpolation_alpha)
+
+
 def start():
     while not pyray.window_should_close():
         # The order matters, aka dont change it :)
@@ -37,25 +91,25 @@ def start():
             TransformSystem.update, "transform"
         )
 
-        collisions_data: "CollisionSystem.CollisionsData" = run_system(
-            CollisionSystem.update, "collision", transform_updates
-        )
-
-        run_system(PhysicsSystem.update, "physics", collisions_data)
+        step_physics(transform_updates)
 
         # If any transform changes happen because of UI events, they will be applied next frame
         run_system(UISystem.update, "ui")
         run_system(AnimationSystem.update, "animation")
         run_system(RenderSystem.render, "render")
         run_system(AudioSystem.update, "audio")
+        run_system(CommandBuffer.commit, "commit")
 
     quit()
 
 
 def quit():
-    # Destroy all instances to prevent memory leaks
-    for instance in list(InstanceManager.instances.values()):
-        instance.destroy()
+    # Destroy all instances to prevent memory leaks, right away instead of at the end of a frame that will never come
+    CommandBuffer.set_deferring(False)
+
+    with batch_changes():
+        for instance in list(InstanceManager.instances.values()):
+            instance.destroy()
 
     AudioSystem.quit()
     Window.close()
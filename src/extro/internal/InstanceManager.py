@@ -15,15 +15,19 @@ def register(instance: "Instance"):
     id: "InstanceID" = IdentityService.generate_ordered_numeric_id()
     instance._id = id
     instances[id] = instance
-    Console.log(f"Registered instance {id}")
+    Console.log("Registered instance {}", Console.LogType.DEBUG, id)
 
 
 def unregister(instance_id: "InstanceID"):
     global instances
 
     if instance_id not in instances:
-        Console.log(f"Instance {instance_id} is not an instance", Console.LogType.ERROR)
+        Console.log(
+            "Instance {} is not an instance", Console.LogType.ERROR, instance_id
+        )
         return
 
     del instances[instance_id]
-    Console.log(f"Instance {instance_id} has been unregistered", Console.LogType.DEBUG)
+    Console.log(
+        "Instance {} has been unregistered", Console.LogType.DEBUG, instance_id
+    )
@@ -23,7 +23,7 @@ tweens: InstanceRegistry = InstanceRegistry(
 
 
 def update():
-    for instance_id in tweens.instances[:]:
+    for instance_id in tweens.snapshot():
         instance: "Tween" = InstanceManager.instances[instance_id]  # type: ignore
 
         if not instance._is_active:
@@ -7,6 +7,9 @@ import extro.services.Audio as AudioService
 import extro.services.World as WorldService
 from extro.shared.Vector2 import Vector2
 
+if TYPE_CHECKING:
+    import extro.internal.InstanceManager as InstanceManager
+
 pyray.init_audio_device()
 
 AUDIO_DROPOFF_DISTANCE: float = 1000.0
@@ -19,65 +22,95 @@ class AudioSourceDirtyFlags(IntFlag):
     IS_PLAYING = auto()
 
 
+# Sources with pending volume, pitch or playback changes
+dirty_sources: "set[InstanceManager.InstanceID]" = set()
+# Sources that are currently playing and need to be polled every frame
+playing_sources: "set[InstanceManager.InstanceID]" = set()
+
+
 def update():
     camera_position: Vector2 = (
         WorldService.camera.position if WorldService.camera else Vector2(0, 0)
     )
 
-    for instance_id, source in ComponentManager.audio_sources.items():
-        if not source._is_playing:
+    for instance_id in playing_sources:
+        source = ComponentManager.audio_sources[instance_id]
+
+        if source._behavior != AudioService.AudioSourceBehaviorType.SPATIAL:
             continue
 
-        if source._behavior == AudioService.AudioSourceBehaviorType.SPATIAL:
-            transform = ComponentManager.transforms.get(instance_id)
+        transform = ComponentManager.transforms.get(instance_id)
 
-            if transform:
-                initial_volume: float = source._volume
-                distance: float = (camera_position - transform._position).magnitude()
-                dropoff_volume: float = max(
-                    1 - (distance / AUDIO_DROPOFF_DISTANCE) * AUDIO_DROPOFF_RATE, 0
-                )
-                final_volume: float = initial_volume * dropoff_volume
+        if transform:
+            initial_volume: float = source._volume
+            distance: float = (camera_position - transform._position).magnitude()
+            dropoff_volume: float = max(
+                1 - (distance / AUDIO_DROPOFF_DISTANCE) * AUDIO_DROPOFF_RATE, 0
+            )
+            final_volume: float = initial_volume * dropoff_volume
 
-                if initial_volume != final_volume:
-                    source._actual_volume = final_volume
-                    source.add_flag(AudioSourceDirtyFlags.VOLUME)
+            if initial_volume != final_volume:
+                source._actual_volume = final_volume
+                source.add_flag(AudioSourceDirtyFlags.VOLUME)
 
-        if not source.is_empty():
-            if source.has_flag(AudioSourceDirtyFlags.VOLUME):
-                source.remove_flag(AudioSourceDirtyFlags.VOLUME)
+    just_started: "set[InstanceManager.InstanceID]" = set()
 
-                if source._source_type == AudioService.AudioSourceType.STREAM:
-                    pyray.set_music_volume(source._audio, source._actual_volume)
-                else:
-                    pyray.set_sound_volume(source._audio, source._actual_volume)
-            if source.has_flag(AudioSourceDirtyFlags.PITCH):
-                source.remove_flag(AudioSourceDirtyFlags.PITCH)
+    for instance_id in dirty_sources:
+        source = ComponentManager.audio_sources.get(instance_id)
+
+        if source is None or source.is_empty():
+            continue
+
+        is_stream: bool = source._source_type == AudioService.AudioSourceType.STREAM
+
+        if source.has_flag(AudioSourceDirtyFlags.VOLUME):
+            if is_stream:
+                pyray.set_music_volume(source._audio, source._actual_volume)
+            else:
+                pyray.set_sound_volume(source._audio, source._actual_volume)
 
-                if source._source_type == AudioService.AudioSourceType.STREAM:
-                    pyray.set_music_pitch(source._audio, source._pitch)
+        if source.has_flag(AudioSourceDirtyFlags.PITCH):
+            if is_stream:
+                pyray.set_music_pitch(source._audio, source._pitch)
+            else:
+                pyray.set_sound_pitch(source._audio, source._pitch)
+
+        if source.has_flag(AudioSourceDirtyFlags.IS_PLAYING):
+            if source._is_playing:
+                just_started.add(instance_id)
+
+                if is_stream:
+                    pyray.play_music_stream(source._audio)
                 else:
-                    pyray.set_sound_pitch(source._audio, source._pitch)
+                    pyray.play_sound(source._audio)
+            elif is_stream:
+                pyray.stop_music_stream(source._audio)
+            else:
+                pyray.stop_sound(source._audio)
+
+        source.clear_flags()
 
+    dirty_sources.clear()
+
+    for instance_id in list(playing_sources):
+        # Give sources a frame to start before checking if they finished
+        if instance_id in just_started:
+            continue
+
+        source = ComponentManager.audio_sources[instance_id]
         just_finished: bool = False
 
-        if source.source_type == AudioService.AudioSourceType.STREAM:
-            if source.has_flag(AudioSourceDirtyFlags.IS_PLAYING):
-                pyray.play_music_stream(source._audio)
-                source.remove_flag(AudioSourceDirtyFlags.IS_PLAYING)
-            elif pyray.is_music_stream_playing(source._audio) == False:
+        if source._source_type == AudioService.AudioSourceType.STREAM:
+            if pyray.is_music_stream_playing(source._audio) == False:
                 just_finished = True
             else:
                 pyray.update_music_stream(source._audio)
-        else:
-            if source.has_flag(AudioSourceDirtyFlags.IS_PLAYING):
-                pyray.play_sound(source._audio)
-                source.remove_flag(AudioSourceDirtyFlags.IS_PLAYING)
-            elif pyray.is_sound_playing(source._audio) == False:
-                just_finished = True
+        elif pyray.is_sound_playing(source._audio) == False:
+            just_finished = True
 
         if just_finished:
             source._is_playing = False
+            playing_sources.discard(instance_id)
             source.on_finish.fire()
 
             if source.remove_on_finish:
@@ -0,0 +1,477 @@
+#pragma once
+
+#include <vector>
+#include <cmath>
+#include <cstdint>
+#include <algorithm>
+#include <unordered_map>
+#include <utility>
+
+struct AABB
+{
+    float minX, minY, maxX, maxY;
+
+    AABB() : minX(0), minY(0), maxX(0), maxY(0) {}
+    AABB(float minX, float minY, float maxX, float maxY) : minX(minX), minY(minY), maxX(maxX), maxY(maxY) {}
+
+    bool overlaps(const AABB &other) const
+    {
+        return minX <= other.maxX && other.minX <= maxX && minY <= other.maxY && other.minY <= maxY;
+    }
+
+    bool contains(const AABB &other) const
+    {
+        return minX <= other.minX && minY <= other.minY && other.maxX <= maxX && other.maxY <= maxY;
+    }
+
+    AABB merge(const AABB &other) const
+    {
+        return AABB(std::min(minX, other.minX), std::min(minY, other.minY), std::max(maxX, other.maxX), std::max(maxY, other.maxY));
+    }
+
+    AABB expand(float margin) const
+    {
+        return AABB(minX - margin, minY - margin, maxX + margin, maxY + margin);
+    }
+
+    float perimeter() const
+    {
+        return 2.0f * ((maxX - minX) + (maxY - minY));
+    }
+};
+
+enum class BroadPhaseType
+{
+    GRID = 0,
+    AABB_TREE = 1,
+};
+
+/*
+    Spatial structure used to find candidate pairs before narrow-phase.
+
+    Queries may report the same id more than once, callers are expected to deduplicate pairs.
+*/
+class BroadPhase
+{
+public:
+    virtual ~BroadPhase() = default;
+
+    virtual void insert(int id, const AABB &bounds) = 0;
+    virtual void update(int id, const AABB &bounds) = 0;
+    virtual void remove(int id) = 0;
+    virtual void query(const AABB &bounds, std::vector<int> &results) const = 0;
+};
+
+struct CellHash
+{
+    size_t operator()(const std::pair<int, int> &pair) const noexcept
+    {
+        return std::hash<int>{}(pair.first) ^ (std::hash<int>{}(pair.second) << 1);
+    }
+};
+
+/*
+    Uniform hash grid. Cheap to update, but objects that are much larger than a cell occupy many cells.
+*/
+class HashGridBroadPhase : public BroadPhase
+{
+public:
+    explicit HashGridBroadPhase(float cellSize) : cellSize(cellSize) {}
+
+    void insert(int id, const AABB &bounds) override
+    {
+        std::vector<std::pair<int, int>> &cells = occupiedCells[id];
+        int minCellX, minCellY, maxCellX, maxCellY;
+        toCellRange(bounds, minCellX, minCellY, maxCellX, maxCellY);
+
+        for (int x = minCellX; x <= maxCellX; ++x)
+            for (int y = minCellY; y <= maxCellY; ++y)
+            {
+                std::pair<int, int> cell = {x, y};
+                cells.push_back(cell);
+                grid[cell].push_back(id);
+            }
+    }
+
+    void update(int id, const AABB &bounds) override
+    {
+        remove(id);
+        insert(id, bounds);
+    }
+
+    void remove(int id) override
+    {
+        auto it = occupiedCells.find(id);
+
+        if (it == occupiedCells.end())
+            return;
+
+        for (const auto &cell : it->second)
+        {
+            auto cellIt = grid.find(cell);
+
+            if (cellIt == grid.end())
+                continue;
+
+            std::vector<int> &instances = cellIt->second;
+            auto instanceIt = std::find(instances.begin(), instances.end(), id);
+
+            if (instanceIt != instances.end())
+            {
+                *instanceIt = instances.back();
+                instances.pop_back();
+            }
+
+            if (instances.empty())
+                grid.erase(cellIt);
+        }
+
+        occupiedCells.erase(it);
+    }
+
+    void query(const AABB &bounds, std::vector<int> &results) const override
+    {
+        int minCellX, minCellY, maxCellX, maxCellY;
+        toCellRange(bounds, minCellX, minCellY, maxCellX, maxCellY);
+
+        for (int x = minCellX; x <= maxCellX; ++x)
+            for (int y = minCellY; y <= maxCellY; ++y)
+            {
+                auto cellIt = grid.find({x, y});
+
+                if (cellIt == grid.end())
+                    continue;
+
+                results.insert(results.end(), cellIt->second.begin(), cellIt->second.end());
+            }
+    }
+
+private:
+    float cellSize;
+    std::unordered_map<std::pair<int, int>, std::vector<int>, CellHash> grid;
+    std::unordered_map<int, std::vector<std::pair<int, int>>> occupiedCells;
+
+    void toCellRange(const AABB &bounds, int &minCellX, int &minCellY, int &maxCellX, int &maxCellY) const
+    {
+        minCellX = static_cast<int>(std::floor(bounds.minX / cellSize));
+        minCellY = static_cast<int>(std::floor(bounds.minY / cellSize));
+        maxCellX = static_cast<int>(std::floor(bounds.maxX / cellSize));
+        maxCellY = static_cast<int>(std::floor(bounds.maxY / cellSize));
+    }
+};
+
+/*
+    Dynamic AABB tree with fattened leaves, balanced with tree rotations.
+
+    Leaves store bounds expanded by `margin`, so small movements do not touch the tree at all. Handles objects of very
+    different sizes well because every object is a single leaf no matter how large it is.
+*/
+class DynamicTreeBroadPhase : public BroadPhase
+{
+public:
+    explicit DynamicTreeBroadPhase(float margin) : margin(margin) {}
+
+    void insert(int id, const AABB &bounds) override
+    {
+        int leaf = allocateNode();
+        nodes[leaf].bounds = bounds.expand(margin);
+        nodes[leaf].id = id;
+        nodes[leaf].height = 0;
+        leaves[id] = leaf;
+        insertLeaf(leaf);
+    }
+
+    void update(int id, const AABB &bounds) override
+    {
+        auto it = leaves.find(id);
+
+        if (it == leaves.end())
+        {
+            insert(id, bounds);
+            return;
+        }
+
+        int leaf = it->second;
+
+        // Still inside the fattened bounds, nothing to do
+        if (nodes[leaf].bounds.contains(bounds))
+            return;
+
+        removeLeaf(leaf);
+        nodes[leaf].bounds = bounds.expand(margin);
+        insertLeaf(leaf);
+    }
+
+    void remove(int id) override
+    {
+        auto it = leaves.find(id);
+
+        if (it == leaves.end())
+            return;
+
+        removeLeaf(it->second);
+        freeNode(it->second);
+        leaves.erase(it);
+    }
+
+    void query(const AABB &bounds, std::vector<int> &results) const override
+    {
+        if (root == NULL_NODE)
+            return;
+
+        std::vector<int> stack;
+        stack.push_back(root);
+
+        while (!stack.empty())
+        {
+            int index = stack.back();
+            stack.pop_back();
+            const Node &node = nodes[index];
+
+            if (!node.bounds.overlaps(bounds))
+                continue;
+
+            if (node.isLeaf())
+            {
+                results.push_back(node.id);
+            }
+            else
+            {
+                stack.push_back(node.child1);
+                stack.push_back(node.child2);
+            }
+        }
+    }
+
+private:
+    static const int NULL_NODE = -1;
+
+    struct Node
+    {
+        AABB bounds;
+        int id = -1;
+        int parent = NULL_NODE;
+        int child1 = NULL_NODE;
+        int child2 = NULL_NODE;
+        // Leaves have a height of 0, free nodes have a height of -1
+        int height = -1;
+
+        bool isLeaf() const
+        {
+            return child1 == NULL_NODE;
+        }
+    };
+
+    float margin;
+    int root = NULL_NODE;
+    int freeList = NULL_NODE;
+    std::vector<Node> nodes;
+    std::unordered_map<int, int> leaves;
+
+    int allocateNode()
+    {
+        if (freeList == NULL_NODE)
+        {
+            nodes.push_back(Node());
+            return static_cast<int>(nodes.size()) - 1;
+        }
+
+        int index = freeList;
+        freeList = nodes[index].parent;
+        nodes[index] = Node();
+        return index;
+    }
+
+    void freeNode(int index)
+    {
+        nodes[index].parent = freeList;
+        nodes[index].height = -1;
+        freeList = index;
+    }
+
+    void insertLeaf(int leaf)
+    {
+        if (root == NULL_NODE)
+        {
+            root = leaf;
+            nodes[root].parent = NULL_NODE;
+            return;
+        }
+
+        // Find the cheapest sibling by walking down the tree using the perimeter as the cost
+        AABB leafBounds = nodes[leaf].bounds;
+        int index = root;
+
+        while (!nodes[index].isLeaf())
+        {
+            int child1 = nodes[index].child1;
+            int child2 = nodes[index].child2;
+            float area = nodes[index].bounds.perimeter();
+            float combinedArea = nodes[index].bounds.merge(leafBounds).perimeter();
+            float cost = 2.0f * combinedArea;
+            float inheritanceCost = 2.0f * (combinedArea - area);
+            float cost1 = childCost(child1, leafBounds) + inheritanceCost;
+            float cost2 = childCost(child2, leafBounds) + inheritanceCost;
+
+            if (cost < cost1 && cost < cost2)
+                break;
+
+            index = cost1 < cost2 ? child1 : child2;
+        }
+
+        int sibling = index;
+        int oldParent = nodes[sibling].parent;
+        int newParent = allocateNode();
+        nodes[newParent].parent = oldParent;
+        nodes[newParent].bounds = leafBounds.merge(nodes[sibling].bounds);
+        nodes[newParent].height = nodes[sibling].height + 1;
+        nodes[newParent].child1 = sibling;
+        nodes[newParent].child2 = leaf;
+        nodes[sibling].parent = newParent;
+        nodes[leaf].parent = newParent;
+
+        if (oldParent == NULL_NODE)
+        {
+            root = newParent;
+        }
+        else if (nodes[oldParent].child1 == sibling)
+        {
+            nodes[oldParent].child1 = newParent;
+        }
+        else
+        {
+            nodes[oldParent].child2 = newParent;
+        }
+
+        refit(nodes[leaf].parent);
+    }
+
+    void removeLeaf(int leaf)
+    {
+        if (leaf == root)
+        {
+            root = NULL_NODE;
+            return;
+        }
+
+        int parent = nodes[leaf].parent;
+        int grandParent = nodes[parent].parent;
+        int sibling = nodes[parent].child1 == leaf ? nodes[parent].child2 : nodes[parent].child1;
+
+        if (grandParent == NULL_NODE)
+        {
+            root = sibling;
+            nodes[sibling].parent = NULL_NODE;
+            freeNode(parent);
+            return;
+        }
+
+        if (nodes[grandParent].child1 == parent)
+        {
+            nodes[grandParent].child1 = sibling;
+        }
+        else
+        {
+            nodes[grandParent].child2 = sibling;
+        }
+
+        nodes[sibling].parent = grandParent;
+        freeNode(parent);
+        refit(grandParent);
+    }
+
+    float childCost(int child, const AABB &leafBounds) const
+    {
+        AABB combined = leafBounds.merge(nodes[child].bounds);
+
+        if (nodes[child].isLeaf())
+            return combined.perimeter();
+
+        return combined.perimeter() - nodes[child].bounds.perimeter();
+    }
+
+    // Walks back up to the root fixing heights and bounds, rebalancing along the way
+    void refit(int index)
+    {
+        while (index != NULL_NODE)
+        {
+            index = balance(index);
+
+            int child1 = nodes[index].child1;
+            int child2 = nodes[index].child2;
+            nodes[index].height = 1 + std::max(nodes[child1].height, nodes[child2].height);
+            nodes[index].bounds = nodes[child1].bounds.merge(nodes[child2].bounds);
+            index = nodes[index].parent;
+        }
+    }
+
+    // Rotates the subtree at `indexA` if it is unbalanced, returns the index of the new subtree root
+    int balance(int indexA)
+    {
+        Node &nodeA = nodes[indexA];
+
+        if (nodeA.isLeaf() || nodeA.height < 2)
+            return indexA;
+
+        int indexB = nodeA.child1;
+        int indexC = nodeA.child2;
+        int difference = nodes[indexC].height - nodes[indexB].height;
+
+        if (difference > 1)
+            return rotate(indexA, indexC, indexB);
+
+        if (difference < -1)
+            return rotate(indexA, indexB, indexC);
+
+        return indexA;
+    }
+
+    // Promotes `indexHigh`, the taller child of `indexA`, to replace `indexA`
+    int rotate(int indexA, int indexHigh, int indexLow)
+    {
+        Node &nodeA = nodes[indexA];
+        Node &nodeHigh = nodes[indexHigh];
+        int indexF = nodeHigh.child1;
+        int indexG = nodeHigh.child2;
+
+        nodeHigh.child1 = indexA;
+        nodeHigh.parent = nodeA.parent;
+        nodeA.parent = indexHigh;
+
+        if (nodeHigh.parent == NULL_NODE)
+        {
+            root = indexHigh;
+        }
+        else if (nodes[nodeHigh.parent].child1 == indexA)
+        {
+            nodes[nodeHigh.parent].child1 = indexHigh;
+        }
+        else
+        {
+            nodes[nodeHigh.parent].child2 = indexHigh;
+        }
+
+        // Keep the taller grandchild under the promoted node
+        int keep = nodes[indexF].height > nodes[indexG].height ? indexF : indexG;
+        int move = keep == indexF ? indexG : indexF;
+
+        nodeHigh.child2 = keep;
+        nodes[move].parent = indexA;
+
+        if (nodeA.child1 == indexHigh)
+        {
+            nodeA.child1 = move;
+        }
+        else
+        {
+            nodeA.child2 = move;
+        }
+
+        nodeA.bounds = nodes[indexLow].bounds.merge(nodes[move].bounds);
+        nodeA.height = 1 + std::max(nodes[indexLow].height, nodes[move].height);
+        nodeHigh.bounds = nodeA.bounds.merge(nodes[keep].bounds);
+        nodeHigh.height = 1 + std::max(nodeA.height, nodes[keep].height);
+
+        return indexHigh;
+    }
+};
@@ -0,0 +1,21 @@
+#pragma once
+
+#include <cstdint>
+
+/*
+    Layout of a single collision inside the buffer returned by `check_collisions`.
+
+    Must match `COLLISION_RECORD_FORMAT` in `extro.internal.systems.Collision`.
+*/
+struct CollisionRecord
+{
+    int32_t id1;
+    int32_t id2;
+    // Number of consecutive checks the pair has been touching for, zero on the first contact
+    uint32_t age;
+    float overlap;
+    float normalX;
+    float normalY;
+    float contactX;
+    float contactY;
+};
@@ -3,81 +3,272 @@
 #include <nanobind/stl/vector.h>
 #include <nanobind/stl/shared_ptr.h>
 #include <vector>
+#include <array>
+#include <cstdint>
+#include <algorithm>
 #include <cmath>
 #include <unordered_map>
-#include <set>
+#include <unordered_set>
 #include <memory>
 #include "../../../shared/Vector2.hpp"
 #include "../../../shared/Angle.hpp"
+#include "../../../shared/ThreadPool.hpp"
+#include "../../../shared/SlotPool.hpp"
+#include "CollisionRecord.hpp"
+#include "BroadPhase.hpp"
 
 using namespace nanobind::literals;
 
-struct PairHash
+const float DEFAULT_CELL_SIZE = 60.0f;
+// The adaptive grid aims for cells about twice the size of a typical collider
+const float ADAPTIVE_CELL_SCALE = 2.0f;
+// How far the ideal cell size may drift (as a ratio) before the grid is rebuilt
+const float ADAPTIVE_REBUILD_RATIO = 1.5f;
+// Number of `checkCollisions` calls between two samples of the collider sizes
+const int ADAPTIVE_SAMPLE_INTERVAL = 60;
+// Extra room given to leaves of the AABB tree so small movements do not restructure it
+const float TREE_MARGIN = 4.0f;
+const int MAX_COLLISION_GROUPS = 64;
+// Below this many candidate pairs the narrow-phase is cheaper to run on the calling thread
+const size_t PARALLEL_PAIR_THRESHOLD = 256;
+// Largest convex polygon a collider can use
+const int MAX_VERTICES = 8;
+// Most destroyed masks kept around for reuse
+const size_t MASK_POOL_CAPACITY = 4096;
+const Vector2 ZERO_VECTOR = Vector2(0.0f, 0.0f);
+
+float cellSize = DEFAULT_CELL_SIZE;
+// Created on first use, so the number of threads can be set before any collision check
+std::unique_ptr<ThreadPool> threadPool;
+size_t threadCount = std::max(std::thread::hardware_concurrency(), 1u);
+
+std::unique_ptr<BroadPhase> createBroadPhase(BroadPhaseType type)
 {
-    size_t operator()(const std::pair<int, int> &pair) const noexcept
+    switch (type)
     {
-        return std::hash<int>{}(pair.first) ^ (std::hash<int>{}(pair.second) << 1);
+    case BroadPhaseType::AABB_TREE:
+        return std::make_unique<DynamicTreeBroadPhase>(TREE_MARGIN);
+    case BroadPhaseType::GRID:
+    default:
+        return std::make_unique<HashGridBroadPhase>(cellSize);
     }
+}
+
+BroadPhaseType broadPhaseType = BroadPhaseType::GRID;
+std::unique_ptr<BroadPhase> broadPhase = createBroadPhase(broadPhaseType);
+// Static masks never move on their own, so they live in a separate tree that only changes when one of them does
+std::unique_ptr<BroadPhase> staticBroadPhase = std::make_unique<DynamicTreeBroadPhase>(0.0f);
+bool adaptiveCellSize = false;
+int checksSinceSample = 0;
+
+// Bit N of a group's mask is set when the group collides with group N, groups collide with everything until told otherwise
+std::array<uint64_t, MAX_COLLISION_GROUPS> collisionGroupMasks = [] {
+    std::array<uint64_t, MAX_COLLISION_GROUPS> masks;
+    masks.fill(~0ULL);
+    return masks;
+}();
+
+struct CachedContact
+{
+    CollisionRecord record;
+    uint64_t frame;
 };
 
-const int CELL_SIZE = 60;
-const Vector2 ZERO_VECTOR = Vector2(0.0f, 0.0f);
-std::unordered_map<std::pair<int, int>, std::vector<int>, PairHash> collisionGrid;
-bool checkGridForCleanup = false;
+// Contacts that are still touching, keyed by `pairKey`. Pairs whose masks did not move keep their entry untouched
+std::unordered_map<uint64_t, CachedContact> contactCache;
+// Pairs that stopped touching outside of `checkCollisions`, reported on the next call
+std::vector<std::pair<int, int>> pendingEndedPairs;
+uint64_t currentFrame = 0;
+
+uint64_t pairKey(int id1, int id2)
+{
+    return (static_cast<uint64_t>(static_cast<uint32_t>(id1)) << 32) | static_cast<uint32_t>(id2);
+}
+
+// Ends every cached contact of the instance
+void endContacts(int id)
+{
+    for (auto it = contactCache.begin(); it != contactCache.end();)
+    {
+        const CollisionRecord &record = it->second.record;
+
+        if (record.id1 == id || record.id2 == id)
+        {
+            pendingEndedPairs.push_back({record.id1, record.id2});
+            it = contactCache.erase(it);
+        }
+        else
+        {
+            ++it;
+        }
+    }
+}
+
+// Must match `ColliderShape` in `extro.services.Physics`
+enum class ShapeType
+{
+    BOX = 0,
+    CIRCLE = 1,
+    CAPSULE = 2,
+    POLYGON = 3,
+};
 
 struct CollisionMask
 {
     int id;
+    bool isCollidable;
+    bool isStatic;
+    int collisionGroup;
     std::shared_ptr<Vector2> position;
     std::shared_ptr<Vector2> size;
     std::shared_ptr<Angle> rotation;
-    std::vector<Vector2> vertices;
-    std::vector<Vector2> axes;
-    std::vector<std::pair<int, int>> occupiedCells;
+    ShapeType shape = ShapeType::BOX;
+    // Polygon points relative to the size, so (1, 1) is the bottom right corner of the transform
+    std::array<Vector2, MAX_VERTICES> localPoints;
+    int localPointCount = 0;
+    // Fixed inline storage, only the first `vertexCount`/`axisCount` entries are valid
+    std::array<Vector2, MAX_VERTICES> vertices;
+    std::array<Vector2, MAX_VERTICES> axes;
+    int vertexCount = 0;
+    int axisCount = 0;
+    // Unrotated boxes are tested against each other with their bounds alone
+    bool isAxisAligned = false;
+    // Circles and capsules are a segment swept by a radius, circles have a zero length segment
+    Vector2 segmentStart;
+    Vector2 segmentEnd;
+    float radius = 0.0f;
+    Vector2 center;
+    // Nothing to collide with, for example when the size is still zero
+    bool isEmpty = true;
+    AABB bounds;
+    bool inBroadPhase = false;
+    bool inStaticBroadPhase = false;
+    uint64_t checkedFrame = 0;
 
-    void removeFromGrid()
+    void removeFromBroadPhase()
     {
-        for (const auto &cellPair : occupiedCells)
+        if (inBroadPhase)
         {
-            auto &instances = collisionGrid[cellPair];
-            auto it = std::find(instances.begin(), instances.end(), id);
+            broadPhase->remove(id);
+            inBroadPhase = false;
+        }
 
-            if (it != instances.end())
-            {
-                *it = instances.back();
-                instances.pop_back();
-            }
+        if (inStaticBroadPhase)
+        {
+            staticBroadPhase->remove(id);
+            inStaticBroadPhase = false;
         }
+    }
+
+    // Places the mask in the partition matching `isStatic`, only its own proxy is touched
+    void updateBroadPhase()
+    {
+        // Leaving a partition, or nothing to collide with anymore
+        if (isEmpty || (isStatic ? inBroadPhase : inStaticBroadPhase))
+            removeFromBroadPhase();
+
+        if (isEmpty)
+            return;
 
-        occupiedCells.clear();
-        checkGridForCleanup = true;
+        BroadPhase &partition = isStatic ? *staticBroadPhase : *broadPhase;
+        bool &inPartition = isStatic ? inStaticBroadPhase : inBroadPhase;
+
+        if (inPartition)
+        {
+            partition.update(id, bounds);
+        }
+        else
+        {
+            partition.insert(id, bounds);
+            inPartition = true;
+        }
+    }
+
+    bool isRound() const
+    {
+        return shape == ShapeType::CIRCLE || shape == ShapeType::CAPSULE;
     }
 
     void recompute()
     {
+        vertexCount = 0;
+        axisCount = 0;
+
         // Its possible for size to be zero if the instance was just created
         if (size->x <= 0.0f || size->y <= 0.0f)
         {
-            axes.clear();
-            vertices.clear();
+            isEmpty = true;
             return;
         }
 
-        std::vector<Vector2> localVertices = {Vector2{0, 0}, Vector2{size->x, 0}, Vector2{size->x, size->y}, Vector2{0, size->y}};
-        float cosRotation = std::cos(rotation->radians);
-        float sinRotation = std::sin(rotation->radians);
+        isEmpty = false;
+        isAxisAligned = shape == ShapeType::BOX && rotation->radians == 0.0f;
+        float cosRotation = 1.0f;
+        float sinRotation = 0.0f;
+
+        if (rotation->radians != 0.0f)
+        {
+            cosRotation = std::cos(rotation->radians);
+            sinRotation = std::sin(rotation->radians);
+        }
+
+        // Local points are rotated around the position, same as the transform
+        auto toWorld = [&](float localX, float localY)
+        {
+            return Vector2{position->x + localX * cosRotation - localY * sinRotation, position->y + localX * sinRotation + localY * cosRotation};
+        };
+
+        switch (shape)
+        {
+        case ShapeType::CIRCLE:
+        case ShapeType::CAPSULE:
+        {
+            radius = std::min(size->x, size->y) / 2;
+
+            if (shape == ShapeType::CIRCLE)
+            {
+                segmentStart = toWorld(size->x / 2, size->y / 2);
+                segmentEnd = segmentStart;
+            }
+            else if (size->x >= size->y)
+            {
+                segmentStart = toWorld(radius, size->y / 2);
+                segmentEnd = toWorld(size->x - radius, size->y / 2);
+            }
+            else
+            {
+                segmentStart = toWorld(size->x / 2, radius);
+                segmentEnd = toWorld(size->x / 2, size->y - radius);
+            }
+
+            center = (segmentStart + segmentEnd) / 2;
+            bounds = AABB(std::min(segmentStart.x, segmentEnd.x), std::min(segmentStart.y, segmentEnd.y), std::max(segmentStart.x, segmentEnd.x), std::max(segmentStart.y, segmentEnd.y)).expand(radius);
+            return;
+        }
+        case ShapeType::POLYGON:
+            vertexCount = localPointCount;
 
-        vertices.clear();
+            for (int index = 0; index < vertexCount; ++index)
+                vertices[index] = toWorld(localPoints[index].x * size->x, localPoints[index].y * size->y);
 
-        for (auto &localVertex : localVertices)
-            vertices.push_back(Vector2{position->x + localVertex.x * cosRotation - localVertex.y * sinRotation, position->y + localVertex.x * sinRotation + localVertex.y * cosRotation});
+            break;
+        case ShapeType::BOX:
+        default:
+            vertexCount = 4;
+            vertices[0] = toWorld(0, 0);
+            vertices[1] = toWorld(size->x, 0);
+            vertices[2] = toWorld(size->x, size->y);
+            vertices[3] = toWorld(0, size->y);
+            break;
+        }
 
-        axes.clear();
+        center = ZERO_VECTOR;
 
-        for (size_t index = 0; index < vertices.size(); index++)
+        for (int index = 0; index < vertexCount; index++)
         {
-            Vector2 &vertex1 = vertices[index];
-            Vector2 &vertex2 = vertices[(index + 1) % vertices.size()];
+            const Vector2 &vertex1 = vertices[index];
+            const Vector2 &vertex2 = vertices[(index + 1) % vertexCount];
+            center += vertex1;
             float axisX = vertex2.x - vertex1.x;
             float axisY = vertex2.y - vertex1.y;
             float axisLength = std::hypot(axisX, axisY);
@@ -87,103 +278,474 @@ struct CollisionMask
 
             axisX /= axisLength;
             axisY /= axisLength;
-            axes.push_back(Vector2{axisY, -axisX});
+            axes[axisCount++] = Vector2{axisY, -axisX};
         }
 
-        removeFromGrid();
+        center = center / static_cast<float>(vertexCount);
 
-        // Determine its placement in the grid
-        int cellX = static_cast<int>(std::floor(position->x / CELL_SIZE));
-        int cellY = static_cast<int>(std::floor(position->y / CELL_SIZE));
-        int maxX = static_cast<int>(std::floor((position->x + size->x) / CELL_SIZE));
-        int maxY = static_cast<int>(std::floor((position->y + size->y) / CELL_SIZE));
+        // Bounds of the rotated vertices, not just position and size
+        bounds = AABB(vertices[0].x, vertices[0].y, vertices[0].x, vertices[0].y);
 
-        for (int x = cellX; x <= maxX; ++x)
-            for (int y = cellY; y <= maxY; ++y)
-            {
-                std::pair<int, int> cell = {x, y};
-                occupiedCells.push_back(cell);
-                collisionGrid[cell].push_back(id);
-            }
+        for (int index = 1; index < vertexCount; ++index)
+            bounds = bounds.merge(AABB(vertices[index].x, vertices[index].y, vertices[index].x, vertices[index].y));
     }
 };
 
 std::unordered_map<int, CollisionMask *> collisionMasks;
 
-void createCollisionMask(int id, std::shared_ptr<Vector2> size, std::shared_ptr<Vector2> position, std::shared_ptr<Angle> rotation)
+// Destroyed masks are kept for reuse, high churn objects like bullets would otherwise allocate on every spawn
+SlotPool<CollisionMask> collisionMaskPool(MASK_POOL_CAPACITY);
+
+void createCollisionMask(int id, std::shared_ptr<Vector2> size, std::shared_ptr<Vector2> position, std::shared_ptr<Angle> rotation, bool isCollidable, bool isStatic, int collisionGroup)
 {
-    CollisionMask *collisionMask = new CollisionMask();
+    CollisionMask *collisionMask = collisionMaskPool.acquire();
     collisionMask->id = id;
+    collisionMask->isCollidable = isCollidable;
+    collisionMask->isStatic = isStatic;
+    collisionMask->collisionGroup = collisionGroup;
     collisionMask->size = size;
     collisionMask->position = position;
     collisionMask->rotation = rotation;
     collisionMask->recompute();
+    collisionMask->updateBroadPhase();
     collisionMasks[id] = collisionMask;
 }
 
 void destroyCollisionMask(int id)
 {
-    collisionMasks[id]->removeFromGrid();
-    delete collisionMasks[id];
-    collisionMasks.erase(id);
+    auto it = collisionMasks.find(id);
+
+    if (it == collisionMasks.end())
+        return;
+
+    it->second->removeFromBroadPhase();
+    endContacts(id);
+
+    collisionMaskPool.release(it->second);
+    collisionMasks.erase(it);
 }
 
-std::pair<float, float> projectPolygon(const Vector2 &axis, const std::vector<Vector2> &vertices)
+// Recreates the broad-phase with the current settings, every existing mask is moved into the new one
+void rebuildBroadPhase()
 {
-    int length = vertices.size();
-    std::vector<float> dots(length, 0.0f);
+    broadPhase = createBroadPhase(broadPhaseType);
 
-    for (int index = 0; index < length; ++index)
+    for (auto &[id, collisionMask] : collisionMasks)
     {
-        const Vector2 &vertex = vertices[index];
-        dots[index] = vertex.dot(axis);
+        if (collisionMask->isStatic)
+            continue;
+
+        collisionMask->inBroadPhase = false;
+        collisionMask->updateBroadPhase();
     }
+}
+
+void setShape(int id, int shape, const std::vector<Vector2> &points)
+{
+    if (shape < static_cast<int>(ShapeType::BOX) || shape > static_cast<int>(ShapeType::POLYGON))
+        throw nanobind::value_error("Unknown collider shape");
 
-    float min = dots[0];
-    float max = dots[0];
+    auto it = collisionMasks.find(id);
 
-    for (int index = 1; index < length; ++index)
+    if (it == collisionMasks.end())
+        return;
+
+    CollisionMask *collisionMask = it->second;
+
+    if (static_cast<ShapeType>(shape) == ShapeType::POLYGON)
     {
-        if (dots[index] < min)
-            min = dots[index];
+        int count = static_cast<int>(points.size());
+
+        if (count < 3 || count > MAX_VERTICES)
+            throw nanobind::value_error("Polygons need between 3 and 8 points");
+
+        // Every turn has to go the same way for the polygon to be convex
+        float winding = 0.0f;
+
+        for (int index = 0; index < count; ++index)
+        {
+            const Vector2 &point1 = points[index];
+            const Vector2 &point2 = points[(index + 1) % count];
+            const Vector2 &point3 = points[(index + 2) % count];
+            float turn = (point2 - point1).cross(point3 - point2);
+
+            if (turn * winding < 0.0f)
+                throw nanobind::value_error("Polygon must be convex");
+
+            if (turn != 0.0f)
+                winding = turn;
+        }
 
-        if (dots[index] > max)
-            max = dots[index];
+        std::copy(points.begin(), points.end(), collisionMask->localPoints.begin());
+        collisionMask->localPointCount = count;
     }
 
-    return {min, max};
+    collisionMask->shape = static_cast<ShapeType>(shape);
+    collisionMask->recompute();
+    collisionMask->updateBroadPhase();
+}
+
+void setStatic(int id, bool isStatic)
+{
+    auto it = collisionMasks.find(id);
+
+    if (it == collisionMasks.end() || it->second->isStatic == isStatic)
+        return;
+
+    CollisionMask *collisionMask = it->second;
+    collisionMask->isStatic = isStatic;
+    collisionMask->updateBroadPhase();
+}
+
+void setBroadPhase(int type)
+{
+    if (type != static_cast<int>(BroadPhaseType::GRID) && type != static_cast<int>(BroadPhaseType::AABB_TREE))
+        throw nanobind::value_error("Unknown broad-phase type");
+
+    broadPhaseType = static_cast<BroadPhaseType>(type);
+    rebuildBroadPhase();
+}
+
+void setCellSize(float size)
+{
+    if (size <= 0.0f)
+        throw nanobind::value_error("Cell size must be greater than zero");
+
+    adaptiveCellSize = false;
+    cellSize = size;
+
+    if (broadPhaseType == BroadPhaseType::GRID)
+        rebuildBroadPhase();
+}
+
+void setThreadCount(int count)
+{
+    if (count < 1)
+        throw nanobind::value_error("Thread count must be at least one");
+
+    threadCount = static_cast<size_t>(count);
+    threadPool.reset();
+}
+
+float getCellSize()
+{
+    return cellSize;
+}
+
+// Picks the cell size from the median collider extent, the grid is only rebuilt when it drifted far enough
+void fitCellSize()
+{
+    std::vector<float> extents;
+    extents.reserve(collisionMasks.size());
+
+    for (const auto &[id, collisionMask] : collisionMasks)
+        if (collisionMask->inBroadPhase)
+            extents.push_back(std::max(collisionMask->bounds.maxX - collisionMask->bounds.minX, collisionMask->bounds.maxY - collisionMask->bounds.minY));
+
+    if (extents.empty())
+        return;
+
+    auto median = extents.begin() + extents.size() / 2;
+    std::nth_element(extents.begin(), median, extents.end());
+    float idealCellSize = std::max(*median * ADAPTIVE_CELL_SCALE, 1.0f);
+    float drift = idealCellSize > cellSize ? idealCellSize / cellSize : cellSize / idealCellSize;
+
+    if (drift < ADAPTIVE_REBUILD_RATIO)
+        return;
+
+    cellSize = idealCellSize;
+
+    if (broadPhaseType == BroadPhaseType::GRID)
+        rebuildBroadPhase();
 }
 
-void computeCollisionData(nanobind::list *collisions, std::pair<int, int> pair, const CollisionMask *instance1Mask, const CollisionMask *instance2Mask)
+void setAdaptiveCellSize(bool enabled)
 {
-    std::vector<Vector2> axes;
+    adaptiveCellSize = enabled;
+    checksSinceSample = 0;
 
-    for (const auto &axis : instance1Mask->axes)
-        axes.push_back(axis);
+    if (enabled)
+        fitCellSize();
+}
 
-    for (const auto &axis : instance2Mask->axes)
-        axes.push_back(axis);
+void setCollidable(int id, bool isCollidable)
+{
+    auto it = collisionMasks.find(id);
 
-    if (axes.empty())
+    if (it == collisionMasks.end())
         return;
 
+    it->second->isCollidable = isCollidable;
+
+    if (!isCollidable)
+        endContacts(id);
+}
+
+void setCollisionGroupMask(int collisionGroup, uint64_t mask)
+{
+    if (collisionGroup < 0 || collisionGroup >= MAX_COLLISION_GROUPS)
+        throw nanobind::index_error("Collision group is out of range");
+
+    collisionGroupMasks[collisionGroup] = mask;
+}
+
+bool areGroupsCollidable(const CollisionMask *instance1Mask, const CollisionMask *instance2Mask)
+{
+    return (collisionGroupMasks[instance1Mask->collisionGroup] >> instance2Mask->collisionGroup) & 1ULL;
+}
+
+void setCollisionGroup(int id, int collisionGroup)
+{
+    if (collisionGroup < 0 || collisionGroup >= MAX_COLLISION_GROUPS)
+        throw nanobind::index_error("Collision group is out of range");
+
+    auto it = collisionMasks.find(id);
+
+    if (it != collisionMasks.end())
+        it->second->collisionGroup = collisionGroup;
+}
+
+// Result of a narrow-phase test, the normal points from the first shape to the second
+struct ContactData
+{
+    float overlap;
+    Vector2 normal;
+    Vector2 point;
+};
+
+std::pair<float, float> projectPolygon(const Vector2 &axis, const Vector2 *vertices, int vertexCount)
+{
+    float min = vertices[0].dot(axis);
+    float max = min;
+
+    for (int index = 1; index < vertexCount; ++index)
+    {
+        float dot = vertices[index].dot(axis);
+
+        if (dot < min)
+            min = dot;
+
+        if (dot > max)
+            max = dot;
+    }
+
+    return {min, max};
+}
+
+std::pair<float, float> projectRound(const Vector2 &axis, const CollisionMask *mask)
+{
+    float start = mask->segmentStart.dot(axis);
+    float end = mask->segmentEnd.dot(axis);
+    return {std::min(start, end) - mask->radius, std::max(start, end) + mask->radius};
+}
+
+Vector2 closestPointOnSegment(const Vector2 &point, const Vector2 &start, const Vector2 &end)
+{
+    Vector2 segment = end - start;
+    float lengthSquared = segment.dot(segment);
+
+    if (lengthSquared == 0.0f)
+        return start;
+
+    float t = std::clamp((point - start).dot(segment) / lengthSquared, 0.0f, 1.0f);
+    return start + segment * t;
+}
+
+// Closest points between two segments, either of which may have zero length
+std::pair<Vector2, Vector2> closestPointsBetweenSegments(const Vector2 &start1, const Vector2 &end1, const Vector2 &start2, const Vector2 &end2)
+{
+    Vector2 direction1 = end1 - start1;
+    Vector2 direction2 = end2 - start2;
+    Vector2 offset = start1 - start2;
+    float lengthSquared1 = direction1.dot(direction1);
+    float lengthSquared2 = direction2.dot(direction2);
+    float projection2 = direction2.dot(offset);
+    float t1 = 0.0f;
+    float t2 = 0.0f;
+
+    if (lengthSquared1 == 0.0f && lengthSquared2 == 0.0f)
+        return {start1, start2};
+
+    if (lengthSquared1 == 0.0f)
+    {
+        t2 = std::clamp(projection2 / lengthSquared2, 0.0f, 1.0f);
+    }
+    else
+    {
+        float projection1 = direction1.dot(offset);
+
+        if (lengthSquared2 == 0.0f)
+        {
+            t1 = std::clamp(-projection1 / lengthSquared1, 0.0f, 1.0f);
+        }
+        else
+        {
+            float directionDot = direction1.dot(direction2);
+            float denominator = lengthSquared1 * lengthSquared2 - directionDot * directionDot;
+
+            // Parallel segments pick any point, the clamping below finds its partner
+            if (denominator != 0.0f)
+                t1 = std::clamp((directionDot * projection2 - projection1 * lengthSquared2) / denominator, 0.0f, 1.0f);
+
+            t2 = (directionDot * t1 + projection2) / lengthSquared2;
+
+            if (t2 < 0.0f)
+            {
+                t2 = 0.0f;
+                t1 = std::clamp(-projection1 / lengthSquared1, 0.0f, 1.0f);
+            }
+            else if (t2 > 1.0f)
+            {
+                t2 = 1.0f;
+                t1 = std::clamp((directionDot - projection1) / lengthSquared1, 0.0f, 1.0f);
+            }
+        }
+    }
+
+    return {start1 + direction1 * t1, start2 + direction2 * t2};
+}
+
+// Circles and capsules, only the closest points of their segments matter
+bool computeRoundContact(ContactData *contact, const CollisionMask *instance1Mask, const CollisionMask *instance2Mask)
+{
+    auto [point1, point2] = closestPointsBetweenSegments(instance1Mask->segmentStart, instance1Mask->segmentEnd, instance2Mask->segmentStart, instance2Mask->segmentEnd);
+    Vector2 distance = point2 - point1;
+    float distanceSquared = distance.dot(distance);
+    float radii = instance1Mask->radius + instance2Mask->radius;
+
+    if (distanceSquared > radii * radii)
+        return false;
+
+    float length = std::sqrt(distanceSquared);
+    contact->normal = length > 0.0f ? distance / length : Vector2(0.0f, 1.0f);
+    contact->overlap = radii - length;
+    contact->point = point1 + contact->normal * (instance1Mask->radius - contact->overlap / 2);
+    return true;
+}
+
+// SAT between a polygon and a circle or capsule, the normal points from the polygon to the round shape
+bool computePolygonRoundContact(ContactData *contact, const CollisionMask *polygonMask, const CollisionMask *roundMask)
+{
+    // Polygon edges, the capsule side and the direction from the nearest polygon vertex to the segment
+    std::array<Vector2, MAX_VERTICES + 2> axes;
+    int axisCount = 0;
+
+    for (int index = 0; index < polygonMask->axisCount; ++index)
+        axes[axisCount++] = polygonMask->axes[index];
+
+    Vector2 segment = roundMask->segmentEnd - roundMask->segmentStart;
+    float segmentLength = segment.magnitude();
+
+    if (segmentLength > 0.0f)
+        axes[axisCount++] = Vector2(-segment.y / segmentLength, segment.x / segmentLength);
+
+    float closestDistance = 1e9;
+    Vector2 closestAxis;
+
+    for (int index = 0; index < polygonMask->vertexCount; ++index)
+    {
+        const Vector2 &vertex = polygonMask->vertices[index];
+        Vector2 towardsSegment = closestPointOnSegment(vertex, roundMask->segmentStart, roundMask->segmentEnd) - vertex;
+        float distance = towardsSegment.magnitude();
+
+        if (distance > 0.0f && distance < closestDistance)
+        {
+            closestDistance = distance;
+            closestAxis = towardsSegment / distance;
+        }
+    }
+
+    if (closestDistance < 1e9)
+        axes[axisCount++] = closestAxis;
+
     float minOverlap = 1e9;
     Vector2 smallestAxis;
 
-    for (const auto &axis : axes)
+    for (int index = 0; index < axisCount; ++index)
     {
-        auto [projection1X, projection1Y] = projectPolygon(axis, instance1Mask->vertices);
-        auto [projection2X, projection2Y] = projectPolygon(axis, instance2Mask->vertices);
+        const Vector2 &axis = axes[index];
+        auto [projection1X, projection1Y] = projectPolygon(axis, polygonMask->vertices.data(), polygonMask->vertexCount);
+        auto [projection2X, projection2Y] = projectRound(axis, roundMask);
 
         if (!(projection1X <= projection2Y && projection2X <= projection1Y))
-            return;
+            return false;
 
         float overlap = std::min(projection1Y, projection2Y) - std::max(projection1X, projection2X);
 
         if (overlap < minOverlap)
         {
             minOverlap = overlap;
-            smallestAxis = axis.copy();
+            smallestAxis = axis;
+        }
+    }
+
+    if ((roundMask->center - polygonMask->center).dot(smallestAxis) < 0)
+        smallestAxis = smallestAxis * -1.0f;
+
+    // Deepest point of the round shape, moved back to the middle of the overlap
+    const Vector2 &deepest = roundMask->segmentStart.dot(smallestAxis) <= roundMask->segmentEnd.dot(smallestAxis) ? roundMask->segmentStart : roundMask->segmentEnd;
+    contact->normal = smallestAxis;
+    contact->overlap = minOverlap;
+    contact->point = deepest - smallestAxis * (roundMask->radius - minOverlap / 2);
+    return true;
+}
+
+// Same result as the SAT below for two unrotated boxes, including which axis wins a tie and the normal direction
+bool computeAxisAlignedContact(ContactData *contact, const CollisionMask *instance1Mask, const CollisionMask *instance2Mask)
+{
+    const AABB &bounds1 = instance1Mask->bounds;
+    const AABB &bounds2 = instance2Mask->bounds;
+
+    if (!bounds1.overlaps(bounds2))
+        return false;
+
+    float overlapX = std::min(bounds1.maxX, bounds2.maxX) - std::max(bounds1.minX, bounds2.minX);
+    float overlapY = std::min(bounds1.maxY, bounds2.maxY) - std::max(bounds1.minY, bounds2.minY);
+    Vector2 distance = *instance2Mask->position - *instance1Mask->position;
+
+    if (overlapX < overlapY)
+    {
+        contact->overlap = overlapX;
+        contact->normal = Vector2(distance.x < 0 ? -1.0f : 1.0f, 0.0f);
+    }
+    else
+    {
+        contact->overlap = overlapY;
+        contact->normal = Vector2(0.0f, distance.y > 0 ? 1.0f : -1.0f);
+    }
+
+    contact->point = *instance1Mask->position + contact->normal * (contact->overlap / 2);
+    return true;
+}
+
+bool computePolygonContact(ContactData *contact, const CollisionMask *instance1Mask, const CollisionMask *instance2Mask)
+{
+    if (instance1Mask->axisCount + instance2Mask->axisCount == 0)
+        return false;
+
+    float minOverlap = 1e9;
+    Vector2 smallestAxis;
+
+    for (int maskIndex = 0; maskIndex < 2; ++maskIndex)
+    {
+        const CollisionMask *axisMask = maskIndex == 0 ? instance1Mask : instance2Mask;
+
+        for (int axisIndex = 0; axisIndex < axisMask->axisCount; ++axisIndex)
+        {
+            const Vector2 &axis = axisMask->axes[axisIndex];
+            auto [projection1X, projection1Y] = projectPolygon(axis, instance1Mask->vertices.data(), instance1Mask->vertexCount);
+            auto [projection2X, projection2Y] = projectPolygon(axis, instance2Mask->vertices.data(), instance2Mask->vertexCount);
+
+            if (!(projection1X <= projection2Y && projection2X <= projection1Y))
+                return false;
+
+            float overlap = std::min(projection1Y, projection2Y) - std::max(projection1X, projection2X);
+
+            if (overlap < minOverlap)
+            {
+                minOverlap = overlap;
+                smallestAxis = axis;
+            }
         }
     }
 
@@ -195,34 +757,435 @@ void computeCollisionData(nanobind::list *collisions, std::pair<int, int> pair,
         smallestAxis.y = -smallestAxis.y;
     }
 
-    Vector2 normal = smallestAxis;
-    Vector2 contactPoint = *instance1Mask->position + smallestAxis * (minOverlap / 2);
+    contact->overlap = minOverlap;
+    contact->normal = smallestAxis;
+    contact->point = *instance1Mask->position + smallestAxis * (minOverlap / 2);
+    return true;
+}
+
+// Picks the routine for the pair of shapes
+bool computeCollisionData(CollisionRecord *collision, std::pair<int, int> pair, const CollisionMask *instance1Mask, const CollisionMask *instance2Mask)
+{
+    ContactData contact;
+    bool isInstance1Round = instance1Mask->isRound();
+    bool isInstance2Round = instance2Mask->isRound();
+    bool isColliding;
+
+    if (isInstance1Round && isInstance2Round)
+    {
+        isColliding = computeRoundContact(&contact, instance1Mask, instance2Mask);
+    }
+    else if (isInstance2Round)
+    {
+        isColliding = computePolygonRoundContact(&contact, instance1Mask, instance2Mask);
+    }
+    else if (isInstance1Round)
+    {
+        isColliding = computePolygonRoundContact(&contact, instance2Mask, instance1Mask);
+        contact.normal = contact.normal * -1.0f;
+    }
+    else if (instance1Mask->isAxisAligned && instance2Mask->isAxisAligned)
+    {
+        isColliding = computeAxisAlignedContact(&contact, instance1Mask, instance2Mask);
+    }
+    else
+    {
+        isColliding = computePolygonContact(&contact, instance1Mask, instance2Mask);
+    }
+
+    if (!isColliding)
+        return false;
+
+    *collision = CollisionRecord{pair.first, pair.second, 0, contact.overlap, contact.normal.x, contact.normal.y, contact.point.x, contact.point.y};
+    return true;
+}
+
+// Earliest time in [0, 1] at which the moving bounds touch the other bounds, or 1 if they never do
+float sweepBounds(const AABB &moving, float deltaX, float deltaY, const AABB &other)
+{
+    float entry = 0.0f;
+    float exit = 1.0f;
+    const float movingMin[2] = {moving.minX, moving.minY};
+    const float movingMax[2] = {moving.maxX, moving.maxY};
+    const float otherMin[2] = {other.minX, other.minY};
+    const float otherMax[2] = {other.maxX, other.maxY};
+    const float delta[2] = {deltaX, deltaY};
+
+    for (int axis = 0; axis < 2; ++axis)
+    {
+        if (delta[axis] == 0.0f)
+        {
+            // Never moves into the other bounds along this axis
+            if (movingMax[axis] < otherMin[axis] || otherMax[axis] < movingMin[axis])
+                return 1.0f;
+
+            continue;
+        }
+
+        float axisEntry = ((delta[axis] > 0.0f ? otherMin[axis] - movingMax[axis] : otherMax[axis] - movingMin[axis])) / delta[axis];
+        float axisExit = ((delta[axis] > 0.0f ? otherMax[axis] - movingMin[axis] : otherMin[axis] - movingMax[axis])) / delta[axis];
+        entry = std::max(entry, axisEntry);
+        exit = std::min(exit, axisExit);
+    }
+
+    if (entry > exit)
+        return 1.0f;
+
+    return entry;
+}
+
+// Ids of every mask whose broad-phase bounds touch the given bounds, from both partitions and without duplicates
+void queryCandidates(const AABB &bounds, std::vector<int> &candidates)
+{
+    broadPhase->query(bounds, candidates);
+    staticBroadPhase->query(bounds, candidates);
+    std::sort(candidates.begin(), candidates.end());
+    candidates.erase(std::unique(candidates.begin(), candidates.end()), candidates.end());
+}
+
+/*
+    Sweeps the bounds of a mask along a movement and returns the fraction of it that can be travelled before touching
+    another collidable mask, 1 if nothing is in the way.
+
+    Masks that already overlap at the start are left to the discrete check.
+*/
+float sweep(int id, float deltaX, float deltaY)
+{
+    auto it = collisionMasks.find(id);
+
+    if (it == collisionMasks.end() || !it->second->isCollidable || it->second->isEmpty)
+        return 1.0f;
+
+    CollisionMask *movingMask = it->second;
+    const AABB &bounds = movingMask->bounds;
+    AABB sweptBounds = bounds.merge(AABB(bounds.minX + deltaX, bounds.minY + deltaY, bounds.maxX + deltaX, bounds.maxY + deltaY));
+    std::vector<int> candidates;
+    queryCandidates(sweptBounds, candidates);
+
+    float timeOfImpact = 1.0f;
+
+    for (int candidateID : candidates)
+    {
+        if (candidateID == id)
+            continue;
+
+        CollisionMask *candidateMask = collisionMasks[candidateID];
+
+        if (!candidateMask->isCollidable || !areGroupsCollidable(movingMask, candidateMask) || bounds.overlaps(candidateMask->bounds))
+            continue;
+
+        timeOfImpact = std::min(timeOfImpact, sweepBounds(bounds, deltaX, deltaY, candidateMask->bounds));
+    }
+
+    return timeOfImpact;
+}
+
+// A negative collision group matches every collidable mask
+bool matchesQuery(const CollisionMask *mask, int collisionGroup)
+{
+    if (!mask->isCollidable)
+        return false;
+
+    if (collisionGroup < 0)
+        return true;
+
+    return (collisionGroupMasks[collisionGroup] >> mask->collisionGroup) & 1ULL;
+}
+
+void validateQueryGroup(int collisionGroup)
+{
+    if (collisionGroup >= MAX_COLLISION_GROUPS)
+        throw nanobind::index_error("Collision group is out of range");
+}
+
+// Free standing mask used to test query shapes against the real ones
+struct QueryMask
+{
+    CollisionMask mask;
+
+    QueryMask(int shape, float x, float y, float width, float height, float rotation)
+    {
+        if (shape < static_cast<int>(ShapeType::BOX) || shape > static_cast<int>(ShapeType::CAPSULE))
+            throw nanobind::value_error("Query shapes can only be boxes, circles or capsules");
+
+        mask.id = -1;
+        mask.isCollidable = true;
+        mask.isStatic = false;
+        mask.collisionGroup = 0;
+        mask.shape = static_cast<ShapeType>(shape);
+        mask.position = std::make_shared<Vector2>(x, y);
+        mask.size = std::make_shared<Vector2>(width, height);
+        mask.rotation = std::make_shared<Angle>();
+        mask.rotation->setDegrees(rotation);
+        mask.recompute();
+    }
+};
+
+bool containsPoint(const CollisionMask *mask, const Vector2 &point)
+{
+    if (mask->isRound())
+    {
+        Vector2 distance = point - closestPointOnSegment(point, mask->segmentStart, mask->segmentEnd);
+        return distance.dot(distance) <= mask->radius * mask->radius;
+    }
+
+    for (int index = 0; index < mask->axisCount; ++index)
+    {
+        auto [min, max] = projectPolygon(mask->axes[index], mask->vertices.data(), mask->vertexCount);
+        float projection = point.dot(mask->axes[index]);
 
-    collisions->append(nanobind::make_tuple(pair, minOverlap, normal, contactPoint));
+        if (projection < min || projection > max)
+            return false;
+    }
+
+    return true;
 }
 
-nanobind::list checkCollisions(const nanobind::dict validCollisionMasks, const nanobind::list updatedCollisionMasks)
+// Distance along a normalized ray at which it enters a convex polygon, negative when it misses
+float raycastPolygon(const Vector2 &origin, const Vector2 &direction, float maxDistance, const Vector2 *vertices, int vertexCount, const Vector2 &center)
 {
-    std::set<std::pair<int, int>> checkedPairs;
-    nanobind::list collisions;
+    float enter = 0.0f;
+    float exit = maxDistance;
 
-    if (checkGridForCleanup)
+    for (int index = 0; index < vertexCount; ++index)
     {
-        checkGridForCleanup = false;
+        const Vector2 &vertex1 = vertices[index];
+        const Vector2 &vertex2 = vertices[(index + 1) % vertexCount];
+        Vector2 normal(vertex2.y - vertex1.y, vertex1.x - vertex2.x);
+
+        // Works for both windings by making the normal point away from the center
+        if ((center - vertex1).dot(normal) > 0.0f)
+            normal = normal * -1.0f;
+
+        float denominator = normal.dot(direction);
+        float numerator = normal.dot(vertex1 - origin);
 
-        for (auto it = collisionGrid.begin(); it != collisionGrid.end();)
+        if (denominator == 0.0f)
         {
-            if (it->second.empty())
-            {
-                it = collisionGrid.erase(it);
-            }
-            else
-            {
-                ++it;
-            }
+            if (numerator < 0.0f)
+                return -1.0f;
+
+            continue;
+        }
+
+        float t = numerator / denominator;
+
+        if (denominator < 0.0f)
+            enter = std::max(enter, t);
+        else
+            exit = std::min(exit, t);
+
+        if (enter > exit)
+            return -1.0f;
+    }
+
+    return enter;
+}
+
+float raycastCircle(const Vector2 &origin, const Vector2 &direction, float maxDistance, const Vector2 &center, float radius)
+{
+    Vector2 offset = origin - center;
+    float projection = offset.dot(direction);
+    float distance = offset.dot(offset) - radius * radius;
+
+    if (distance > 0.0f && projection > 0.0f)
+        return -1.0f;
+
+    float discriminant = projection * projection - distance;
+
+    if (discriminant < 0.0f)
+        return -1.0f;
+
+    float t = std::max(-projection - std::sqrt(discriminant), 0.0f);
+    return t <= maxDistance ? t : -1.0f;
+}
+
+float raycastMask(const Vector2 &origin, const Vector2 &direction, float maxDistance, const CollisionMask *mask)
+{
+    if (!mask->isRound())
+        return raycastPolygon(origin, direction, maxDistance, mask->vertices.data(), mask->vertexCount, mask->center);
+
+    // A capsule is its two end circles plus the box between them
+    float nearest = -1.0f;
+
+    for (const Vector2 &end : {mask->segmentStart, mask->segmentEnd})
+    {
+        float t = raycastCircle(origin, direction, maxDistance, end, mask->radius);
+
+        if (t >= 0.0f && (nearest < 0.0f || t < nearest))
+            nearest = t;
+    }
+
+    Vector2 segment = mask->segmentEnd - mask->segmentStart;
+    float segmentLength = segment.magnitude();
+
+    if (segmentLength > 0.0f)
+    {
+        Vector2 side = Vector2(-segment.y, segment.x) * (mask->radius / segmentLength);
+        const Vector2 vertices[4] = {mask->segmentStart + side, mask->segmentEnd + side, mask->segmentEnd - side, mask->segmentStart - side};
+        float t = raycastPolygon(origin, direction, maxDistance, vertices, 4, mask->center);
+
+        if (t >= 0.0f && (nearest < 0.0f || t < nearest))
+            nearest = t;
+    }
+
+    return nearest;
+}
+
+std::vector<int> queryPoint(float x, float y, int collisionGroup)
+{
+    validateQueryGroup(collisionGroup);
+    Vector2 point(x, y);
+    std::vector<int> candidates;
+    std::vector<int> results;
+    queryCandidates(AABB(x, y, x, y), candidates);
+
+    for (int candidateID : candidates)
+    {
+        const CollisionMask *candidateMask = collisionMasks[candidateID];
+
+        if (matchesQuery(candidateMask, collisionGroup) && containsPoint(candidateMask, point))
+            results.push_back(candidateID);
+    }
+
+    return results;
+}
+
+std::vector<int> queryAABB(float x, float y, float width, float height, int collisionGroup)
+{
+    validateQueryGroup(collisionGroup);
+    QueryMask query(static_cast<int>(ShapeType::BOX), x, y, width, height, 0.0f);
+    std::vector<int> candidates;
+    std::vector<int> results;
+    CollisionRecord record;
+
+    if (query.mask.isEmpty)
+        return results;
+
+    queryCandidates(query.mask.bounds, candidates);
+
+    for (int candidateID : candidates)
+    {
+        const CollisionMask *candidateMask = collisionMasks[candidateID];
+
+        if (matchesQuery(candidateMask, collisionGroup) && computeCollisionData(&record, {-1, candidateID}, &query.mask, candidateMask))
+            results.push_back(candidateID);
+    }
+
+    return results;
+}
+
+// Every mask hit by the ray as (id, distance), nearest first
+std::vector<std::pair<int, float>> raycast(float originX, float originY, float directionX, float directionY, float maxDistance, int collisionGroup)
+{
+    validateQueryGroup(collisionGroup);
+    std::vector<std::pair<int, float>> hits;
+    Vector2 origin(originX, originY);
+    Vector2 direction(directionX, directionY);
+    float directionLength = direction.magnitude();
+
+    if (directionLength == 0.0f || maxDistance <= 0.0f)
+        return hits;
+
+    direction = direction / directionLength;
+    Vector2 end = origin + direction * maxDistance;
+    std::vector<int> candidates;
+    queryCandidates(AABB(std::min(origin.x, end.x), std::min(origin.y, end.y), std::max(origin.x, end.x), std::max(origin.y, end.y)), candidates);
+
+    for (int candidateID : candidates)
+    {
+        const CollisionMask *candidateMask = collisionMasks[candidateID];
+
+        if (!matchesQuery(candidateMask, collisionGroup))
+            continue;
+
+        float distance = raycastMask(origin, direction, maxDistance, candidateMask);
+
+        if (distance >= 0.0f)
+            hits.push_back({candidateID, distance});
+    }
+
+    std::sort(hits.begin(), hits.end(), [](const auto &hit1, const auto &hit2)
+              { return hit1.second < hit2.second; });
+    return hits;
+}
+
+/*
+    Every mask whose bounds are touched while moving a shape by (delta x, delta y) as (id, fraction of the movement),
+    nearest first. Masks the shape already overlaps are reported at zero.
+*/
+std::vector<std::pair<int, float>> shapeCast(int shape, float x, float y, float width, float height, float rotation, float deltaX, float deltaY, int collisionGroup)
+{
+    validateQueryGroup(collisionGroup);
+    QueryMask query(shape, x, y, width, height, rotation);
+    std::vector<std::pair<int, float>> hits;
+
+    if (query.mask.isEmpty)
+        return hits;
+
+    const AABB &bounds = query.mask.bounds;
+    AABB sweptBounds = bounds.merge(AABB(bounds.minX + deltaX, bounds.minY + deltaY, bounds.maxX + deltaX, bounds.maxY + deltaY));
+    std::vector<int> candidates;
+    CollisionRecord record;
+    queryCandidates(sweptBounds, candidates);
+
+    for (int candidateID : candidates)
+    {
+        const CollisionMask *candidateMask = collisionMasks[candidateID];
+
+        if (!matchesQuery(candidateMask, collisionGroup))
+            continue;
+
+        if (bounds.overlaps(candidateMask->bounds))
+        {
+            if (computeCollisionData(&record, {-1, candidateID}, &query.mask, candidateMask))
+                hits.push_back({candidateID, 0.0f});
+
+            continue;
         }
+
+        float fraction = sweepBounds(bounds, deltaX, deltaY, candidateMask->bounds);
+
+        if (fraction < 1.0f)
+            hits.push_back({candidateID, fraction});
+    }
+
+    std::sort(hits.begin(), hits.end(), [](const auto &hit1, const auto &hit2)
+              { return hit1.second < hit2.second; });
+    return hits;
+}
+
+/*
+    Tests every updated mask against its neighbours and updates the contact cache.
+
+    Returns the contacts of the updated masks and the pairs that stopped touching since the last call, packed as
+    `CollisionRecord`s and pairs of int32 ids respectively. Contacts seen for the first time have an age of zero.
+*/
+nanobind::tuple checkCollisions(const nanobind::list updatedCollisionMasks)
+{
+    std::unordered_set<uint64_t> checkedPairs;
+    std::vector<CollisionRecord> collisions;
+    std::vector<int32_t> endedPairs;
+    std::vector<std::pair<CollisionMask *, CollisionMask *>> candidatePairs;
+    ++currentFrame;
+
+    for (const auto &[id1, id2] : pendingEndedPairs)
+    {
+        endedPairs.push_back(id1);
+        endedPairs.push_back(id2);
     }
 
+    pendingEndedPairs.clear();
+    std::vector<CollisionMask *> activeCollisionMasks;
+    std::vector<int> neighbors;
+
+    if (adaptiveCellSize && ++checksSinceSample >= ADAPTIVE_SAMPLE_INTERVAL)
+    {
+        checksSinceSample = 0;
+        fitCellSize();
+    }
+
+    // Every moved mask must be placed before querying, otherwise pairs between two moved masks depend on update order
     for (auto data : updatedCollisionMasks)
     {
         int activeInstanceID = nanobind::cast<int>(data);
@@ -233,41 +1196,134 @@ nanobind::list checkCollisions(const nanobind::dict validCollisionMasks, const n
             continue;
 
         CollisionMask *activeCollisionMask = it->second;
+        activeCollisionMask->checkedFrame = currentFrame;
         activeCollisionMask->recompute();
+        activeCollisionMask->updateBroadPhase();
 
-        for (const auto &cellCoord : activeCollisionMask->occupiedCells)
+        if (activeCollisionMask->isCollidable && !activeCollisionMask->isEmpty)
+            activeCollisionMasks.push_back(activeCollisionMask);
+    }
+
+    for (CollisionMask *activeCollisionMask : activeCollisionMasks)
+    {
+        int activeInstanceID = activeCollisionMask->id;
+        neighbors.clear();
+        broadPhase->query(activeCollisionMask->bounds, neighbors);
+
+        // A moved static mask is only tested against dynamic ones, static pairs are never reported
+        if (!activeCollisionMask->isStatic)
+            staticBroadPhase->query(activeCollisionMask->bounds, neighbors);
+
+        for (int neighborInstanceID : neighbors)
         {
-            if (collisionGrid.find(cellCoord) == collisionGrid.end())
+            if (activeInstanceID == neighborInstanceID)
                 continue;
 
-            auto &neighbors = collisionGrid[cellCoord];
+            CollisionMask *neighborCollisionMask = collisionMasks[neighborInstanceID];
 
-            for (int neighborInstanceID : neighbors)
-            {
-                if (activeInstanceID == neighborInstanceID || !validCollisionMasks.contains(neighborInstanceID))
-                    continue;
+            // Groups that never interact are rejected before any SAT work
+            if (!neighborCollisionMask->isCollidable || !areGroupsCollidable(activeCollisionMask, neighborCollisionMask))
+                continue;
+
+            // Tree leaves are fattened, so check the real bounds before the narrow-phase
+            if (!activeCollisionMask->bounds.overlaps(neighborCollisionMask->bounds))
+                continue;
 
-                int id1 = std::min(activeInstanceID, neighborInstanceID);
-                int id2 = std::max(activeInstanceID, neighborInstanceID);
-                std::pair<int, int> pair = {id1, id2};
+            int id1 = std::min(activeInstanceID, neighborInstanceID);
+            int id2 = std::max(activeInstanceID, neighborInstanceID);
+            uint64_t key = pairKey(id1, id2);
 
-                if (checkedPairs.count(pair))
-                    continue;
+            if (!checkedPairs.insert(key).second)
+                continue;
 
-                checkedPairs.insert(pair);
+            if (id1 == activeInstanceID)
+                candidatePairs.push_back({activeCollisionMask, neighborCollisionMask});
+            else
+                candidatePairs.push_back({neighborCollisionMask, activeCollisionMask});
+        }
+    }
 
-                CollisionMask *neighborCollisionMask = collisionMasks[neighborInstanceID];
-                computeCollisionData(&collisions, pair, activeCollisionMask, neighborCollisionMask);
-            }
+    // Pairs are independent, so the narrow-phase runs in parallel without the GIL and each pair writes its own slot
+    std::vector<CollisionRecord> pairRecords(candidatePairs.size());
+    std::vector<uint8_t> pairHits(candidatePairs.size(), 0);
+    ThreadPool::Task narrowPhase = [&](size_t begin, size_t end)
+    {
+        for (size_t index = begin; index < end; ++index)
+        {
+            const auto &[instance1Mask, instance2Mask] = candidatePairs[index];
+            pairHits[index] = computeCollisionData(&pairRecords[index], {instance1Mask->id, instance2Mask->id}, instance1Mask, instance2Mask);
+        }
+    };
+
+    if (candidatePairs.size() < PARALLEL_PAIR_THRESHOLD || threadCount <= 1)
+    {
+        narrowPhase(0, candidatePairs.size());
+    }
+    else
+    {
+        if (!threadPool)
+            threadPool = std::make_unique<ThreadPool>(threadCount);
+
+        nanobind::gil_scoped_release release;
+        threadPool->parallelFor(candidatePairs.size(), narrowPhase);
+    }
+
+    // Merged in pair order so the output does not depend on scheduling
+    for (size_t index = 0; index < candidatePairs.size(); ++index)
+    {
+        if (!pairHits[index])
+            continue;
+
+        CollisionRecord &collision = pairRecords[index];
+        auto [cached, isNew] = contactCache.try_emplace(pairKey(collision.id1, collision.id2));
+
+        if (!isNew)
+            collision.age = cached->second.record.age + 1;
+
+        cached->second = CachedContact{collision, currentFrame};
+        collisions.push_back(collision);
+    }
+
+    // A cached pair that was not seen again while one of its masks was checked is no longer touching
+    for (auto it = contactCache.begin(); it != contactCache.end();)
+    {
+        const CollisionRecord &record = it->second.record;
+
+        if (it->second.frame != currentFrame && (collisionMasks[record.id1]->checkedFrame == currentFrame || collisionMasks[record.id2]->checkedFrame == currentFrame))
+        {
+            endedPairs.push_back(record.id1);
+            endedPairs.push_back(record.id2);
+            it = contactCache.erase(it);
+        }
+        else
+        {
+            ++it;
         }
     }
 
-    return collisions;
+    return nanobind::make_tuple(
+        nanobind::bytes(collisions.data(), collisions.size() * sizeof(CollisionRecord)),
+        nanobind::bytes(endedPairs.data(), endedPairs.size() * sizeof(int32_t)));
 }
 
 NB_MODULE(CollisionSolver, m)
 {
-    m.def("create_collision_mask", &createCollisionMask, "id"_a, "size"_a, "position"_a, "rotation"_a);
+    m.def("create_collision_mask", &createCollisionMask, "id"_a, "size"_a, "position"_a, "rotation"_a, "is_collidable"_a, "is_static"_a, "collision_group"_a);
     m.def("destroy_collision_mask", &destroyCollisionMask, "id"_a);
-    m.def("check_collisions", &checkCollisions, "valid_collision_masks"_a, "updated_collision_masks"_a);
+    m.def("set_collidable", &setCollidable, "id"_a, "is_collidable"_a);
+    m.def("set_shape", &setShape, "id"_a, "shape"_a, "points"_a);
+    m.def("set_static", &setStatic, "id"_a, "is_static"_a);
+    m.def("set_collision_group", &setCollisionGroup, "id"_a, "collision_group"_a);
+    m.def("set_collision_group_mask", &setCollisionGroupMask, "collision_group"_a, "mask"_a);
+    m.def("set_broad_phase", &setBroadPhase, "type"_a);
+    m.def("set_cell_size", &setCellSize, "size"_a);
+    m.def("get_cell_size", &getCellSize);
+    m.def("set_adaptive_cell_size", &setAdaptiveCellSize, "enabled"_a);
+    m.def("set_thread_count", &setThreadCount, "count"_a);
+    m.def("sweep", &sweep, "id"_a, "delta_x"_a, "delta_y"_a);
+    m.def("query_point", &queryPoint, "x"_a, "y"_a, "collision_group"_a);
+    m.def("query_aabb", &queryAABB, "x"_a, "y"_a, "width"_a, "height"_a, "collision_group"_a);
+    m.def("raycast", &raycast, "origin_x"_a, "origin_y"_a, "direction_x"_a, "direction_y"_a, "max_distance"_a, "collision_group"_a);
+    m.def("shape_cast", &shapeCast, "shape"_a, "x"_a, "y"_a, "width"_a, "height"_a, "rotation"_a, "delta_x"_a, "delta_y"_a, "collision_group"_a);
+    m.def("check_collisions", &checkCollisions, "updated_collision_masks"_a);
 }
\ No newline at end of file
@@ -1,7 +1,36 @@
 
-
-def create_collision_mask(id: int, size: "Vector2", position: "Vector2", rotation: "Angle") -> None: ...
+def create_collision_mask(id: int, size: "Vector2", position: "Vector2", rotation: "Angle", is_collidable: bool, is_static: bool, collision_group: int) -> None: ...
 
 def destroy_collision_mask(id: int) -> None: ...
 
-def check_collisions(valid_collision_masks: dict, updated_collision_masks: list) -> list: ...
+def set_collidable(id: int, is_collidable: bool) -> None: ...
+
+def set_shape(id: int, shape: int, points: list["Vector2"]) -> None: ...
+
+def set_static(id: int, is_static: bool) -> None: ...
+
+def set_collision_group(id: int, collision_group: int) -> None: ...
+
+def set_collision_group_mask(collision_group: int, mask: int) -> None: ...
+
+def set_broad_phase(type: int) -> None: ...
+
+def set_cell_size(size: float) -> None: ...
+
+def get_cell_size() -> float: ...
+
+def set_adaptive_cell_size(enabled: bool) -> None: ...
+
+def set_thread_count(count: int) -> None: ...
+
+def sweep(id: int, delta_x: float, delta_y: float) -> float: ...
+
+def query_point(x: float, y: float, collision_group: int) -> list[int]: ...
+
+def query_aabb(x: float, y: float, width: float, height: float, collision_group: int) -> list[int]: ...
+
+def raycast(origin_x: float, origin_y: float, direction_x: float, direction_y: float, max_distance: float, collision_group: int) -> list[tuple[int, float]]: ...
+
+def shape_cast(shape: int, x: float, y: float, width: float, height: float, rotation: float, delta_x: float, delta_y: float, collision_group: int) -> list[tuple[int, float]]: ...
+
+def check_collisions(updated_collision_masks: list) -> tuple[bytes, bytes]: ...
@@ -1,63 +1,63 @@
+import struct
 from typing import TYPE_CHECKING
 
-import extro.services.CollisionGroup as CollisionGroupService
 import extro.internal.systems.Collision.CollisionSolver as CollisionSolver
 import extro.internal.ComponentManager as ComponentManager
+from extro.shared.Vector2 import Vector2
 
 if TYPE_CHECKING:
-    import extro.internal.InstanceManager as InstanceManager
-    from extro.shared.Vector2 import Vector2
     import extro.internal.systems.Transform as TransformSystem
 
-    Collision = tuple[InstanceManager.InstanceID, InstanceManager.InstanceID]
-    CollisionsData = list[tuple[Collision, float, "Vector2", "Vector2"]]
+    # Packed `COLLISION_RECORD_FORMAT` records, one per collision, and packed `ENDED_PAIR_FORMAT` pairs that stopped colliding
+    CollisionsData = tuple[bytes, bytes]
 
-
-collisions: "set[Collision]" = set()
+# (id1, id2, age, overlap, normal x, normal y, contact x, contact y), must match `CollisionRecord` in `CollisionRecord.hpp`
+COLLISION_RECORD_FORMAT: str = "=2iI5f"
+COLLISION_RECORD_SIZE: int = struct.calcsize(COLLISION_RECORD_FORMAT)
+# (id1, id2) of a pair that stopped colliding
+ENDED_PAIR_FORMAT: str = "=2i"
 
 
 def update(transform_updates: "TransformSystem.TransformUpdates") -> "CollisionsData":
-    global collisions
-
-    old_collisions = list(collisions)
-    collisions.clear()
-
-    collisions_data = CollisionSolver.check_collisions(
-        {
-            instance_id: collider.is_collidable
-            for instance_id, collider in ComponentManager.colliders.items()
-            if collider.is_collidable
-        },
-        transform_updates
-    )
-
-    for collision, *data in collisions_data:
-        instance1_id = collision[0]
-        instance2_id = collision[1]
-        instance1_collider = ComponentManager.colliders[instance1_id]
-        instance2_collider = ComponentManager.colliders[instance2_id]
-
-        if not CollisionGroupService.is_collidable(
-            instance1_collider._collision_group,
-            instance2_collider._collision_group,
-        ):
-            collisions_data.remove((collision, *data))
+    # Collision groups are already filtered by the solver, which also keeps track of the contacts between frames
+    collisions_data, ended_data = CollisionSolver.check_collisions(transform_updates)
+
+    for (
+        instance1_id,
+        instance2_id,
+        age,
+        overlap,
+        normal_x,
+        normal_y,
+        contact_x,
+        contact_y,
+    ) in struct.iter_unpack(COLLISION_RECORD_FORMAT, collisions_data):
+        # Only new contacts fire, persistent ones were reported when they began
+        if age > 0:
             continue
 
-        collisions.add(collision)
-
-        if collision not in old_collisions:
-            instance1_collider.on_collision.fire(instance2_id, *data)
-            instance2_collider.on_collision.fire(instance1_id, *data)
-
-    # Fire collision end events
-    for collision in old_collisions:
-        if collision in collisions:
-            continue
-
-        instance1_id = collision[0]
-        instance2_id = collision[1]
-        ComponentManager.colliders[instance1_id].on_collision_end.fire(instance2_id)
-        ComponentManager.colliders[instance2_id].on_collision_end.fire(instance1_id)
-
-    return collisions_data
+        instance1_collider = ComponentManager.colliders[instance1_id]
+        instance2_collider = ComponentManager.colliders[instance2_id]
+        normal: Vector2 = Vector2(normal_x, normal_y)
+        contact_point: Vector2 = Vector2(contact_x, contact_y)
+        instance1_collider.on_collision.fire(
+            instance2_id, overlap, normal, contact_point
+        )
+        instance2_collider.on_collision.fire(
+            instance1_id, overlap, normal, contact_point
+        )
+
+    # Fire collision end events, either collider may already be destroyed
+    for instance1_id, instance2_id in struct.iter_unpack(
+        ENDED_PAIR_FORMAT, ended_data
+    ):
+        instance1_collider = ComponentManager.colliders.get(instance1_id)
+        instance2_collider = ComponentManager.colliders.get(instance2_id)
+
+        if instance1_collider is not None:
+            instance1_collider.on_collision_end.fire(instance2_id)
+
+        if instance2_collider is not None:
+            instance2_collider.on_collision_end.fire(instance1_id)
+
+    return collisions_data, ended_data
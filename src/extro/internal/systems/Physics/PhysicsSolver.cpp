@@ -2,10 +2,15 @@
 #include <nanobind/stl/shared_ptr.h>
 #include <vector>
 #include <cmath>
+#include <cstdint>
+#include <algorithm>
 #include <unordered_map>
+#include <unordered_set>
 #include <memory>
 #include "../../../shared/Vector2.hpp"
 #include "../../../shared/Angle.hpp"
+#include "../../../shared/SlotPool.hpp"
+#include "../Collision/CollisionRecord.hpp"
 
 using namespace nanobind::literals;
 
@@ -14,7 +19,45 @@ const float MOMENT_OF_INERTIA_CONSTANT = 1.0f / 12.0f;
 float IMPULSE_SCALER = 1.0f;
 const float PENETRATION_CORRECTION = 0.8f;
 const float PENETRATION_SLOP = 0.05f;
+// Cached impulses are only reused when the contact normal barely changed since the previous frame
+const float WARM_START_NORMAL_TOLERANCE = 0.95f;
+int VELOCITY_ITERATIONS = 8;
+const float VELOCITY_MAGNITUDE_THRESHOLD = 0.01f;
+const float ANGULAR_VELOCITY_MAGNITUDE_THRESHOLD = 0.001f;
+// A body is resting while its velocity stays under these after the previous collision response
+const float SLEEP_VELOCITY_THRESHOLD = 1.0f;
+const float SLEEP_ANGULAR_VELOCITY_THRESHOLD = 0.01f;
+// Frames an entire island has to rest before it is put to sleep, zero disables sleeping
+int SLEEP_FRAMES = 60;
 const Vector2 ZERO_VECTOR = Vector2(0.0f, 0.0f);
+// Most destroyed bodies kept around for reuse
+const size_t BODY_POOL_CAPACITY = 4096;
+
+// Must match `INTEGRATION_FLAG_*` in `extro.internal.systems.Physics`
+const uint32_t INTEGRATION_FLAG_POSITION = 1 << 0;
+const uint32_t INTEGRATION_FLAG_ROTATION = 1 << 1;
+// The body asked for continuous collision detection, its movement has to be swept before it is applied
+const uint32_t INTEGRATION_FLAG_BULLET = 1 << 2;
+
+/*
+    Layout of a single moved body inside the buffer returned by `integrate`.
+
+    Must match `INTEGRATION_RECORD_FORMAT` in `extro.internal.systems.Physics`.
+*/
+struct IntegrationRecord
+{
+    int32_t id;
+    uint32_t flags;
+    float deltaX;
+    float deltaY;
+};
+
+struct AppliedForce
+{
+    Vector2 force;
+    // Relative to the center of the body
+    Vector2 point;
+};
 
 struct PhysicsBody
 {
@@ -30,6 +73,14 @@ struct PhysicsBody
     float inertia;
     float inverseInertia;
     bool isDynamic;
+    bool isAnchored;
+    bool isBullet;
+    bool isSleeping;
+    int restingFrames;
+    // Key into `sleepingIslands` while sleeping
+    int island;
+    std::vector<AppliedForce> forces;
+    std::vector<AppliedForce> impulses;
 
     void recompute()
     {
@@ -48,10 +99,20 @@ struct PhysicsBody
 };
 
 std::unordered_map<int, PhysicsBody *> physicsBodies;
+// Bodies that are moving or have forces acting on them, bodies at rest are not integrated
+std::unordered_set<int> activeBodies;
+// Bodies touching each other are put to sleep and woken up together
+std::unordered_map<int, std::vector<int>> sleepingIslands;
+int nextIsland = 0;
+// Pairs of dynamic bodies that touched during the last collision response, used to build islands
+std::vector<std::pair<int, int>> contactPairs;
+
+// Destroyed bodies are kept for reuse, high churn objects like bullets would otherwise allocate on every spawn
+SlotPool<PhysicsBody> physicsBodyPool(BODY_POOL_CAPACITY);
 
 void createPhysicsBody(int id, std::shared_ptr<Vector2> size, std::shared_ptr<Vector2> position, std::shared_ptr<Angle> rotation, std::shared_ptr<Vector2> velocity, std::shared_ptr<Angle> angularVelocity)
 {
-    PhysicsBody *physicsBody = new PhysicsBody();
+    PhysicsBody *physicsBody = physicsBodyPool.acquire();
     physicsBody->id = id;
     physicsBody->size = size;
     physicsBody->position = position;
@@ -62,49 +123,353 @@ void createPhysicsBody(int id, std::shared_ptr<Vector2> size, std::shared_ptr<Ve
     physicsBody->inverseMass = 1.0f;
     physicsBody->restitution = 0.2f;
     physicsBody->isDynamic = true;
+    physicsBody->isAnchored = false;
+    physicsBody->isBullet = false;
+    physicsBody->isSleeping = false;
+    physicsBody->restingFrames = 0;
+    physicsBody->island = -1;
     physicsBody->recompute();
     physicsBodies[id] = physicsBody;
 }
 
 void destroyPhysicsBody(int id)
 {
-    delete physicsBodies[id];
-    physicsBodies.erase(id);
+    auto it = physicsBodies.find(id);
+
+    if (it == physicsBodies.end())
+        return;
+
+    PhysicsBody *physicsBody = it->second;
+
+    if (physicsBody->isSleeping)
+    {
+        std::vector<int> &members = sleepingIslands[physicsBody->island];
+        members.erase(std::find(members.begin(), members.end(), id));
+
+        if (members.empty())
+            sleepingIslands.erase(physicsBody->island);
+    }
+
+    physicsBodyPool.release(physicsBody);
+    physicsBodies.erase(it);
+    activeBodies.erase(id);
 }
 
-void solveImpulse(Vector2 *normal, Vector2 *contactPoint, PhysicsBody *instance1PhysicsBody, PhysicsBody *instance2PhysicsBody)
+/*
+    Activates the body, waking its whole island if it was sleeping.
+
+    Resting frames of an awake body are left alone, only its velocity decides whether it keeps resting. Bodies woken from
+    sleep start counting again.
+*/
+void wake(int id)
 {
-    Vector2 instance1LevelArm = *contactPoint - (*instance1PhysicsBody->position + *instance1PhysicsBody->size / 2);
-    Vector2 instance2LevelArm = *contactPoint - (*instance2PhysicsBody->position + *instance2PhysicsBody->size / 2);
+    auto it = physicsBodies.find(id);
 
-    Vector2 relativeVelocity(
-        (instance2PhysicsBody->velocity->x + (-instance2LevelArm.y * instance2PhysicsBody->angularVelocity->radians)) - (instance1PhysicsBody->velocity->x + (-instance1LevelArm.y * instance1PhysicsBody->angularVelocity->radians)),
-        (instance2PhysicsBody->velocity->y + (instance2LevelArm.x * instance2PhysicsBody->angularVelocity->radians)) - (instance1PhysicsBody->velocity->y + (instance1LevelArm.x * instance1PhysicsBody->angularVelocity->radians)));
+    if (it == physicsBodies.end())
+        return;
 
-    float velocityAlongNormal = relativeVelocity.dot(*normal);
+    PhysicsBody *physicsBody = it->second;
 
-    if (velocityAlongNormal > -IMPULSE_EPSILON)
+    if (physicsBody->isSleeping)
+    {
+        auto islandIt = sleepingIslands.find(physicsBody->island);
+
+        for (int memberID : islandIt->second)
+        {
+            PhysicsBody *member = physicsBodies[memberID];
+            member->isSleeping = false;
+            member->restingFrames = 0;
+            member->island = -1;
+
+            if (!member->isAnchored)
+                activeBodies.insert(memberID);
+        }
+
+        sleepingIslands.erase(islandIt);
         return;
+    }
+
+    if (!physicsBody->isAnchored)
+        activeBodies.insert(id);
+}
+
+void setBullet(int id, bool isBullet)
+{
+    auto it = physicsBodies.find(id);
+
+    if (it != physicsBodies.end())
+        it->second->isBullet = isBullet;
+}
+
+bool isSleeping(int id)
+{
+    auto it = physicsBodies.find(id);
+    return it != physicsBodies.end() && it->second->isSleeping;
+}
+
+int findRoot(std::unordered_map<int, int> &parents, int id)
+{
+    while (parents[id] != id)
+    {
+        parents[id] = parents[parents[id]];
+        id = parents[id];
+    }
+
+    return id;
+}
+
+// Groups active bodies into islands through their contacts and puts every island that has been resting long enough to sleep
+void sleepRestingIslands(std::vector<IntegrationRecord> &records)
+{
+    std::unordered_map<int, int> parents;
 
-    float instance1AngularImpulse = instance1LevelArm.cross(*normal);
-    float instance2AngularImpulse = instance2LevelArm.cross(*normal);
-    float impulseMagnitude = ((-(1 + std::min(instance1PhysicsBody->restitution, instance2PhysicsBody->restitution)) * velocityAlongNormal) / ((instance1PhysicsBody->inverseMass + instance2PhysicsBody->inverseMass) + (instance1AngularImpulse * instance1AngularImpulse) * instance1PhysicsBody->inverseInertia + (instance2AngularImpulse * instance2AngularImpulse) * instance2PhysicsBody->inverseInertia)) * IMPULSE_SCALER;
+    for (int id : activeBodies)
+        parents[id] = id;
 
-    Vector2 impulse = (*normal) * impulseMagnitude;
+    for (const auto &[id1, id2] : contactPairs)
+    {
+        // Sleeping or resting inactive partners do not keep an island awake, so they are left out
+        if (!parents.count(id1) || !parents.count(id2))
+            continue;
+
+        parents[findRoot(parents, id1)] = findRoot(parents, id2);
+    }
+
+    contactPairs.clear();
+
+    std::unordered_map<int, std::vector<int>> islands;
 
-    if (instance1PhysicsBody->isDynamic)
+    for (const auto &[id, parent] : parents)
+        islands[findRoot(parents, id)].push_back(id);
+
+    for (auto &[root, members] : islands)
     {
-        instance1PhysicsBody->velocity->x -= impulse.x * instance1PhysicsBody->inverseMass;
-        instance1PhysicsBody->velocity->y -= impulse.y * instance1PhysicsBody->inverseMass;
-        instance1PhysicsBody->angularVelocity->setRadians(instance1PhysicsBody->angularVelocity->radians - ((impulseMagnitude * instance1AngularImpulse) * instance1PhysicsBody->inverseInertia));
+        bool isResting = std::all_of(members.begin(), members.end(), [](int id)
+                                     { return physicsBodies[id]->restingFrames >= SLEEP_FRAMES; });
+
+        if (!isResting)
+            continue;
+
+        int island = nextIsland++;
+
+        for (int id : members)
+        {
+            PhysicsBody *physicsBody = physicsBodies[id];
+            physicsBody->isSleeping = true;
+            physicsBody->island = island;
+            physicsBody->velocity->x = 0.0f;
+            physicsBody->velocity->y = 0.0f;
+            physicsBody->angularVelocity->setRadians(0.0f);
+            activeBodies.erase(id);
+
+            // Reported without flags so the zeroed velocity reaches Python
+            records.push_back(IntegrationRecord{id, 0, 0.0f, 0.0f});
+        }
+
+        sleepingIslands[island] = std::move(members);
     }
+}
+
+void addForce(int id, const Vector2 &force, const Vector2 &point)
+{
+    auto it = physicsBodies.find(id);
 
-    if (instance2PhysicsBody->isDynamic)
+    if (it == physicsBodies.end())
+        return;
+
+    it->second->forces.push_back(AppliedForce{force, point});
+    wake(id);
+}
+
+void addImpulse(int id, const Vector2 &impulse, const Vector2 &point)
+{
+    auto it = physicsBodies.find(id);
+
+    if (it == physicsBodies.end())
+        return;
+
+    it->second->impulses.push_back(AppliedForce{impulse, point});
+    wake(id);
+}
+
+void clearForces(int id)
+{
+    auto it = physicsBodies.find(id);
+
+    if (it != physicsBodies.end())
+        it->second->forces.clear();
+}
+
+/*
+    Integrates forces, impulses and dampening of every active body.
+
+    Velocities and rotations are written in place, positions are returned as packed `IntegrationRecord`s so Python can
+    move the transforms. Bodies that came to rest are deactivated.
+*/
+nanobind::bytes integrate(float delta, float dampening)
+{
+    float decay = std::max(1.0f - dampening * delta, 0.0f);
+    std::vector<IntegrationRecord> records;
+    records.reserve(activeBodies.size());
+
+    for (auto it = activeBodies.begin(); it != activeBodies.end();)
     {
-        instance2PhysicsBody->velocity->x += impulse.x * instance2PhysicsBody->inverseMass;
-        instance2PhysicsBody->velocity->y += impulse.y * instance2PhysicsBody->inverseMass;
-        instance2PhysicsBody->angularVelocity->setRadians(instance2PhysicsBody->angularVelocity->radians + ((impulseMagnitude * instance2AngularImpulse) * instance2PhysicsBody->inverseInertia));
+        PhysicsBody *physicsBody = physicsBodies[*it];
+
+        if (physicsBody->isAnchored)
+        {
+            it = activeBodies.erase(it);
+            continue;
+        }
+
+        // Measured before this frame's forces, which the collision response cancels out for bodies lying on something
+        bool isResting = physicsBody->velocity->magnitude() <= SLEEP_VELOCITY_THRESHOLD && std::abs(physicsBody->angularVelocity->radians) <= SLEEP_ANGULAR_VELOCITY_THRESHOLD;
+        physicsBody->restingFrames = isResting ? physicsBody->restingFrames + 1 : 0;
+
+        Vector2 actingForce = ZERO_VECTOR;
+        float actingRotationalForce = 0.0f;
+
+        // Bodies without an inverse mass cannot be pushed
+        if (physicsBody->inverseMass != 0.0f)
+        {
+            for (const AppliedForce &appliedForce : physicsBody->forces)
+            {
+                actingForce += (appliedForce.force / physicsBody->inverseMass) * delta;
+                actingRotationalForce += appliedForce.point.cross(appliedForce.force);
+            }
+
+            for (const AppliedForce &appliedImpulse : physicsBody->impulses)
+            {
+                actingForce += appliedImpulse.force / physicsBody->inverseMass;
+                actingRotationalForce += appliedImpulse.point.cross(appliedImpulse.force);
+            }
+        }
+
+        physicsBody->impulses.clear();
+
+        Vector2 &velocity = *physicsBody->velocity;
+        Angle &angularVelocity = *physicsBody->angularVelocity;
+        IntegrationRecord record{physicsBody->id, 0, 0.0f, 0.0f};
+        velocity += actingForce;
+
+        if (velocity.magnitude() <= VELOCITY_MAGNITUDE_THRESHOLD)
+        {
+            velocity.x = 0.0f;
+            velocity.y = 0.0f;
+        }
+        else
+        {
+            velocity *= decay;
+            record.flags |= INTEGRATION_FLAG_POSITION;
+
+            if (physicsBody->isBullet)
+                record.flags |= INTEGRATION_FLAG_BULLET;
+
+            record.deltaX = velocity.x * delta;
+            record.deltaY = velocity.y * delta;
+        }
+
+        angularVelocity.setRadians(angularVelocity.radians + actingRotationalForce * physicsBody->inverseMass * delta);
+
+        if (std::abs(angularVelocity.radians) <= ANGULAR_VELOCITY_MAGNITUDE_THRESHOLD)
+        {
+            angularVelocity.setRadians(0.0f);
+        }
+        else
+        {
+            angularVelocity.setRadians(angularVelocity.radians * decay);
+            physicsBody->rotation->setRadians(physicsBody->rotation->radians + angularVelocity.radians * delta);
+            record.flags |= INTEGRATION_FLAG_ROTATION;
+        }
+
+        if (record.flags != 0)
+            records.push_back(record);
+
+        if (velocity.x == 0.0f && velocity.y == 0.0f && angularVelocity.radians == 0.0f && physicsBody->forces.empty())
+        {
+            it = activeBodies.erase(it);
+        }
+        else
+        {
+            ++it;
+        }
     }
+
+    if (SLEEP_FRAMES > 0)
+        sleepRestingIslands(records);
+    else
+        contactPairs.clear();
+
+    return nanobind::bytes(records.data(), records.size() * sizeof(IntegrationRecord));
+}
+
+struct ContactConstraint
+{
+    uint64_t key;
+    PhysicsBody *body1;
+    PhysicsBody *body2;
+    Vector2 normal;
+    Vector2 lever1;
+    Vector2 lever2;
+    float penetration;
+    float normalMass;
+    float bias;
+    float accumulatedImpulse;
+};
+
+struct CachedImpulse
+{
+    Vector2 normal;
+    float impulse;
+};
+
+// Last accumulated impulse of every contact that is still touching, keyed the same way as the collision contact cache
+std::unordered_map<uint64_t, CachedImpulse> impulseCache;
+
+uint64_t pairKey(int id1, int id2)
+{
+    return (static_cast<uint64_t>(static_cast<uint32_t>(id1)) << 32) | static_cast<uint32_t>(id2);
+}
+
+Vector2 velocityAt(const PhysicsBody *physicsBody, const Vector2 &lever)
+{
+    float angularVelocity = physicsBody->angularVelocity->radians;
+    return Vector2(physicsBody->velocity->x - lever.y * angularVelocity, physicsBody->velocity->y + lever.x * angularVelocity);
+}
+
+void applyImpulse(PhysicsBody *physicsBody, const Vector2 &lever, const Vector2 &impulse)
+{
+    if (!physicsBody->isDynamic)
+        return;
+
+    physicsBody->velocity->x += impulse.x * physicsBody->inverseMass;
+    physicsBody->velocity->y += impulse.y * physicsBody->inverseMass;
+    physicsBody->angularVelocity->setRadians(physicsBody->angularVelocity->radians + lever.cross(impulse) * physicsBody->inverseInertia);
+}
+
+// Applies the impulse along the normal that keeps the accumulated impulse of the contact non-negative
+void solveImpulse(ContactConstraint &contact)
+{
+    Vector2 relativeVelocity = velocityAt(contact.body2, contact.lever2) - velocityAt(contact.body1, contact.lever1);
+    float velocityAlongNormal = relativeVelocity.dot(contact.normal);
+    float impulseMagnitude = contact.normalMass * (contact.bias - velocityAlongNormal) * IMPULSE_SCALER;
+    float accumulatedImpulse = std::max(contact.accumulatedImpulse + impulseMagnitude, 0.0f);
+    impulseMagnitude = accumulatedImpulse - contact.accumulatedImpulse;
+    contact.accumulatedImpulse = accumulatedImpulse;
+
+    Vector2 impulse = contact.normal * impulseMagnitude;
+    applyImpulse(contact.body1, contact.lever1, impulse * -1.0f);
+    applyImpulse(contact.body2, contact.lever2, impulse);
+}
+
+// Forgets the cached impulses of the pairs that stopped touching, given as packed pairs of int32 ids
+void endContacts(nanobind::bytes endedPairs)
+{
+    const int32_t *ids = static_cast<const int32_t *>(endedPairs.data());
+    size_t idCount = endedPairs.size() / sizeof(int32_t);
+
+    for (size_t index = 0; index + 1 < idCount; index += 2)
+        impulseCache.erase(pairKey(ids[index], ids[index + 1]));
 }
 
 void step(nanobind::list physicsBodyUpdates)
@@ -112,87 +477,179 @@ void step(nanobind::list physicsBodyUpdates)
     for (const auto &data : physicsBodyUpdates)
     {
         PhysicsBody *physicsBody = physicsBodies[nanobind::cast<int>(data[0])];
+        bool wasAnchored = physicsBody->isAnchored;
         physicsBody->mass = nanobind::cast<float>(data[1]);
         physicsBody->inverseMass = nanobind::cast<float>(data[2]);
         physicsBody->restitution = nanobind::cast<float>(data[3]);
         physicsBody->isDynamic = nanobind::cast<bool>(data[4]);
+        physicsBody->isAnchored = nanobind::cast<bool>(data[5]);
         physicsBody->recompute();
+
+        if (physicsBody->isAnchored)
+            activeBodies.erase(physicsBody->id);
+        // Forces kept while anchored act again right away
+        else if (wasAnchored)
+            wake(physicsBody->id);
     }
 }
 
-nanobind::list resolveCollisions(nanobind::list collisions)
+/*
+    Resolves the contacts with sequential impulses.
+
+    Every contact starts from the impulse it ended with on the previous frame, then all contacts are solved together for
+    `VELOCITY_ITERATIONS` passes, clamping the accumulated impulse of each contact so it can only push bodies apart.
+*/
+nanobind::list resolveCollisions(nanobind::bytes collisions)
 {
-    nanobind::list updatedInstances;
+    const CollisionRecord *records = static_cast<const CollisionRecord *>(collisions.data());
+    size_t recordCount = collisions.size() / sizeof(CollisionRecord);
+    std::vector<ContactConstraint> contacts;
+    contacts.reserve(recordCount);
 
-    for (const auto &data : collisions)
+    for (size_t index = 0; index < recordCount; ++index)
     {
-        float penetration = nanobind::cast<float>(data[1]);
+        const CollisionRecord &record = records[index];
+        auto instance1It = physicsBodies.find(record.id1);
+        auto instance2It = physicsBodies.find(record.id2);
 
-        if (penetration <= PENETRATION_SLOP)
+        if (instance1It == physicsBodies.end() || instance2It == physicsBodies.end())
             continue;
 
-        nanobind::tuple collisionPair = data[0];
-        int instance1ID = nanobind::cast<int>(collisionPair[0]);
-        int instance2ID = nanobind::cast<int>(collisionPair[1]);
+        PhysicsBody *instance1PhysicsBody = instance1It->second;
+        PhysicsBody *instance2PhysicsBody = instance2It->second;
 
-        if (physicsBodies.find(instance1ID) == physicsBodies.end() ||
-            physicsBodies.find(instance2ID) == physicsBodies.end())
-        {
+        if (!instance1PhysicsBody->isDynamic && !instance2PhysicsBody->isDynamic)
             continue;
-        }
-
-        PhysicsBody *instance1PhysicsBody = physicsBodies[instance1ID];
-        PhysicsBody *instance2PhysicsBody = physicsBodies[instance2ID];
 
-        bool isInstance1Dynamic = instance1PhysicsBody->isDynamic;
-        bool isInstance2Dynamic = instance2PhysicsBody->isDynamic;
+        float totalInverseMass = (instance1PhysicsBody->inverseMass + instance2PhysicsBody->inverseMass);
 
-        if (!isInstance1Dynamic && !isInstance2Dynamic)
+        if (totalInverseMass == 0)
             continue;
 
-        float totalInverseMass = (instance1PhysicsBody->inverseMass + instance2PhysicsBody->inverseMass);
+        bool isInstance1Awake = instance1PhysicsBody->isDynamic && !instance1PhysicsBody->isSleeping;
+        bool isInstance2Awake = instance2PhysicsBody->isDynamic && !instance2PhysicsBody->isSleeping;
 
-        if (totalInverseMass == 0)
+        // Nothing awake to push
+        if (!isInstance1Awake && !isInstance2Awake)
             continue;
 
-        Vector2 normal = nanobind::cast<Vector2>(data[2]);
-        Vector2 contactPoint = nanobind::cast<Vector2>(data[3]);
+        // An awake body ran into a sleeping one
+        if (instance1PhysicsBody->isSleeping)
+            wake(record.id1);
+
+        if (instance2PhysicsBody->isSleeping)
+            wake(record.id2);
+
+        if (instance1PhysicsBody->isDynamic && instance2PhysicsBody->isDynamic)
+            contactPairs.push_back({record.id1, record.id2});
+
+        ContactConstraint contact;
+        contact.key = pairKey(record.id1, record.id2);
+        contact.body1 = instance1PhysicsBody;
+        contact.body2 = instance2PhysicsBody;
+        contact.normal = Vector2(record.normalX, record.normalY);
+        contact.penetration = record.overlap;
+
+        Vector2 contactPoint(record.contactX, record.contactY);
+        contact.lever1 = contactPoint - (*instance1PhysicsBody->position + *instance1PhysicsBody->size / 2);
+        contact.lever2 = contactPoint - (*instance2PhysicsBody->position + *instance2PhysicsBody->size / 2);
 
-        penetration *= PENETRATION_CORRECTION;
-        Vector2 correction = normal * penetration;
+        float instance1AngularImpulse = contact.lever1.cross(contact.normal);
+        float instance2AngularImpulse = contact.lever2.cross(contact.normal);
+        contact.normalMass = 1.0f / (totalInverseMass + (instance1AngularImpulse * instance1AngularImpulse) * instance1PhysicsBody->inverseInertia + (instance2AngularImpulse * instance2AngularImpulse) * instance2PhysicsBody->inverseInertia);
 
-        solveImpulse(
-            &normal,
-            &contactPoint,
-            instance1PhysicsBody,
-            instance2PhysicsBody);
+        // Restitution is based on the approach velocity before any impulse of this frame
+        float velocityAlongNormal = (velocityAt(instance2PhysicsBody, contact.lever2) - velocityAt(instance1PhysicsBody, contact.lever1)).dot(contact.normal);
+        float restitution = std::min(instance1PhysicsBody->restitution, instance2PhysicsBody->restitution);
+        contact.bias = velocityAlongNormal < -IMPULSE_EPSILON ? -restitution * velocityAlongNormal : 0.0f;
+        contact.accumulatedImpulse = 0.0f;
 
-        if (isInstance1Dynamic)
+        auto cached = impulseCache.find(contact.key);
+
+        if (record.age > 0 && cached != impulseCache.end() && cached->second.normal.dot(contact.normal) >= WARM_START_NORMAL_TOLERANCE)
         {
-            float massCorrection = instance1PhysicsBody->inverseMass / totalInverseMass;
-            instance1PhysicsBody->position->x -= correction.x * massCorrection;
-            instance1PhysicsBody->position->y -= correction.y * massCorrection;
-            updatedInstances.append(instance1ID);
+            contact.accumulatedImpulse = cached->second.impulse;
+            Vector2 impulse = contact.normal * contact.accumulatedImpulse;
+            applyImpulse(instance1PhysicsBody, contact.lever1, impulse * -1.0f);
+            applyImpulse(instance2PhysicsBody, contact.lever2, impulse);
         }
 
-        if (isInstance2Dynamic)
+        contacts.push_back(contact);
+    }
+
+    for (int iteration = 0; iteration < VELOCITY_ITERATIONS; ++iteration)
+        for (ContactConstraint &contact : contacts)
+            solveImpulse(contact);
+
+    std::unordered_set<int> updatedIDs;
+    nanobind::list updatedInstances;
+
+    for (const ContactConstraint &contact : contacts)
+    {
+        impulseCache[contact.key] = CachedImpulse{contact.normal, contact.accumulatedImpulse};
+
+        // Every dynamic body in a contact had its velocity changed, even if it needs no position correction
+        for (PhysicsBody *physicsBody : {contact.body1, contact.body2})
+            if (physicsBody->isDynamic && updatedIDs.insert(physicsBody->id).second)
+            {
+                updatedInstances.append(physicsBody->id);
+
+                // Bodies resting on something are in a contact every frame, waking them again would stop them from ever sleeping
+                if (physicsBody->isSleeping || !activeBodies.count(physicsBody->id))
+                    wake(physicsBody->id);
+            }
+
+        float penetration = contact.penetration - PENETRATION_SLOP;
+
+        if (penetration <= 0.0f)
+            continue;
+
+        float totalInverseMass = contact.body1->inverseMass + contact.body2->inverseMass;
+        Vector2 correction = contact.normal * (penetration * PENETRATION_CORRECTION);
+
+        if (contact.body1->isDynamic)
+        {
+            float massCorrection = contact.body1->inverseMass / totalInverseMass;
+            contact.body1->position->x -= correction.x * massCorrection;
+            contact.body1->position->y -= correction.y * massCorrection;
+        }
+
+        if (contact.body2->isDynamic)
         {
-            float massCorrection = instance2PhysicsBody->inverseMass / totalInverseMass;
-            instance2PhysicsBody->position->x += correction.x * massCorrection;
-            instance2PhysicsBody->position->y += correction.y * massCorrection;
-            updatedInstances.append(instance2ID);
+            float massCorrection = contact.body2->inverseMass / totalInverseMass;
+            contact.body2->position->x += correction.x * massCorrection;
+            contact.body2->position->y += correction.y * massCorrection;
         }
     }
 
     return updatedInstances;
 }
 
+void setIterations(int iterations)
+{
+    if (iterations < 1)
+        throw nanobind::value_error("Solver needs at least one iteration");
+
+    VELOCITY_ITERATIONS = iterations;
+}
+
 NB_MODULE(PhysicsSolver, m)
 {
     m.def("create_physics_body", &createPhysicsBody, "id"_a, "size"_a, "position"_a, "rotation"_a, "velocity"_a, "angular_velocity"_a);
     m.def("destroy_physics_body", &destroyPhysicsBody, "id"_a);
+    m.def("wake", &wake, "id"_a);
+    m.def("is_sleeping", &isSleeping, "id"_a);
+    m.def("set_bullet", &setBullet, "id"_a, "is_bullet"_a);
+    m.def("set_sleep_frames", [](int frames)
+          { SLEEP_FRAMES = std::max(frames, 0); }, "frames"_a);
+    m.def("add_force", &addForce, "id"_a, "force"_a, "point"_a);
+    m.def("add_impulse", &addImpulse, "id"_a, "impulse"_a, "point"_a);
+    m.def("clear_forces", &clearForces, "id"_a);
     m.def("step", &step, "physics_body_updates"_a);
+    m.def("integrate", &integrate, "delta"_a, "dampening"_a);
     m.def("resolve_collisions", &resolveCollisions, "collisions"_a);
+    m.def("end_contacts", &endContacts, "ended_pairs"_a);
+    m.def("set_iterations", &setIterations, "iterations"_a);
     m.def("set_impulse_scaler", [](float scaler)
           { IMPULSE_SCALER = scaler; }, "scaler"_a);
 }
\ No newline at end of file
@@ -4,8 +4,28 @@ def create_physics_body(id: int, size: "Vector2", position: "Vector2", rotation:
 
 def destroy_physics_body(id: int) -> None: ...
 
+def wake(id: int) -> None: ...
+
+def is_sleeping(id: int) -> bool: ...
+
+def set_sleep_frames(frames: int) -> None: ...
+
+def set_bullet(id: int, is_bullet: bool) -> None: ...
+
+def add_force(id: int, force: "Vector2", point: "Vector2") -> None: ...
+
+def add_impulse(id: int, impulse: "Vector2", point: "Vector2") -> None: ...
+
+def clear_forces(id: int) -> None: ...
+
 def step(physics_body_updates: list) -> None: ...
 
-def resolve_collisions(collisions: list) -> list: ...
+def integrate(delta: float, dampening: float) -> bytes: ...
+
+def resolve_collisions(collisions: bytes) -> list: ...
+
+def end_contacts(ended_pairs: bytes) -> None: ...
 
 def set_impulse_scaler(scaler: float) -> None: ...
+
+def set_iterations(iterations: int) -> None: ...
@@ -1,38 +1,54 @@
+import struct
 from typing import TYPE_CHECKING
 from enum import auto, IntFlag
 
 import extro.internal.ComponentManager as ComponentManager
 import extro.services.Physics as PhysicsService
 import extro.services.Timing as TimingService
-from extro.shared.Vector2 import Vector2
 import extro.internal.systems.Transform as TransformSystem
 import extro.internal.systems.Physics.PhysicsSolver as PhysicsSolver
+import extro.internal.systems.Collision.CollisionSolver as CollisionSolver
 
 
 if TYPE_CHECKING:
     import extro.internal.systems.Collision as CollisionSystem
     import extro.internal.InstanceManager as InstanceManager
 
-VELOCITY_MAGNITUDE_THRESHOLD: float = 0.01
-ANGLULAR_VELOCITY_MAGNITUDE_THRESHOLD: float = 0.001
-ZERO_VECTOR = Vector2(0, 0)
 DEFAULT_RESTITUTION: float = 0.5
 
+# Must match the `INTEGRATION_FLAG_*` constants in `PhysicsSolver.cpp`
+INTEGRATION_FLAG_POSITION: int = 1 << 0
+INTEGRATION_FLAG_ROTATION: int = 1 << 1
+INTEGRATION_FLAG_BULLET: int = 1 << 2
+# (id, flags, delta x, delta y), must match `IntegrationRecord` in `PhysicsSolver.cpp`
+INTEGRATION_RECORD_FORMAT: str = "=iI2f"
+
 
 class PhysicsBodyDirtyFlags(IntFlag):
     MASS = auto()
     RESTITUTION = auto()
 
 
-def update(collisions_data: "CollisionSystem.CollisionsData"):
+# Bodies with pending property changes for the solver
+dirty_bodies: "set[InstanceManager.InstanceID]" = set()
+# Bounding of every body before the last step moved it, only kept when using a fixed timestep
+previous_boundings: "dict[InstanceManager.InstanceID, list[float]]" = {}
+# Bodies whose rendered bounding is currently detached from their actual bounding
+interpolated_bodies: "set[InstanceManager.InstanceID]" = set()
+
+
+def update(collisions_data: "CollisionSystem.CollisionsData", delta: float):
     TimingService.on_pre_physics.fire()
+    is_fixed: bool = PhysicsService.fixed_timestep > 0
+    previous_boundings.clear()
 
-    decay: float = max(1 - (PhysicsService.dampening * TimingService.delta), 0)
     updates: list = []
 
-    for instance_id in list(ComponentManager.physics_bodies.keys()):
-        physics_body = ComponentManager.physics_bodies[instance_id]
-        has_flags: bool = not physics_body.is_empty()
+    for instance_id in dirty_bodies:
+        physics_body = ComponentManager.physics_bodies.get(instance_id)
+
+        if physics_body is None or physics_body.is_empty():
+            continue
 
         if physics_body.has_flag(PhysicsBodyDirtyFlags.MASS):
             physics_body._inverse_mass = (
@@ -43,86 +59,99 @@ def update(collisions_data: "CollisionSystem.CollisionsData"):
                 and physics_body._body_type == PhysicsService.PhysicsBodyType.DYNAMIC
             )
 
-        if has_flags:
-            physics_body.clear_flags()
-            updates.append(
-                (
-                    instance_id,
-                    physics_body._mass,
-                    physics_body._inverse_mass,
-                    physics_body._restitution,
-                    physics_body._is_dynamic,
-                )
+        physics_body.clear_flags()
+        updates.append(
+            (
+                instance_id,
+                physics_body._mass,
+                physics_body._inverse_mass,
+                physics_body._restitution,
+                physics_body._is_dynamic,
+                physics_body._is_anchored,
             )
+        )
 
-        if physics_body.is_anchored:
-            continue
-
-        acting_force: Vector2 = ZERO_VECTOR.copy()
-        acting_rotational_force: float = 0.0
-
-        if len(physics_body._forces) > 0:
-            for force, point in physics_body._forces[:]:
-                acting_force += (
-                    force / physics_body._inverse_mass
-                ) * TimingService.delta
-
-                if point != ZERO_VECTOR:
-                    acting_rotational_force += point.x * force.y - point.y * force.x
-
-        if len(physics_body._impulses) > 0:
-            for impulse, point in physics_body._impulses[:]:
-                acting_force += impulse / physics_body._inverse_mass
-
-                if point != ZERO_VECTOR:
-                    acting_rotational_force += point.x * impulse.y - point.y * impulse.x
+    dirty_bodies.clear()
+    PhysicsSolver.step(updates)
 
-            physics_body._impulses.clear()
+    # Forces, impulses and dampening are integrated natively, only bodies that moved are reported back
+    integration_data: bytes = PhysicsSolver.integrate(
+        delta, PhysicsService.dampening
+    )
 
+    for instance_id, flags, delta_x, delta_y in struct.iter_unpack(
+        INTEGRATION_RECORD_FORMAT, integration_data
+    ):
         transform = ComponentManager.transforms[instance_id]
 
-        physics_body._velocity += acting_force
-
-        if abs(physics_body._velocity.magnitude()) <= VELOCITY_MAGNITUDE_THRESHOLD:
-            physics_body._velocity.x = 0
-            physics_body._velocity.y = 0
-        else:
-            physics_body._velocity *= decay
-            vector: Vector2 = physics_body._velocity * TimingService.delta
-            transform.position.absolute_x += vector.x
-            transform.position.absolute_y += vector.y
-            transform.add_flag(TransformSystem.TransformDirtyFlags.POSITION)
+        if flags & INTEGRATION_FLAG_POSITION:
+            # Not resolved yet, so this is still the bounding from before the step
+            if is_fixed:
+                previous_boundings[instance_id] = transform._bounding[:]
 
-        physics_body._angular_velocity.radians += (
-            acting_rotational_force * physics_body._inverse_mass * TimingService.delta
-        )
+            # Bullets stop where they would first touch something instead of tunneling through it
+            if flags & INTEGRATION_FLAG_BULLET:
+                time_of_impact: float = CollisionSolver.sweep(
+                    instance_id, delta_x, delta_y
+                )
+                delta_x *= time_of_impact
+                delta_y *= time_of_impact
 
-        if (
-            abs(physics_body._angular_velocity.radians)
-            <= ANGLULAR_VELOCITY_MAGNITUDE_THRESHOLD
-        ):
-            physics_body._angular_velocity.radians = 0
-        else:
-            physics_body._angular_velocity.radians *= decay
-            transform._rotation.degrees += (
-                physics_body._angular_velocity.degrees * TimingService.delta
+            position = transform.position
+            position._set_using_absolute(
+                position._absolute_x + delta_x, position._absolute_y + delta_y
             )
+            transform.add_flag(TransformSystem.TransformDirtyFlags.POSITION)
+
+        # The solver already rotated the transform in place
+        if flags & INTEGRATION_FLAG_ROTATION:
             transform.add_flag(TransformSystem.TransformDirtyFlags.ROTATION)
 
-    PhysicsSolver.step(updates)
+    contacts_data, ended_data = collisions_data
+
+    # Warm starting impulses are kept for as long as the pair keeps touching
+    if len(ended_data) > 0:
+        PhysicsSolver.end_contacts(ended_data)
 
     # This happens at the end of the physics update to ensure all physics bodies have been updated
-    if len(collisions_data) > 0:
-        resolve_collisions(collisions_data)
+    if len(contacts_data) > 0:
+        resolve_collisions(contacts_data)
 
 
-def resolve_collisions(
-    collisions_data: "CollisionSystem.CollisionsData",
-):
+def resolve_collisions(contacts_data: bytes):
     updated_instances: "list[InstanceManager.InstanceID]" = (
-        PhysicsSolver.resolve_collisions(collisions_data)
+        PhysicsSolver.resolve_collisions(contacts_data)
     )
 
     for instance_id in updated_instances:
         transform = ComponentManager.transforms[instance_id]
         transform.add_flag(TransformSystem.TransformDirtyFlags.POSITION)
+
+
+def interpolate(alpha: float):
+    """Blends the rendered bounding of every body moved by the last fixed step between its previous and current bounding."""
+    for instance_id in interpolated_bodies - previous_boundings.keys():
+        transform = ComponentManager.transforms.get(instance_id)
+
+        if transform is not None:
+            transform._render_bounding = transform._bounding
+
+    interpolated_bodies.clear()
+
+    for instance_id, previous in previous_boundings.items():
+        transform = ComponentManager.transforms.get(instance_id)
+
+        if transform is None:
+            continue
+
+        current: list[float] = transform._bounding
+
+        if transform._render_bounding is current:
+            transform._render_bounding = current[:]
+
+        rendered: list[float] = transform._render_bounding
+
+        for index in range(4):
+            rendered[index] = previous[index] + (current[index] - previous[index]) * alpha
+
+        interpolated_bodies.add(instance_id)
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from math import hypot
+from typing import TYPE_CHECKING, Hashable, Iterable
 import pyray
 from enum import IntFlag, auto
 
@@ -9,10 +10,16 @@ import extro.Console as Console
 import extro.services.Render as RenderService
 import extro.internal.InstanceManager as InstanceManager
 import extro.internal.ComponentManager as ComponentManager
+import extro.internal.systems.Transform as TransformSystem
 
 if TYPE_CHECKING:
     import extro.internal.InstanceManager as InstanceManager
     from extro.instances.core.RenderTarget import RenderTarget
+    from extro.instances.core.components.Transform import Transform
+    from extro.instances.core.Instance import Instance
+    from extro.shared.types import BatchFunction
+
+    Bounds = tuple[float, float, float, float]
 
 
 class DrawableDirtyFlags(IntFlag):
@@ -22,7 +29,6 @@ class DrawableDirtyFlags(IntFlag):
 
 class RenderTargetDirtyFlags(IntFlag):
     ZINDEX = auto()
-    RENDER_ORDER = auto()
 
 
 render_targets: InstanceRegistry = InstanceRegistry(
@@ -30,41 +36,146 @@ render_targets: InstanceRegistry = InstanceRegistry(
     on_list_change=lambda: recalculate_render_order(),
 )
 render_order: "list[list[RenderTarget]]" = [[], []]  # 0 = world, 1 = independent
+# Render targets with pending zindex or render order changes
+dirty_targets: "set[InstanceManager.InstanceID]" = set()
+
+CULLING_CELL_SIZE: float = 256
+# Extra space around the viewport, covers interpolated bodies that are drawn slightly behind their bounding
+CULLING_MARGIN: float = 64
+
+
+def get_drawn_bounds(transform: "Transform") -> "Bounds":
+    """Axis-aligned bounds of everything a drawable can cover with this transform, used by the culling index."""
+    x, y, width, height = transform._bounding
+    offset_x, offset_y = transform._position_offset
+
+    if transform._rotation.radians == 0:
+        return (x - offset_x, y - offset_y, width, height)
+
+    # Drawables rotate around their position, so they stay within the circle reaching their farthest corner
+    radius: float = hypot(
+        max(offset_x, width - offset_x), max(offset_y, height - offset_y)
+    )
+    return (x - radius, y - radius, radius * 2, radius * 2)
+
+
+def get_world_viewport() -> "Bounds":
+    """Area of the world currently on screen, padded by `CULLING_MARGIN`."""
+    width: int = pyray.get_screen_width()
+    height: int = pyray.get_screen_height()
+
+    if WorldService.camera is None:
+        min_x, min_y, max_x, max_y = 0.0, 0.0, float(width), float(height)
+    else:
+        corners = [
+            pyray.get_screen_to_world_2d(
+                pyray.Vector2(screen_x, screen_y), WorldService.camera._camera
+            )
+            for screen_x, screen_y in (
+                (0, 0),
+                (width, 0),
+                (0, height),
+                (width, height),
+            )
+        ]
+        min_x = min(corner.x for corner in corners)
+        min_y = min(corner.y for corner in corners)
+        max_x = max(corner.x for corner in corners)
+        max_y = max(corner.y for corner in corners)
+
+    return (
+        min_x - CULLING_MARGIN,
+        min_y - CULLING_MARGIN,
+        max_x - min_x + CULLING_MARGIN * 2,
+        max_y - min_y + CULLING_MARGIN * 2,
+    )
+
+
+def update_culling_indexes():
+    """Moves every transform resolved since the last render to its new place in the culling index of its render target."""
+    for instance_id in TransformSystem.resolved_transforms:
+        hierarchy = ComponentManager.hierarchies.get(instance_id)
+        transform = ComponentManager.transforms.get(instance_id)
+
+        if (
+            hierarchy is None
+            or transform is None
+            or hierarchy._render_target is None
+        ):
+            continue
+
+        target: "RenderTarget | None" = InstanceManager.instances.get(hierarchy._render_target)  # type: ignore
+
+        if target is not None and target._culling_index is not None:
+            target._culling_index.update(instance_id, *get_drawn_bounds(transform))
+
+    TransformSystem.resolved_transforms.clear()
 
 
-def draw_render_target(target: "RenderTarget"):
+def draw_render_target(target: "RenderTarget", viewport: "Bounds | None" = None):
     if not target.is_visible:
         return
 
-    for instance_id in target._render_order[:]:
+    render_order: "Iterable[InstanceManager.InstanceID]" = target._draw_order
+
+    if viewport is not None and target._culling_index is not None:
+        render_order = target._draw_order.sort(
+            target._culling_index.query(*viewport)
+        )
+
+    batch: "list[Instance]" = []
+    batch_command: "BatchFunction | None" = None
+    batch_key: "Hashable | None" = None
+
+    for instance_id in list(render_order):
         drawable = ComponentManager.drawables[instance_id]
 
         if not drawable.is_visible:
             continue
 
-        drawable._render_command()
+        # Consecutive drawables sharing a batch are drawn together, anything else ends the current batch
+        if (
+            drawable._batch_command is not batch_command
+            or drawable._batch_key != batch_key
+            or batch_command is None
+        ):
+            if batch_command is not None:
+                batch_command(batch)
+                batch = []
+
+            batch_command = drawable._batch_command
+            batch_key = drawable._batch_key
+
+        if batch_command is None:
+            drawable._render_command()
+        else:
+            batch.append(InstanceManager.instances[instance_id])
+
+    if batch_command is not None:
+        batch_command(batch)
 
 
 def render():
     should_recalculate_render_order: bool = False
 
-    for target_id in render_targets.instances[:]:
-        target: "RenderTarget" = InstanceManager.instances[target_id]  # type: ignore
+    for target_id in dirty_targets:
+        target: "RenderTarget | None" = InstanceManager.instances.get(target_id)  # type: ignore
 
-        if target.bitmask._flags == 0:
+        if target is None or target.bitmask.is_empty():
             continue
 
         if target.bitmask.has_flag(RenderTargetDirtyFlags.ZINDEX):
             should_recalculate_render_order = True
 
-        if target.bitmask.has_flag(RenderTargetDirtyFlags.RENDER_ORDER):
-            target._render_order = calculate_render_order(target._instances.instances)
-
         target.bitmask.clear_flags()
 
+    dirty_targets.clear()
+
     if should_recalculate_render_order:
         recalculate_render_order()
 
+    update_culling_indexes()
+
     TimingService.on_pre_render.fire()
 
     pyray.begin_drawing()
@@ -73,8 +184,10 @@ def render():
     if WorldService.camera is not None:
         pyray.begin_mode_2d(WorldService.camera._camera)
 
+    viewport: "Bounds" = get_world_viewport()
+
     for instance in render_order[0]:
-        draw_render_target(instance)
+        draw_render_target(instance, viewport)
 
     if WorldService.camera is not None:
         pyray.end_mode_2d()
@@ -95,7 +208,7 @@ def recalculate_render_order():
     sorted_targets: "list[RenderTarget]" = sorted(
         (
             InstanceManager.instances[target_id]
-            for target_id in render_targets.instances[:]
+            for target_id in render_targets.snapshot()
         ),
         key=lambda target: target.zindex,  # type: ignore
     )
@@ -108,18 +221,8 @@ def recalculate_render_order():
         ).append(target)
 
     Console.log(
-        f"Render System is rendering {sum(len(targets) for targets in render_order)} targets"
+        "Render System is rendering {} targets",
+        Console.LogType.DEBUG,
+        len(render_order[0]) + len(render_order[1]),
     )
 
-
-def calculate_render_order(
-    targets: "list[InstanceManager.InstanceID]",
-) -> "list[InstanceManager.InstanceID]":
-    instances = [InstanceManager.instances[target] for target in targets]
-    return [
-        instance.id
-        for instance in sorted(
-            instances,
-            key=lambda instance: instance.get_component_unsafe("drawable")._zindex,
-        )
-    ]
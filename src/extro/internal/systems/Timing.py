@@ -14,7 +14,7 @@ timeouts: InstanceRegistry = InstanceRegistry("Timing System")
 def update():
     TimingService.delta = pyray.get_frame_time()
 
-    for instance_id in timeouts.instances[:]:
+    for instance_id in timeouts.snapshot():
         instance: "Timeout" = InstanceManager.instances[instance_id]  # type: ignore
 
         if not instance.is_active:
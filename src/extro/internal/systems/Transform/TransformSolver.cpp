@@ -0,0 +1,149 @@
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/shared_ptr.h>
+#include <cstdint>
+#include <unordered_map>
+#include <memory>
+#include "../../../shared/Vector2.hpp"
+
+using namespace nanobind::literals;
+
+// Must match `TransformDirtyFlags` and the relative flags in `extro.internal.systems.Transform`
+const uint32_t FLAG_POSITION = 1 << 0;
+const uint32_t FLAG_SIZE = 1 << 1;
+const uint32_t FLAG_RELATIVE_POSITION = 1 << 8;
+const uint32_t FLAG_RELATIVE_SIZE = 1 << 9;
+
+const size_t INPUT_STRIDE = 10;
+const size_t OUTPUT_STRIDE = 4;
+
+template <typename T>
+using Buffer = nanobind::ndarray<T, nanobind::ndim<1>, nanobind::c_contig, nanobind::device::cpu>;
+
+struct Transform
+{
+    int id;
+    std::shared_ptr<Vector2> actualPosition;
+    std::shared_ptr<Vector2> actualSize;
+    float bounding[4] = {0.0f, 0.0f, 0.0f, 0.0f};
+};
+
+std::unordered_map<int, Transform *> transforms;
+
+void createTransform(int id, std::shared_ptr<Vector2> actualSize, std::shared_ptr<Vector2> actualPosition)
+{
+    Transform *transform = new Transform();
+    transform->id = id;
+    transform->actualSize = actualSize;
+    transform->actualPosition = actualPosition;
+    transforms[id] = transform;
+}
+
+void destroyTransform(int id)
+{
+    auto it = transforms.find(id);
+
+    if (it == transforms.end())
+        return;
+
+    delete it->second;
+    transforms.erase(it);
+}
+
+/*
+    Resolves a batch of dirty transforms in one call.
+
+    The batch must be ordered by hierarchy depth so that parents are always resolved before their children. Each input row is
+    (size x, size y, scale x, scale y, position x, position y, anchor x, anchor y, offset x, offset y) and each
+    output row is the resulting bounding (x, y, width, height).
+*/
+void resolve(Buffer<const int> ids, Buffer<const int> parents, Buffer<const uint32_t> flags, Buffer<const float> inputs, Buffer<float> output)
+{
+    size_t count = ids.shape(0);
+
+    if (parents.shape(0) < count || flags.shape(0) < count || inputs.shape(0) < count * INPUT_STRIDE || output.shape(0) < count * OUTPUT_STRIDE)
+        throw nanobind::value_error("Transform batch buffers are too small");
+
+    const int *idData = ids.data();
+    const int *parentData = parents.data();
+    const uint32_t *flagData = flags.data();
+    const float *inputData = inputs.data();
+    float *outputData = output.data();
+
+    for (size_t index = 0; index < count; ++index)
+    {
+        auto it = transforms.find(idData[index]);
+
+        if (it == transforms.end())
+            continue;
+
+        Transform *transform = it->second;
+        const float *row = inputData + index * INPUT_STRIDE;
+        float *bounding = transform->bounding;
+        uint32_t rowFlags = flagData[index];
+        const Transform *parent = nullptr;
+
+        if (parentData[index] >= 0)
+        {
+            auto parentIt = transforms.find(parentData[index]);
+
+            if (parentIt != transforms.end())
+                parent = parentIt->second;
+        }
+
+        if (rowFlags & FLAG_SIZE)
+        {
+            float width = row[0] * row[2];
+            float height = row[1] * row[3];
+
+            if ((rowFlags & FLAG_RELATIVE_SIZE) && parent)
+            {
+                width *= parent->bounding[2];
+                height *= parent->bounding[3];
+            }
+
+            transform->actualSize->x = width;
+            transform->actualSize->y = height;
+
+            // A size change always moves the anchor point
+            rowFlags |= FLAG_POSITION;
+        }
+
+        if (rowFlags & FLAG_POSITION)
+        {
+            float x = row[4];
+            float y = row[5];
+
+            if ((rowFlags & FLAG_RELATIVE_POSITION) && parent)
+            {
+                x = parent->bounding[0] + parent->bounding[2] * row[4];
+                y = parent->bounding[1] + parent->bounding[3] * row[5];
+            }
+
+            float width = transform->actualSize->x;
+            float height = transform->actualSize->y;
+            x -= width * row[6];
+            y -= height * row[7];
+
+            transform->actualPosition->x = x + row[8];
+            transform->actualPosition->y = y + row[9];
+            bounding[0] = x;
+            bounding[1] = y;
+            bounding[2] = width;
+            bounding[3] = height;
+        }
+
+        float *outputRow = outputData + index * OUTPUT_STRIDE;
+        outputRow[0] = bounding[0];
+        outputRow[1] = bounding[1];
+        outputRow[2] = bounding[2];
+        outputRow[3] = bounding[3];
+    }
+}
+
+NB_MODULE(TransformSolver, m)
+{
+    m.def("create_transform", &createTransform, "id"_a, "actual_size"_a, "actual_position"_a);
+    m.def("destroy_transform", &destroyTransform, "id"_a);
+    m.def("resolve", &resolve, "ids"_a, "parents"_a, "flags"_a, "inputs"_a, "output"_a);
+}
@@ -0,0 +1,9 @@
+from array import array
+
+from extro.shared.Vector2 import Vector2
+
+def create_transform(id: int, actual_size: "Vector2", actual_position: "Vector2") -> None: ...
+
+def destroy_transform(id: int) -> None: ...
+
+def resolve(ids: "array", parents: "array", flags: "array", inputs: "array", output: "array") -> None: ...
@@ -0,0 +1,183 @@
+from array import array
+from enum import Enum, auto, IntFlag
+from typing import TYPE_CHECKING
+
+import extro.Window as Window
+from extro.shared.Coord import Coord
+import extro.internal.ComponentManager as ComponentManager
+import extro.internal.systems.Transform.TransformSolver as TransformSolver
+
+if TYPE_CHECKING:
+    import extro.internal.InstanceManager as InstanceManager
+
+    TransformUpdates = list[InstanceManager.InstanceID]
+
+
+class TransformUpdateType(Enum):
+    POSITION = auto()
+    ROTATION = auto()
+    SIZE = auto()
+
+
+class TransformDirtyFlags(IntFlag):
+    POSITION = auto()
+    SIZE = auto()
+    ROTATION = auto()
+
+
+INHERITED_FLAGS: int = TransformDirtyFlags.POSITION | TransformDirtyFlags.SIZE
+# Only used by the batch sent to `TransformSolver.resolve`, never set on a transform
+RELATIVE_POSITION_FLAG: int = 1 << 8
+RELATIVE_SIZE_FLAG: int = 1 << 9
+# Transforms still dirtied by `on_update` handlers after this many passes are left for the next update
+MAX_RESOLVE_PASSES: int = 4
+
+dirty_transforms: "set[InstanceManager.InstanceID]" = set()
+# Transforms resolved since the last render, the render system moves them in the culling index and clears the set
+resolved_transforms: "set[InstanceManager.InstanceID]" = set()
+
+
+def get_depth(instance_id: "InstanceManager.InstanceID") -> int:
+    depth: int = 0
+    hierarchy = ComponentManager.hierarchies.get(instance_id)
+
+    while hierarchy and hierarchy._parent is not None:
+        depth += 1
+        hierarchy = ComponentManager.hierarchies.get(hierarchy._parent)
+
+    return depth
+
+
+def propagate_to_children():
+    """Children inherit the size and position changes of their parents, no matter how deep they are."""
+    pending: "list[InstanceManager.InstanceID]" = list(dirty_transforms)
+
+    while len(pending) > 0:
+        instance_id = pending.pop()
+        transform = ComponentManager.transforms.get(instance_id)
+        hierarchy = ComponentManager.hierarchies.get(instance_id)
+
+        if not transform or not hierarchy:
+            continue
+
+        inherited_flags: int = transform._flags & INHERITED_FLAGS
+
+        if inherited_flags == 0:
+            continue
+
+        for child_id in hierarchy._children:
+            child_transform = ComponentManager.transforms.get(child_id)
+
+            if not child_transform or child_transform.has_flag(inherited_flags):  # type: ignore
+                continue
+
+            child_transform.add_flag(inherited_flags)  # type: ignore
+            pending.append(child_id)
+
+
+def update():
+    updates: "TransformUpdates" = []
+    passes: int = 0
+
+    # Handlers of `on_update` can dirty transforms again, those are resolved in another pass with their new values
+    while len(dirty_transforms) > 0 and passes < MAX_RESOLVE_PASSES:
+        updates.extend(resolve_dirty_transforms())
+        passes += 1
+
+    return list(dict.fromkeys(updates)) if passes > 1 else updates
+
+
+def resolve_dirty_transforms() -> "TransformUpdates":
+    propagate_to_children()
+
+    updates: "TransformUpdates" = sorted(
+        (
+            instance_id
+            for instance_id in dirty_transforms
+            if instance_id in ComponentManager.transforms
+        ),
+        key=get_depth,
+    )
+    dirty_transforms.clear()
+
+    ids: array = array("i", updates)
+    parents: array = array("i")
+    flags: array = array("I")
+    inputs: array = array("f")
+    output: array = array("f", [0.0]) * (len(updates) * 4)
+
+    for instance_id in updates:
+        transform = ComponentManager.transforms[instance_id]
+        hierarchy = ComponentManager.hierarchies.get(instance_id)
+        parent_id: int = (
+            hierarchy._parent if hierarchy and hierarchy._parent is not None else -1
+        )
+        batch_flags: int = transform._flags
+
+        if transform._size.type == Coord.CoordType.RELATIVE:
+            batch_flags |= RELATIVE_SIZE_FLAG
+
+        if transform._position.type == Coord.CoordType.RELATIVE:
+            batch_flags |= RELATIVE_POSITION_FLAG
+
+        parents.append(parent_id)
+        flags.append(batch_flags)
+        inputs.extend(
+            (
+                transform._size.absolute_x,
+                transform._size.absolute_y,
+                transform._scale.x,
+                transform._scale.y,
+                transform._position.absolute_x,
+                transform._position.absolute_y,
+                transform._anchor.x,
+                transform._anchor.y,
+                transform._position_offset[0],
+                transform._position_offset[1],
+            )
+        )
+
+    TransformSolver.resolve(ids, parents, flags, inputs, output)
+    resolved_transforms.update(updates)
+    resolved_flags: list[int] = []
+
+    # Flags are cleared before any handler runs so the changes they make are kept
+    for index, instance_id in enumerate(updates):
+        transform = ComponentManager.transforms[instance_id]
+        transform._bounding[:] = output[index * 4 : index * 4 + 4]
+        resolved_flags.append(transform._flags)
+        transform.clear_flags()
+
+    for instance_id, transform_flags in zip(updates, resolved_flags):
+        # An earlier handler may have destroyed it
+        transform = ComponentManager.transforms.get(instance_id)
+
+        if transform is None:
+            continue
+
+        if transform_flags & TransformDirtyFlags.SIZE:
+            transform.on_update.fire(TransformUpdateType.SIZE)
+
+        if transform_flags & INHERITED_FLAGS:
+            transform.on_update.fire(TransformUpdateType.POSITION)
+
+        if transform_flags & TransformDirtyFlags.ROTATION:
+            transform.on_update.fire(TransformUpdateType.ROTATION)
+
+    return updates
+
+
+def recalculate_normalized_coords():
+    for transform in ComponentManager.transforms.values():
+        if transform._position.type == Coord.CoordType.NORMALIZED:
+            transform._position._set_using_normalized(
+                transform._position.x, transform._position.y
+            )
+            transform.add_flag(TransformDirtyFlags.POSITION)
+
+        if transform._size.type == Coord.CoordType.NORMALIZED:
+            transform._size._set_using_normalized(transform._size.x, transform._size.y)
+            transform.add_flag(TransformDirtyFlags.SIZE)
+
+
+Window.on_resize.connect(recalculate_normalized_coords)
@@ -43,7 +43,7 @@ def recompute_type_map():
     for key in type_map.keys():
         type_map[key] = []
 
-    for instance_id in instances.instances[:]:
+    for instance_id in instances.snapshot():
         instance: "UIInstance" = InstanceManager.instances[instance_id]  # type: ignore
         type_map[instance._type].append(instance_id)
 
@@ -1,15 +1,26 @@
 from enum import IntFlag
+from typing import Hashable
 
 
 class BitMask:
-    __slots__ = ("_flags",)
+    __slots__ = ("_flags", "_dirty_set", "_dirty_key")
 
     _flags: int
-
-    def __init__(self):
+    _dirty_set: "set | None"
+    _dirty_key: Hashable
+
+    def __init__(self, dirty_set: "set | None" = None, dirty_key: Hashable = None):
+        """
+        `dirty_set` is an optional set owned by a system. On the first flag transition `dirty_key` is added to it, so the system only has to visit masks that actually changed. The system is responsible for clearing the set once it has processed it.
+        """
+        self._dirty_set = dirty_set
+        self._dirty_key = dirty_key
         self.clear_flags()
 
     def add_flag(self, flag: IntFlag):
+        if self._flags == 0 and self._dirty_set is not None:
+            self._dirty_set.add(self._dirty_key)
+
         self._flags |= flag
 
     def remove_flag(self, flag: IntFlag):
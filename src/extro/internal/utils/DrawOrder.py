@@ -0,0 +1,131 @@
+from bisect import insort
+from typing import TYPE_CHECKING, Hashable, Iterable, Iterator
+
+import extro.Console as Console
+
+if TYPE_CHECKING:
+    import extro.internal.InstanceManager as InstanceManager
+
+    DrawKey = tuple[int, int, int]
+
+
+class DrawOrder:
+    """
+    Draw order of the instances in a render target, kept up to date as instances are added, removed or re-keyed.
+
+    Instances are bucketed by zindex, then by batch group inside each bucket, so every change only touches the buckets involved instead of re-sorting the whole target. Groups and the instances inside them keep the order they were added in.
+    """
+
+    __slots__ = (
+        "_name",
+        "_zindexes",
+        "_buckets",
+        "_entries",
+        "_group_ranks",
+        "_next_rank",
+    )
+
+    _name: str
+    # Sorted zindexes that have at least one instance
+    _zindexes: list[int]
+    _buckets: "dict[int, dict[Hashable, dict[InstanceManager.InstanceID, None]]]"
+    # (zindex, group) and draw key of every instance
+    _entries: "dict[InstanceManager.InstanceID, tuple[int, Hashable, DrawKey]]"
+    _group_ranks: "dict[tuple[int, Hashable], int]"
+    _next_rank: int
+
+    def __init__(self, name: str):
+        self._name = name
+        self._zindexes = []
+        self._buckets = {}
+        self._entries = {}
+        self._group_ranks = {}
+        self._next_rank = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, instance_id: "InstanceManager.InstanceID") -> bool:
+        return instance_id in self._entries
+
+    def __iter__(self) -> "Iterator[InstanceManager.InstanceID]":
+        """Iterate over every instance in draw order."""
+        for zindex in self._zindexes:
+            for group in self._buckets[zindex].values():
+                yield from group
+
+    def add(
+        self, instance_id: "InstanceManager.InstanceID", zindex: int, group: Hashable
+    ):
+        if instance_id in self._entries:
+            Console.log(
+                "{} already draws instance {}",
+                Console.LogType.WARNING,
+                self._name,
+                instance_id,
+            )
+            return
+
+        bucket = self._buckets.get(zindex)
+
+        if bucket is None:
+            bucket = self._buckets[zindex] = {}
+            insort(self._zindexes, zindex)
+
+        members = bucket.get(group)
+
+        if members is None:
+            members = bucket[group] = {}
+            self._group_ranks[(zindex, group)] = self._next_rank
+            self._next_rank += 1
+
+        members[instance_id] = None
+        self._entries[instance_id] = (
+            zindex,
+            group,
+            (zindex, self._group_ranks[(zindex, group)], self._next_rank),
+        )
+        self._next_rank += 1
+
+    def remove(self, instance_id: "InstanceManager.InstanceID"):
+        entry = self._entries.pop(instance_id, None)
+
+        if entry is None:
+            return
+
+        zindex, group, _ = entry
+        bucket = self._buckets[zindex]
+        members = bucket[group]
+        del members[instance_id]
+
+        if len(members) > 0:
+            return
+
+        del bucket[group]
+        del self._group_ranks[(zindex, group)]
+
+        if len(bucket) == 0:
+            del self._buckets[zindex]
+            self._zindexes.remove(zindex)
+
+    def move(
+        self, instance_id: "InstanceManager.InstanceID", zindex: int, group: Hashable
+    ):
+        """Re-key an instance after its zindex or batch group changed."""
+        entry = self._entries.get(instance_id)
+
+        if entry is None or (entry[0] == zindex and entry[1] == group):
+            return
+
+        self.remove(instance_id)
+        self.add(instance_id, zindex, group)
+
+    def sort(
+        self, instance_ids: "Iterable[InstanceManager.InstanceID]"
+    ) -> "list[InstanceManager.InstanceID]":
+        """Put a subset of the instances in draw order, instances that are not drawn are left out."""
+        entries = self._entries
+        return sorted(
+            (instance_id for instance_id in instance_ids if instance_id in entries),
+            key=lambda instance_id: entries[instance_id][2],
+        )
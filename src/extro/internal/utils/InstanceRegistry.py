@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING, Callable
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
 import extro.Console as Console
+import extro.internal.CommandBuffer as CommandBuffer
 
 if TYPE_CHECKING:
     from extro.shared.types import EmptyFunction
@@ -8,11 +10,41 @@ if TYPE_CHECKING:
 
     PreRegisterCheck = Callable[[InstanceManager.InstanceID], bool]
 
+# Registries changed inside `batch_changes`, notified once the outermost block ends
+_pending_registries: "dict[InstanceRegistry, None]" = {}
+_batch_depth: int = 0
+
+
+@contextmanager
+def batch_changes() -> Iterator[None]:
+    """Defer `on_list_change` of every registry until the block ends. Each changed registry is then notified once, no matter how many instances were registered or unregistered."""
+    global _batch_depth
+    _batch_depth += 1
+
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+
+        if _batch_depth == 0:
+            while len(_pending_registries) > 0:
+                registry = next(iter(_pending_registries))
+                del _pending_registries[registry]
+                registry._on_list_change()
+
 
 class InstanceRegistry:
-    __slots__ = ("instances", "_name", "_preregister_check", "_on_list_change")
+    """Instance ids in registration order, with O(1) membership and removal."""
+
+    __slots__ = (
+        "instances",
+        "_name",
+        "_preregister_check",
+        "_on_list_change",
+    )
 
-    instances: "list[InstanceManager.InstanceID]"
+    # Used as an ordered set, the values are unused
+    instances: "dict[InstanceManager.InstanceID, None]"
     _name: str
     _preregister_check: "PreRegisterCheck | None"
     _on_list_change: "EmptyFunction"
@@ -23,35 +55,62 @@ class InstanceRegistry:
         on_list_change: "EmptyFunction" = lambda: None,
         preregister_check: "PreRegisterCheck | None" = None,
     ):
-        self.instances = []
+        self.instances = {}
         self._name = name
         self._on_list_change = on_list_change
         self._preregister_check = preregister_check
 
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    def __contains__(self, instance_id: "InstanceManager.InstanceID") -> bool:
+        return instance_id in self.instances
+
+    def snapshot(self) -> "Iterable[InstanceManager.InstanceID]":
+        """Instances to loop over. Only copied when structural changes are applied immediately, since the registry cannot change before the commit otherwise."""
+        return self.instances if CommandBuffer.is_deferring else list(self.instances)
+
+    def _notify(self):
+        if _batch_depth > 0:
+            _pending_registries[self] = None
+        else:
+            self._on_list_change()
+
     def register(self, instance_id: "InstanceManager.InstanceID"):
-        if instance_id in self.instances:
+        if CommandBuffer.defer(self.register, instance_id):
+            return
+        elif instance_id in self.instances:
             Console.log(
-                f"{self._name} already has instance {instance_id} registered",
+                "{} already has instance {} registered",
                 Console.LogType.WARNING,
+                self._name,
+                instance_id,
             )
             return
         elif self._preregister_check and not self._preregister_check(instance_id):
             Console.log(
-                f"{self._name} cannot register instance {instance_id} due to preregister check failure",
+                "{} cannot register instance {} due to preregister check failure",
                 Console.LogType.WARNING,
+                self._name,
+                instance_id,
             )
             return
 
-        self.instances.append(instance_id)
-        self._on_list_change()
+        self.instances[instance_id] = None
+        self._notify()
 
     def unregister(self, instance_id: "InstanceManager.InstanceID"):
+        if CommandBuffer.defer(self.unregister, instance_id):
+            return
+
         if instance_id not in self.instances:
             Console.log(
-                f"{self._name} does not have instance {instance_id} registered",
+                "{} does not have instance {} registered",
                 Console.LogType.WARNING,
+                self._name,
+                instance_id,
             )
             return
 
-        self.instances.remove(instance_id)
-        self._on_list_change()
+        del self.instances[instance_id]
+        self._notify()
@@ -0,0 +1,109 @@
+from math import floor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import extro.internal.InstanceManager as InstanceManager
+
+    Cell = tuple[int, int]
+    CellRange = tuple[int, int, int, int]
+
+
+class SpatialHash:
+    """
+    Uniform grid of instance ids keyed by the cells their bounds touch.
+
+    Queries only visit the cells covered by the queried area, so their cost depends on how much is inside the area rather than on how many instances are stored. Updating an instance whose bounds stay in the same cells is free.
+    """
+
+    __slots__ = ("cell_size", "_cells", "_ranges")
+
+    cell_size: float
+    _cells: "dict[Cell, set[InstanceManager.InstanceID]]"
+    _ranges: "dict[InstanceManager.InstanceID, CellRange]"
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._ranges = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, instance_id: "InstanceManager.InstanceID") -> bool:
+        return instance_id in self._ranges
+
+    def _cell_range(
+        self, x: float, y: float, width: float, height: float
+    ) -> "CellRange":
+        cell_size: float = self.cell_size
+        return (
+            floor(x / cell_size),
+            floor(y / cell_size),
+            floor((x + width) / cell_size),
+            floor((y + height) / cell_size),
+        )
+
+    def update(
+        self,
+        instance_id: "InstanceManager.InstanceID",
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+    ):
+        """Insert the instance or move it to its new bounds."""
+        cell_range: "CellRange" = self._cell_range(x, y, width, height)
+        previous_range: "CellRange | None" = self._ranges.get(instance_id)
+
+        if previous_range == cell_range:
+            return
+        elif previous_range is not None:
+            self.remove(instance_id)
+
+        self._ranges[instance_id] = cell_range
+        min_x, min_y, max_x, max_y = cell_range
+
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self._cells.get((cell_x, cell_y))
+
+                if cell is None:
+                    self._cells[(cell_x, cell_y)] = {instance_id}
+                else:
+                    cell.add(instance_id)
+
+    def remove(self, instance_id: "InstanceManager.InstanceID"):
+        cell_range: "CellRange | None" = self._ranges.pop(instance_id, None)
+
+        if cell_range is None:
+            return
+
+        min_x, min_y, max_x, max_y = cell_range
+
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self._cells[(cell_x, cell_y)]
+                cell.discard(instance_id)
+
+                if len(cell) == 0:
+                    del self._cells[(cell_x, cell_y)]
+
+    def query(
+        self, x: float, y: float, width: float, height: float
+    ) -> "set[InstanceManager.InstanceID]":
+        """Get every instance stored in the cells touched by the area. The result may contain instances just outside of it."""
+        min_x, min_y, max_x, max_y = self._cell_range(x, y, width, height)
+        results: "set[InstanceManager.InstanceID]" = set()
+
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self._cells.get((cell_x, cell_y))
+
+                if cell is not None:
+                    results.update(cell)
+
+        return results
+
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
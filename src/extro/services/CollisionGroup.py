@@ -3,59 +3,101 @@
 from typing import TYPE_CHECKING
 
 import extro.Console as Console
-import extro.internal.services.Identity as IdentityService
+import extro.internal.systems.Collision.CollisionSolver as CollisionSolver
 
 if TYPE_CHECKING:
     CollisionGroupID = int
 
 DEFAULT_COLLISION_GROUP: str = "default"
+# Each group is a bit in the masks sent to the collision solver
+MAX_COLLISION_GROUPS: int = 64
 
 _id_map: "dict[str, CollisionGroupID]" = {}
 _collision_matrix: "dict[CollisionGroupID, dict[CollisionGroupID, bool]]" = {}
+_collision_masks: "dict[CollisionGroupID, int]" = {}
+
+
+def _sync_mask(id: "CollisionGroupID"):
+    mask: int = 0
+
+    for other_id, collidable in _collision_matrix[id].items():
+        if collidable:
+            mask |= 1 << other_id
+
+    _collision_masks[id] = mask
+    CollisionSolver.set_collision_group_mask(id, mask)
 
 
 def create_group(collision_group: str) -> "CollisionGroupID | None":
     """Create a new collision group. By default, unless specified otherwise in `set_collidable`, all collision groups are collidable with each other."""
-    if collision_group in _collision_matrix:
+    if collision_group in _id_map:
         Console.log(
-            f"Collision group '{collision_group}' already exists",
+            "Collision group '{}' already exists",
             Console.LogType.WARNING,
+            collision_group,
+        )
+        return None
+    elif len(_id_map) >= MAX_COLLISION_GROUPS:
+        Console.log(
+            "Cannot create collision group '{}', the limit of {} groups has been reached",
+            Console.LogType.ERROR,
+            collision_group,
+            MAX_COLLISION_GROUPS,
         )
         return None
 
-    id = IdentityService.generate_ordered_numeric_id()
+    # Ids double as bit indexes in the collision masks
+    id: "CollisionGroupID" = len(_id_map)
     _id_map[collision_group] = id
     _collision_matrix[id] = {}
-    Console.log(f"Created collision group '{collision_group}' with id {id}")
+    Console.log(
+        "Created collision group '{}' with id {}",
+        Console.LogType.DEBUG,
+        collision_group,
+        id,
+    )
 
     # Need to set default collidability with existing groups
     for other_id in _collision_matrix:
         _collision_matrix[id][other_id] = True
         _collision_matrix[other_id][id] = True
 
+    for other_id in _collision_matrix:
+        _sync_mask(other_id)
+
     return id
 
 
 def set_collidable(collision_group1: str, collision_group2: str, collidable: bool):
     """Set whether two collision groups are collidable with each other."""
     # Technically not creating a collision group before setting collidability is fine, but to enforce good practices its required
-    if collision_group1 not in _collision_matrix:
+    if collision_group1 not in _id_map:
         Console.log(
-            f"Collision group '{collision_group1}' does not exist",
+            "Collision group '{}' does not exist",
             Console.LogType.ERROR,
+            collision_group1,
         )
         return
-    elif collision_group2 not in _collision_matrix:
+    elif collision_group2 not in _id_map:
         Console.log(
-            f"Collision group '{collision_group2}' does not exist",
+            "Collision group '{}' does not exist",
             Console.LogType.ERROR,
+            collision_group2,
         )
         return
 
-    _collision_matrix[_id_map[collision_group1]][_id_map[collision_group2]] = collidable
-    _collision_matrix[_id_map[collision_group2]][_id_map[collision_group1]] = collidable
+    id1: "CollisionGroupID" = _id_map[collision_group1]
+    id2: "CollisionGroupID" = _id_map[collision_group2]
+    _collision_matrix[id1][id2] = collidable
+    _collision_matrix[id2][id1] = collidable
+    _sync_mask(id1)
+    _sync_mask(id2)
     Console.log(
-        f"Collision group '{collision_group1}' is {'now' if collidable else 'no longer'} collidable with '{collision_group2}'",
+        "Collision group '{}' is {} collidable with '{}'",
+        Console.LogType.DEBUG,
+        collision_group1,
+        "now" if collidable else "no longer",
+        collision_group2,
     )
 
 
@@ -63,7 +105,7 @@ def is_collidable(
     collision_group1: "CollisionGroupID", collision_group2: "CollisionGroupID"
 ) -> bool:
     """Check if two collision groups are collidable with each other."""
-    return _collision_matrix[collision_group1][collision_group2]
+    return (_collision_masks[collision_group1] >> collision_group2) & 1 == 1
 
 
 def is_group(group: str) -> bool:
@@ -57,38 +57,42 @@ _number_keys: list[Keyboard] = [
 
 def register_action(id: str, input: Keyboard | Mouse):
     if input in _actions.values():
-        Console.log(f"Input {input} is already being used", Console.LogType.WARNING)
+        Console.log("Input {} is already being used", Console.LogType.WARNING, input)
         return
     elif id in _actions:
-        Console.log(f"Input action {id} is already registered", Console.LogType.WARNING)
+        Console.log(
+            "Input action {} is already registered", Console.LogType.WARNING, id
+        )
         return
 
     _actions[id] = input
     InputSystem.add_input_usage(input)
-    Console.log(f"Registered input action {id} as {input.name}", Console.LogType.DEBUG)
+    Console.log(
+        "Registered input action {} as {}", Console.LogType.DEBUG, id, input.name
+    )
 
 
 def unregister_action(id: str):
     if id not in _actions:
-        Console.log(f"Input action {id} is not registered", Console.LogType.WARNING)
+        Console.log("Input action {} is not registered", Console.LogType.WARNING, id)
         return
 
     InputSystem.remove_input_usage(_actions[id])
     del _actions[id]
-    Console.log(f"Unregistered input action {id}", Console.LogType.DEBUG)
+    Console.log("Unregistered input action {}", Console.LogType.DEBUG, id)
 
 
 def set_action(id: str, input: Keyboard | Mouse):
     # This is almost the same function as `register_action` but its intended to force the developer to have good code semantics
     if id not in _actions:
-        Console.log(f"Input action {id} is not registered", Console.LogType.WARNING)
+        Console.log("Input action {} is not registered", Console.LogType.WARNING, id)
         return
     elif input in _actions.values():
-        Console.log(f"Input {input} is already being used", Console.LogType.WARNING)
+        Console.log("Input {} is already being used", Console.LogType.WARNING, input)
         return
 
     _actions[id] = input
-    Console.log(f"Set input action {id} to {input.name}", Console.LogType.DEBUG)
+    Console.log("Set input action {} to {}", Console.LogType.DEBUG, id, input.name)
 
 
 def get_action(id: str) -> Keyboard | Mouse | None:
@@ -101,7 +105,7 @@ def is_action_active(id: str) -> bool:
     input = get_action(id)
 
     if input is None:
-        Console.log(f"Input action {id} is not registered", Console.LogType.WARNING)
+        Console.log("Input action {} is not registered", Console.LogType.WARNING, id)
         return False
 
     return InputSystem.active_inputs.get(input, False)
@@ -113,7 +117,7 @@ def set_mouse_visibility(is_visible: bool):
     else:
         pyray.hide_cursor()
 
-    Console.log(f"Mouse visibility set to {is_visible}", Console.LogType.DEBUG)
+    Console.log("Mouse visibility set to {}", Console.LogType.DEBUG, is_visible)
 
 
 def is_input_active(input: Keyboard | Mouse) -> bool:
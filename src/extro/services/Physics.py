@@ -1,9 +1,18 @@
 """Provides physics-related constants and types."""
 
 from enum import auto, Enum
+import extro.Console as Console
 import extro.internal.systems.Physics.PhysicsSolver as PhysicsSolver
+import extro.internal.systems.Collision.CollisionSolver as CollisionSolver
 
 dampening: float = 0.8
+# Seconds per physics step, zero steps physics once per rendered frame
+fixed_timestep: float = 0
+max_substeps: int = 5
+# Time that has not been simulated yet when using a fixed timestep, advanced by the engine every frame
+accumulator: float = 0
+# How far the current frame is between the last two fixed steps, used to interpolate rendered positions
+interpolation_alpha: float = 1
 
 
 class PhysicsBodyType(Enum):
@@ -12,19 +21,133 @@ class PhysicsBodyType(Enum):
     KINEMATIC = auto()
 
 
+class BroadPhaseType(Enum):
+    GRID = 0
+    """Uniform hash grid. Fast when every collider is roughly the same size."""
+    AABB_TREE = 1
+    """Dynamic AABB tree. Handles colliders of very different sizes, such as large terrain next to small projectiles."""
+
+
+class ColliderShape(Enum):
+    BOX = 0
+    """Fills the transform, rotated with it."""
+    CIRCLE = 1
+    """Largest circle that fits in the center of the transform."""
+    CAPSULE = 2
+    """Rounded along the longer side of the transform, its radius is half of the shorter side."""
+    POLYGON = 3
+    """Convex polygon of up to 8 points, given relative to the size of the transform."""
+
+
 def set_impulse_scaler(scaler: float):
     """Sets the impulse scaler used in collision resolution."""
     PhysicsSolver.set_impulse_scaler(scaler)
 
 
+def set_solver_iterations(iterations: int):
+    """Sets how many times the contacts are solved every physics step. More iterations make stacks more stable at a higher cost."""
+    if iterations < 1:
+        Console.log(
+            "Solver iterations must be >=1 (tried {})",
+            Console.LogType.ERROR,
+            iterations,
+        )
+        return
+
+    PhysicsSolver.set_iterations(iterations)
+
+
 def set_dampening(value: float):
     """Sets the global dampening factor for physics bodies."""
     global dampening
     dampening = value
 
 
+def set_fixed_timestep(rate: float | None):
+    """Steps physics at a fixed rate in Hz, independently of the frame rate. Rendered positions are interpolated between steps. Pass `None` to step once per frame."""
+    global fixed_timestep, accumulator
+
+    if rate is not None and rate <= 0:
+        Console.log("Physics rate must be >0 (tried {})", Console.LogType.ERROR, rate)
+        return
+
+    fixed_timestep = 1 / rate if rate is not None else 0
+    # Time left over from before the change would otherwise run as a burst of catch-up steps
+    accumulator = 0
+
+
+def set_max_substeps(substeps: int):
+    """Sets how many fixed steps may run in a single frame. Time beyond that is dropped so a slow frame cannot snowball."""
+    global max_substeps
+
+    if substeps < 1:
+        Console.log(
+            "Max substeps must be >=1 (tried {})", Console.LogType.ERROR, substeps
+        )
+        return
+
+    max_substeps = substeps
+
+
+def set_sleep_frames(frames: int):
+    """Sets how many frames a group of touching bodies has to rest before it is put to sleep. Zero disables sleeping."""
+    if frames < 0:
+        Console.log(
+            "Sleep frames must be >=0 (tried {})", Console.LogType.ERROR, frames
+        )
+        return
+
+    PhysicsSolver.set_sleep_frames(frames)
+
+
+def set_collision_threads(count: int):
+    """Sets how many threads run the narrow-phase collision checks. Defaults to the number of cores."""
+    if count < 1:
+        Console.log(
+            "Collision threads must be >=1 (tried {})", Console.LogType.ERROR, count
+        )
+        return
+
+    CollisionSolver.set_thread_count(count)
+
+
+def set_broad_phase(broad_phase: BroadPhaseType):
+    """Sets the structure used to find potential collisions. Existing colliders are moved into the new structure."""
+    CollisionSolver.set_broad_phase(broad_phase.value)
+
+
+def set_cell_size(size: float):
+    """Sets the cell size of the `BroadPhaseType.GRID` broad-phase in pixels. Disables the adaptive cell size."""
+    if size <= 0:
+        Console.log("Cell size must be >0 (tried {})", Console.LogType.ERROR, size)
+        return
+
+    CollisionSolver.set_cell_size(size)
+
+
+def get_cell_size() -> float:
+    """Gets the current cell size of the `BroadPhaseType.GRID` broad-phase in pixels."""
+    return CollisionSolver.get_cell_size()
+
+
+def set_adaptive_cell_size(enabled: bool):
+    """Lets the grid pick its cell size from the median collider size, rebuilding itself when that drifts. Takes effect immediately."""
+    CollisionSolver.set_adaptive_cell_size(enabled)
+
+
 __all__ = [
     "PhysicsBodyType",
+    "BroadPhaseType",
+    "ColliderShape",
     "set_impulse_scaler",
+    "set_solver_iterations",
     "set_dampening",
+    "set_fixed_timestep",
+    "set_max_substeps",
+    "set_sleep_frames",
+    "set_collision_threads",
+    "set_broad_phase",
+    "set_cell_size",
+    "get_cell_size",
+    "set_adaptive_cell_size",
 ]
@@ -22,7 +22,7 @@ def set_fps(new_fps: int):
     global fps
     fps = new_fps
     pyray.set_target_fps(new_fps)
-    Console.log(f"Target FPS set to {new_fps}")
+    Console.log("Target FPS set to {}", Console.LogType.DEBUG, new_fps)
 
 
 def get_fps() -> int:
@@ -0,0 +1,105 @@
+"""Provides spatial queries against colliders, backed by the collision broad-phase. Results reflect the last collision step."""
+
+from typing import TYPE_CHECKING
+
+import extro.Console as Console
+import extro.internal.systems.Collision.CollisionSolver as CollisionSolver
+import extro.services.CollisionGroup as CollisionGroupService
+import extro.services.Physics as PhysicsService
+from extro.shared.Vector2 import Vector2
+
+if TYPE_CHECKING:
+    import extro.internal.InstanceManager as InstanceManager
+
+# Matches colliders of every collision group
+_ALL_GROUPS: int = -1
+
+
+def _group_id(collision_group: str | None) -> int | None:
+    if collision_group is None:
+        return _ALL_GROUPS
+    elif not CollisionGroupService.is_group(collision_group):
+        Console.log(
+            "Collision group '{}' does not exist",
+            Console.LogType.ERROR,
+            collision_group,
+        )
+        return None
+
+    return CollisionGroupService.name_to_id(collision_group)
+
+
+def query_point(
+    point: Vector2, collision_group: str | None = None
+) -> "list[InstanceManager.InstanceID]":
+    """Get the ids of every collidable instance containing the point. If `collision_group` is given, only colliders that group collides with are returned."""
+    group: int | None = _group_id(collision_group)
+
+    if group is None:
+        return []
+
+    return CollisionSolver.query_point(point.x, point.y, group)
+
+
+def query_aabb(
+    position: Vector2, size: Vector2, collision_group: str | None = None
+) -> "list[InstanceManager.InstanceID]":
+    """Get the ids of every collidable instance overlapping the axis-aligned box with its top-left corner at `position`."""
+    group: int | None = _group_id(collision_group)
+
+    if group is None:
+        return []
+
+    return CollisionSolver.query_aabb(position.x, position.y, size.x, size.y, group)
+
+
+def raycast(
+    origin: Vector2,
+    direction: Vector2,
+    max_distance: float,
+    collision_group: str | None = None,
+) -> "list[tuple[InstanceManager.InstanceID, float]]":
+    """Get every collidable instance hit by the ray as (id, distance), nearest first."""
+    group: int | None = _group_id(collision_group)
+
+    if group is None:
+        return []
+
+    return CollisionSolver.raycast(
+        origin.x, origin.y, direction.x, direction.y, max_distance, group
+    )
+
+
+def shape_cast(
+    shape: PhysicsService.ColliderShape,
+    position: Vector2,
+    size: Vector2,
+    translation: Vector2,
+    rotation: float = 0,
+    collision_group: str | None = None,
+) -> "list[tuple[InstanceManager.InstanceID, float]]":
+    """
+    Get every collidable instance touched while moving a shape by `translation` as (id, fraction of the translation), nearest first.
+
+    Only boxes, circles and capsules can be cast and `rotation` is in degrees. Hits are found from the bounds of the moving shape, colliders it already overlaps are reported at zero.
+    """
+    if shape == PhysicsService.ColliderShape.POLYGON:
+        Console.log("Polygons cannot be shape cast", Console.LogType.ERROR)
+        return []
+
+    group: int | None = _group_id(collision_group)
+
+    if group is None:
+        return []
+
+    return CollisionSolver.shape_cast(
+        shape.value,
+        position.x,
+        position.y,
+        size.x,
+        size.y,
+        rotation,
+        translation.x,
+        translation.y,
+        group,
+    )
@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING
 
 import extro.Console as Console
+import extro.internal.CommandBuffer as CommandBuffer
 from extro.shared.Vector2 import Vector2
 
 if TYPE_CHECKING:
@@ -21,13 +22,13 @@ def set_tile_size(size: Vector2 | float | int):
         size = Vector2(size, size)
 
     if size <= Vector2(0, 0):
-        Console.log(f"`tile_size` must be >0 (tried {size})", Console.LogType.ERROR)
+        Console.log("`tile_size` must be >0 (tried {})", Console.LogType.ERROR, size)
         return
 
     global tile_size
     tile_size.x = size.x
     tile_size.y = size.y
-    Console.log(f"`tile_size` set to {size}")
+    Console.log("`tile_size` set to {}", Console.LogType.DEBUG, size)
 
 
 def set_camera(new_camera: "Camera | None"):
@@ -39,14 +40,27 @@ def set_camera(new_camera: "Camera | None"):
     global camera
     camera = new_camera
     Console.log(
-        f"World camera set to {"new camera" if new_camera else "None"}",
+        "World camera set to {}",
         Console.LogType.DEBUG,
+        "new camera" if new_camera else "None",
     )
 
 
+def set_deferred_changes(enabled: bool):
+    """
+    Defer structural changes to the end of the frame.
+
+    When enabled, destroying instances, adding them to or removing them from render targets, reparenting (including `add_child` and `remove_child`) and (un)registering with system registries such as UI, tweens and timeouts are queued and applied together once every system has run. Queries such as `RenderTarget` membership only see these changes after the commit.
+
+    Spawning instances and adding or removing components stay immediate.
+    """
+    CommandBuffer.set_deferring(enabled)
+
+
 __all__ = [
     "tile_size",
     "set_tile_size",
     "camera",
     "set_camera",
+    "set_deferred_changes",
 ]
@@ -8,6 +8,7 @@ import extro.services.Input as InputService
 import extro.services.Render as RenderService
 import extro.services.Audio as AudioService
 import extro.services.Timing as TimingService
+import extro.services.Spatial as SpatialService
 
 __all__ = [
     "PhysicsService",
@@ -18,4 +19,5 @@ __all__ = [
     "RenderService",
     "AudioService",
     "TimingService",
+    "SpatialService",
 ]
@@ -0,0 +1,58 @@
+#pragma once
+
+#include <vector>
+#include <cstddef>
+
+/*
+    Free list of released objects that are handed out again instead of being freed.
+
+    Released objects are reset to a default-constructed value, so whatever they own (like shared pointers to Python
+    objects) is freed right away rather than when the slot is reused. Keeps at most `capacity` objects around, anything
+    released past that is freed.
+*/
+template <typename T>
+class SlotPool
+{
+public:
+    explicit SlotPool(size_t capacity) : capacity(capacity) {}
+
+    ~SlotPool()
+    {
+        for (T *object : freeObjects)
+            delete object;
+    }
+
+    SlotPool(const SlotPool &) = delete;
+    SlotPool &operator=(const SlotPool &) = delete;
+
+    T *acquire()
+    {
+        if (freeObjects.empty())
+            return new T();
+
+        T *object = freeObjects.back();
+        freeObjects.pop_back();
+        return object;
+    }
+
+    void release(T *object)
+    {
+        if (freeObjects.size() >= capacity)
+        {
+            delete object;
+            return;
+        }
+
+        *object = T();
+        freeObjects.push_back(object);
+    }
+
+    size_t size() const
+    {
+        return freeObjects.size();
+    }
+
+private:
+    size_t capacity;
+    std::vector<T *> freeObjects;
+};
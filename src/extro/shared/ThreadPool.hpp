@@ -0,0 +1,143 @@
+#pragma once
+
+#include <vector>
+#include <thread>
+#include <mutex>
+#include <condition_variable>
+#include <functional>
+#include <algorithm>
+#include <cstdint>
+
+/*
+    Fixed set of worker threads for data-parallel loops.
+
+    The calling thread takes part in the work, so a pool of size N runs N - 1 workers. Tasks must not touch Python objects,
+    they usually run with the GIL released.
+*/
+class ThreadPool
+{
+public:
+    using Task = std::function<void(size_t begin, size_t end)>;
+
+    explicit ThreadPool(size_t threadCount)
+    {
+        threadCount = std::max<size_t>(threadCount, 1);
+
+        for (size_t index = 1; index < threadCount; ++index)
+            workers.emplace_back([this]
+                                 { work(); });
+    }
+
+    ~ThreadPool()
+    {
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            isStopping = true;
+        }
+
+        wakeCondition.notify_all();
+
+        for (std::thread &worker : workers)
+            worker.join();
+    }
+
+    size_t size() const
+    {
+        return workers.size() + 1;
+    }
+
+    // Splits [0, count) into chunks shared between all threads and blocks until every chunk is done
+    void parallelFor(size_t count, const Task &task)
+    {
+        if (count == 0)
+            return;
+
+        if (workers.empty())
+        {
+            task(0, count);
+            return;
+        }
+
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            currentTask = &task;
+            taskCount = count;
+            // More chunks than threads so uneven chunks balance out
+            chunkSize = std::max<size_t>(1, count / (size() * 4));
+            nextBegin = 0;
+            activeThreads = size();
+            ++generation;
+        }
+
+        wakeCondition.notify_all();
+        runChunks();
+
+        std::unique_lock<std::mutex> lock(mutex);
+        doneCondition.wait(lock, [this]
+                           { return activeThreads == 0; });
+        currentTask = nullptr;
+    }
+
+private:
+    std::vector<std::thread> workers;
+    std::mutex mutex;
+    std::condition_variable wakeCondition;
+    std::condition_variable doneCondition;
+    const Task *currentTask = nullptr;
+    size_t taskCount = 0;
+    size_t chunkSize = 1;
+    size_t nextBegin = 0;
+    size_t activeThreads = 0;
+    uint64_t generation = 0;
+    bool isStopping = false;
+
+    void work()
+    {
+        uint64_t seenGeneration = 0;
+
+        while (true)
+        {
+            {
+                std::unique_lock<std::mutex> lock(mutex);
+                wakeCondition.wait(lock, [this, seenGeneration]
+                                   { return isStopping || generation != seenGeneration; });
+
+                if (isStopping)
+                    return;
+
+                seenGeneration = generation;
+            }
+
+            runChunks();
+        }
+    }
+
+    void runChunks()
+    {
+        while (true)
+        {
+            size_t begin;
+            size_t end;
+            const Task *task;
+
+            {
+                std::lock_guard<std::mutex> lock(mutex);
+
+                if (nextBegin >= taskCount)
+                {
+                    if (--activeThreads == 0)
+                        doneCondition.notify_all();
+
+                    return;
+                }
+
+                begin = nextBegin;
+                end = std::min(begin + chunkSize, taskCount);
+                nextBegin = end;
+                task = currentTask;
+            }
+
+            (*task)(begin, end);
+        }
+    }
+};
@@ -1,6 +1,8 @@
-from typing import Protocol, Callable
+from typing import Any, Protocol, Callable
 
 EmptyFunction = Callable[..., None]
+# Draws every instance of a batch in one pass
+BatchFunction = Callable[[list[Any]], None]
 
 
 class Destroyable(Protocol):
@@ -0,0 +1,134 @@
+from typing import TYPE_CHECKING, Callable, Generic, TypeVar
+
+import extro.Console as Console
+import extro.internal.ComponentManager as ComponentManager
+import extro.internal.InstanceManager as InstanceManager
+from extro.instances.core.Instance import Instance
+
+if TYPE_CHECKING:
+    # Visibility, collidability and anchoring of a parked instance
+    ParkedState = tuple[bool | None, bool | None, bool | None]
+
+PooledType = TypeVar("PooledType", bound=Instance)
+
+
+class Pool(Generic[PooledType]):
+    """
+    Keeps released instances around to hand them out again instead of constructing and destroying them.
+
+    Released instances are parked rather than destroyed: they are hidden, stop colliding, their physics body is anchored (keeping its forces) and running tweens or timeouts are cancelled. Their components, signals and native collision and physics slots all stay allocated. Signal connections survive a release, so connect them once in `factory` and use `reset` for per-use state.
+
+    Example
+    -------
+    >>> bullets = Pool(lambda: Rectangle(Coord(0, 0), Coord(4, 4)), reset=aim_bullet)
+    >>> bullet = bullets.acquire()
+    >>> bullets.release(bullet)
+    """
+
+    __slots__ = ("_factory", "_reset", "_max_size", "_free", "_parked")
+
+    _factory: "Callable[[], PooledType]"
+    _reset: "Callable[[PooledType], None] | None"
+    _max_size: int
+    _free: "list[PooledType]"
+    _parked: "dict[InstanceManager.InstanceID, ParkedState]"
+
+    def __init__(
+        self,
+        factory: "Callable[[], PooledType]",
+        reset: "Callable[[PooledType], None] | None" = None,
+        max_size: int = 1024,
+    ):
+        self._factory = factory
+        self._reset = reset
+        self._max_size = max_size
+        self._free = []
+        self._parked = {}
+
+    def __len__(self) -> int:
+        """Number of instances waiting to be reused."""
+        return len(self._free)
+
+    def acquire(self) -> PooledType:
+        """Get a parked instance back, or a new one if none are left. `reset` is called either way."""
+        while len(self._free) > 0:
+            instance: PooledType = self._free.pop()
+
+            # Parked instances can still be destroyed from elsewhere, for example along with their parent
+            if instance._id not in InstanceManager.instances:
+                del self._parked[instance._id]
+                continue
+
+            self._unpark(instance)
+            break
+        else:
+            instance = self._factory()
+
+        if self._reset is not None:
+            self._reset(instance)
+
+        return instance
+
+    def release(self, instance: PooledType):
+        """Park the instance for reuse. Once the pool is full, released instances are destroyed instead."""
+        if instance._id in self._parked:
+            Console.log(
+                "Instance {} was already released to the pool",
+                Console.LogType.WARNING,
+                instance._id,
+            )
+            return
+        elif len(self._free) >= self._max_size:
+            instance.destroy()
+            return
+
+        self._park(instance)
+        self._free.append(instance)
+
+    def clear(self):
+        """Destroy every parked instance."""
+        for instance in self._free:
+            del self._parked[instance._id]
+
+            if instance._id in InstanceManager.instances:
+                instance.destroy()
+
+        self._free.clear()
+
+    def _park(self, instance: PooledType):
+        instance_id: "InstanceManager.InstanceID" = instance._id
+        drawable = ComponentManager.drawables.get(instance_id)
+        collider = ComponentManager.colliders.get(instance_id)
+        physics_body = ComponentManager.physics_bodies.get(instance_id)
+
+        self._parked[instance_id] = (
+            drawable.is_visible if drawable else None,
+            collider.is_collidable if collider else None,
+            physics_body.is_anchored if physics_body else None,
+        )
+
+        if drawable:
+            drawable.is_visible = False
+
+        if collider:
+            collider.is_collidable = False
+
+        if physics_body:
+            # The `is_anchored` setter would also clear constant forces such as gravity
+            physics_body._anchor(True)
+
+        # Tweens and timeouts
+        if getattr(instance, "is_active", False) and hasattr(instance, "cancel"):
+            instance.cancel()  # type: ignore
+
+    def _unpark(self, instance: PooledType):
+        is_visible, is_collidable, is_anchored = self._parked.pop(instance._id)
+
+        if is_visible is not None:
+            ComponentManager.drawables[instance._id].is_visible = is_visible
+
+        if is_collidable is not None:
+            ComponentManager.colliders[instance._id].is_collidable = is_collidable
+
+        if is_anchored is not None:
+            ComponentManager.physics_bodies[instance._id]._anchor(is_anchored)
@@ -56,8 +56,7 @@ class Signal:
         """Disconnect a subscriber from the signal."""
         if connection_id not in self._subscribers:
             Console.log(
-                f"{connection_id} is not a subscriber",
-                Console.LogType.WARNING,
+                "{} is not a subscriber", Console.LogType.WARNING, connection_id
             )
             return
 
@@ -78,6 +77,8 @@ class Signal:
                 subscriber(*args)
             except Exception as error:
                 Console.log(
-                    f"{subscriber.__name__, subscriber.__code__.co_firstlineno}: {error}",
+                    "{}: {}",
                     Console.LogType.ERROR,
+                    (subscriber.__name__, subscriber.__code__.co_firstlineno),
+                    error,
                 )
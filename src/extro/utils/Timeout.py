@@ -45,8 +45,9 @@ class Timeout(Instance):
     def start(self):
         if self.is_active:
             Console.log(
-                f"Cannot start timeout {self._id} because its already active",
+                "Cannot start timeout {} because its already active",
                 Console.LogType.WARNING,
+                self._id,
             )
             return
 
@@ -62,8 +63,9 @@ class Timeout(Instance):
     def cancel(self):
         if not self.is_active:
             Console.log(
-                f"Cannot cancel timeout {self._id} because its not active",
+                "Cannot cancel timeout {} because its not active",
                 Console.LogType.WARNING,
+                self._id,
             )
             return
 
@@ -3,5 +3,7 @@
 from extro.utils.Signal import Signal
 from extro.utils.Timeout import Timeout
 from extro.utils.Janitor import Janitor
+from extro.utils.Pool import Pool
+from extro.internal.utils.InstanceRegistry import batch_changes
 
-__all__ = ["Signal", "Timeout", "Janitor"]
+__all__ = ["Signal", "Timeout", "Janitor", "Pool", "batch_changes"]
@@ -0,0 +1,143 @@
+"""
+Lets the internals be tested without a window.
+
+`extro/__init__` imports the whole engine, which needs pyray and every compiled module. The `extro` package is registered here without running it, and `extro.Console` is replaced by a stub that keeps every log in a list.
+
+Compiled solvers are loaded on their own by `load_solver`, tests using them are skipped until they are built.
+"""
+
+import importlib.util
+import os
+import struct
+import sys
+import types
+from enum import Enum
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+SOURCE: Path = Path(__file__).resolve().parent.parent / "src" / "extro"
+
+extro = types.ModuleType("extro")
+extro.__path__ = [str(SOURCE)]  # type: ignore
+sys.modules["extro"] = extro
+
+
+class LogType(Enum):
+    CUSTOM = "Custom"
+    DEBUG = "Debug"
+    WARNING = "Warning"
+    ERROR = "Error"
+
+
+Console = types.ModuleType("extro.Console")
+Console.LogType = LogType  # type: ignore
+Console.logs = []  # type: ignore
+
+
+def log(text: str, type: LogType = LogType.DEBUG, *args: Any):
+    Console.logs.append((type, text.format(*args)))  # type: ignore
+
+
+Console.log = log  # type: ignore
+sys.modules["extro.Console"] = Console
+extro.Console = Console  # type: ignore
+
+import extro.internal.CommandBuffer as CommandBuffer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_engine_state():
+    Console.logs.clear()  # type: ignore
+    yield
+    CommandBuffer.set_deferring(False)
+    Console.logs.clear()  # type: ignore
+
+
+@pytest.fixture
+def logs() -> "list[tuple[LogType, str]]":
+    """Logs written by the test, as (type, formatted message)."""
+    return Console.logs  # type: ignore
+
+
+@pytest.fixture
+def deferred():
+    """Queue structural changes until `CommandBuffer.commit` is called."""
+    CommandBuffer.set_deferring(True)
+    Console.logs.clear()  # type: ignore
+    yield CommandBuffer
+
+
+# Ids used by solver tests, everything in this range is destroyed once a test ends
+MAX_TEST_ID: int = 32
+MAX_COLLISION_GROUPS: int = 64
+ALL_GROUPS: int = (1 << MAX_COLLISION_GROUPS) - 1
+
+
+def load_solver(system: str) -> types.ModuleType:
+    """
+    Loads the compiled solver of `system`, or skips the test when it has not been built.
+
+    The system package around the solver imports the rest of the engine, so only the extension itself is loaded.
+    """
+    pytest.importorskip("extro.bindings")
+    name = f"extro.internal.systems.{system}.{system}Solver"
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    directory = SOURCE / "internal" / "systems" / system
+    paths = sorted(directory.glob(f"{system}Solver*.so")) + sorted(
+        directory.glob(f"{system}Solver*.pyd")
+    )
+
+    if not paths:
+        pytest.skip(f"{system}Solver is not built")
+
+    spec = importlib.util.spec_from_file_location(name, paths[0])
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+@pytest.fixture
+def collision_solver() -> Iterator[types.ModuleType]:
+    """The compiled CollisionSolver, reset to its defaults once the test ends."""
+    solver = load_solver("Collision")
+    yield solver
+
+    for instance_id in range(MAX_TEST_ID):
+        solver.destroy_collision_mask(instance_id)
+
+    for collision_group in range(MAX_COLLISION_GROUPS):
+        solver.set_collision_group_mask(collision_group, ALL_GROUPS)
+
+    solver.set_broad_phase(0)
+    solver.set_cell_size(60)
+    solver.set_thread_count(os.cpu_count() or 1)
+    # Reports the pairs ended by the destroyed masks, so the next test starts without any
+    solver.check_collisions([])
+
+
+@pytest.fixture
+def physics_solver() -> Iterator[types.ModuleType]:
+    """The compiled PhysicsSolver, reset to its defaults once the test ends."""
+    solver = load_solver("Physics")
+    yield solver
+
+    for instance_id in range(MAX_TEST_ID):
+        solver.destroy_physics_body(instance_id)
+
+    solver.end_contacts(
+        b"".join(
+            struct.pack("=2i", id1, id2)
+            for id1, id2 in combinations(range(MAX_TEST_ID), 2)
+        )
+    )
+    solver.set_sleep_frames(60)
+    solver.set_iterations(8)
+    solver.set_impulse_scaler(1.0)
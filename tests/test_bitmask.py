@@ -0,0 +1,48 @@
+from enum import IntFlag, auto
+
+from extro.internal.utils.BitMask import BitMask
+
+
+class Flags(IntFlag):
+    A = auto()
+    B = auto()
+
+
+def test_flags_can_be_added_and_removed():
+    mask = BitMask()
+    mask.add_flag(Flags.A)
+
+    assert mask.has_flag(Flags.A)
+    assert not mask.has_flag(Flags.A | Flags.B)
+
+    mask.remove_flag(Flags.A)
+
+    assert mask.is_empty()
+
+
+def test_first_flag_adds_the_key_to_the_dirty_set():
+    dirty: set[int] = set()
+    mask = BitMask(dirty, 7)
+
+    assert dirty == set()
+
+    mask.add_flag(Flags.A)
+
+    assert dirty == {7}
+
+    dirty.clear()
+    # Already dirty, the system is expected to visit it anyway
+    mask.add_flag(Flags.B)
+
+    assert dirty == set()
+
+
+def test_mask_is_dirty_again_after_its_flags_are_cleared():
+    dirty: set[int] = set()
+    mask = BitMask(dirty, 7)
+    mask.add_flag(Flags.A)
+    dirty.clear()
+    mask.clear_flags()
+    mask.add_flag(Flags.B)
+
+    assert dirty == {7}
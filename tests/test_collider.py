@@ -0,0 +1,39 @@
+import pytest
+
+# The components import the whole engine, so these only run against a full build
+Collider = pytest.importorskip(
+    "extro.instances.core.components.Collider", exc_type=ImportError
+).Collider
+Transform = pytest.importorskip(
+    "extro.instances.core.components.Transform", exc_type=ImportError
+).Transform
+
+from extro.instances.core.Instance import Instance  # noqa: E402
+from extro.shared.Coord import Coord  # noqa: E402
+from extro.shared.Vector2 import Vector2  # noqa: E402
+import extro.services.Physics as PhysicsService  # noqa: E402
+
+
+def test_toggling_static_keeps_the_shape():
+    instance = Instance()
+    instance.add_component(Transform(instance.id, Coord(0, 0), Coord(10, 10)))
+    collider = Collider(
+        instance.id,
+        shape=PhysicsService.ColliderShape.POLYGON,
+        points=[Vector2(0, 0), Vector2(1, 1), Vector2(0, 1)],
+    )
+    instance.add_component(collider)
+
+    try:
+        collider.is_static = True
+        collider.is_static = False
+
+        assert collider.is_static is False
+        assert collider.shape == PhysicsService.ColliderShape.POLYGON
+        assert [(point.x, point.y) for point in collider.points] == [
+            (0, 0),
+            (1, 1),
+            (0, 1),
+        ]
+    finally:
+        instance.destroy()
@@ -0,0 +1,369 @@
+import struct
+from types import ModuleType
+
+import pytest
+
+bindings = pytest.importorskip("extro.bindings")
+Angle = bindings.Angle
+Vector2 = bindings.Vector2
+
+# Must match `COLLISION_RECORD_FORMAT` and `ENDED_PAIR_FORMAT` in `extro.internal.systems.Collision`
+COLLISION_RECORD_FORMAT: str = "=2iI5f"
+ENDED_PAIR_FORMAT: str = "=2i"
+
+
+def create_mask(
+    solver: ModuleType,
+    instance_id: int,
+    x: float,
+    y: float,
+    width: float = 10,
+    height: float = 10,
+    rotation: float = 0,
+    is_static: bool = False,
+    collision_group: int = 0,
+) -> Vector2:
+    """Creates a collision mask and returns its position, which the solver reads in place on every check."""
+    position = Vector2(x, y)
+    rotation_angle = Angle(0)
+    rotation_angle.degrees = rotation
+    solver.create_collision_mask(
+        instance_id,
+        Vector2(width, height),
+        position,
+        rotation_angle,
+        True,
+        is_static,
+        collision_group,
+    )
+    return position
+
+
+def check(
+    solver: ModuleType, instance_ids: list[int]
+) -> "tuple[list[tuple], list[tuple[int, int]]]":
+    """Checks the masks as moved this frame, returning the unpacked collision records and ended pairs."""
+    collisions_data, ended_data = solver.check_collisions(instance_ids)
+    return (
+        list(struct.iter_unpack(COLLISION_RECORD_FORMAT, collisions_data)),
+        list(struct.iter_unpack(ENDED_PAIR_FORMAT, ended_data)),
+    )
+
+
+def pairs(solver: ModuleType, instance_ids: list[int]) -> "list[tuple[int, int]]":
+    collisions, _ = check(solver, instance_ids)
+    return sorted((record[0], record[1]) for record in collisions)
+
+
+def test_collisions_are_packed_records(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 0)
+    collisions, ended = check(collision_solver, [1, 2])
+
+    assert len(collisions) == 1
+    id1, id2, age, overlap, normal_x, normal_y, _, _ = collisions[0]
+    assert (id1, id2, age) == (1, 2, 0)
+    assert overlap == pytest.approx(5)
+    assert (normal_x, normal_y) == pytest.approx((1, 0))
+    assert ended == []
+
+
+def test_non_collidable_masks_are_skipped(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 0)
+    collision_solver.set_collidable(2, False)
+
+    assert pairs(collision_solver, [1, 2]) == []
+
+
+def test_groups_that_do_not_interact_are_filtered(collision_solver):
+    create_mask(collision_solver, 1, 0, 0, collision_group=0)
+    create_mask(collision_solver, 2, 5, 0, collision_group=1)
+    create_mask(collision_solver, 3, 5, 5, collision_group=0)
+    # Group 0 ignores group 1
+    collision_solver.set_collision_group_mask(0, ~(1 << 1) & ((1 << 64) - 1))
+    collision_solver.set_collision_group_mask(1, ~(1 << 0) & ((1 << 64) - 1))
+
+    assert pairs(collision_solver, [1, 2, 3]) == [(1, 3)]
+
+    collision_solver.set_collision_group(2, 0)
+
+    assert pairs(collision_solver, [1, 2, 3]) == [(1, 2), (1, 3), (2, 3)]
+
+
+def test_collision_groups_are_bounded(collision_solver):
+    with pytest.raises(IndexError):
+        collision_solver.set_collision_group_mask(64, 0)
+
+
+@pytest.mark.parametrize("broad_phase", [0, 1])
+def test_broad_phases_find_the_same_pairs(collision_solver, broad_phase):
+    collision_solver.set_broad_phase(broad_phase)
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 5)
+    create_mask(collision_solver, 3, 500, 500)
+
+    assert pairs(collision_solver, [1, 2, 3]) == [(1, 2)]
+
+
+def test_switching_broad_phase_keeps_existing_masks(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 5)
+    collision_solver.set_broad_phase(1)
+
+    assert pairs(collision_solver, [1]) == [(1, 2)]
+
+    with pytest.raises(ValueError):
+        collision_solver.set_broad_phase(2)
+
+
+def test_cell_size_can_be_changed(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 5)
+    collision_solver.set_cell_size(4)
+
+    assert collision_solver.get_cell_size() == 4
+    # Masks spanning several cells are still reported once
+    assert pairs(collision_solver, [1, 2]) == [(1, 2)]
+
+    with pytest.raises(ValueError):
+        collision_solver.set_cell_size(0)
+
+
+def test_adaptive_cell_size_follows_collider_sizes(collision_solver):
+    for instance_id in range(1, 6):
+        create_mask(collision_solver, instance_id, instance_id * 500, 0, 200, 200)
+
+    collision_solver.set_adaptive_cell_size(True)
+
+    # About twice the median collider
+    assert collision_solver.get_cell_size() == pytest.approx(400)
+
+
+def test_static_masks_only_collide_with_dynamic_ones(collision_solver):
+    create_mask(collision_solver, 1, 0, 0, is_static=True)
+    create_mask(collision_solver, 2, 5, 0, is_static=True)
+
+    assert pairs(collision_solver, [1, 2]) == []
+
+    create_mask(collision_solver, 3, 5, 5)
+
+    assert pairs(collision_solver, [3]) == [(1, 3), (2, 3)]
+
+
+def test_masks_can_move_between_partitions(collision_solver):
+    create_mask(collision_solver, 1, 0, 0, is_static=True)
+    create_mask(collision_solver, 2, 5, 0, is_static=True)
+    collision_solver.set_static(2, False)
+
+    assert pairs(collision_solver, [2]) == [(1, 2)]
+
+    collision_solver.set_static(2, True)
+
+    assert pairs(collision_solver, [2]) == []
+
+
+def test_moved_static_masks_are_found_where_they_are(collision_solver):
+    position = create_mask(collision_solver, 1, 0, 0, is_static=True)
+    create_mask(collision_solver, 2, 100, 0)
+    position.x = 95
+
+    assert pairs(collision_solver, [1]) == [(1, 2)]
+
+
+def test_contacts_age_while_they_persist(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 0)
+    ages: list[int] = []
+
+    for _ in range(3):
+        collisions, _ = check(collision_solver, [1])
+        ages.append(collisions[0][2])
+
+    assert ages == [0, 1, 2]
+
+
+def test_unmoved_contacts_stay_cached(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 0)
+    check(collision_solver, [1, 2])
+    collisions, ended = check(collision_solver, [])
+
+    # Neither mask moved, so the pair is neither reported nor ended
+    assert collisions == []
+    assert ended == []
+
+    collisions, _ = check(collision_solver, [2])
+
+    assert collisions[0][2] == 1
+
+
+def test_separated_and_destroyed_pairs_are_ended(collision_solver):
+    position = create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 5, 0)
+    create_mask(collision_solver, 3, 0, 5)
+    check(collision_solver, [1, 2, 3])
+    position.x = -100
+    _, ended = check(collision_solver, [1])
+
+    assert sorted(ended) == [(1, 2), (1, 3)]
+
+    position.x = 0
+    check(collision_solver, [1])
+    collision_solver.destroy_collision_mask(2)
+    _, ended = check(collision_solver, [])
+
+    assert sorted(ended) == [(1, 2), (2, 3)]
+
+
+def test_sweep_stops_before_the_first_mask_in_the_way(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 50, 0)
+    create_mask(collision_solver, 3, 30, 0)
+
+    # The gap to mask 3 is 20 out of a 100 long movement
+    assert collision_solver.sweep(1, 100, 0) == pytest.approx(0.2)
+    assert collision_solver.sweep(1, 0, 100) == 1
+    assert collision_solver.sweep(1, -100, 0) == 1
+
+
+def test_sweep_ignores_masks_that_cannot_be_hit(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 50, 0, collision_group=1)
+    create_mask(collision_solver, 3, 30, 0)
+    collision_solver.set_collidable(3, False)
+    collision_solver.set_collision_group_mask(0, 1)
+
+    assert collision_solver.sweep(1, 100, 0) == 1
+
+
+def test_thread_count_does_not_change_the_results(collision_solver):
+    # 30 overlapping masks make enough pairs to run the narrow-phase on the thread pool
+    instance_ids = list(range(1, 31))
+
+    for instance_id in instance_ids:
+        create_mask(collision_solver, instance_id, instance_id, instance_id, 40, 40)
+
+    collision_solver.set_thread_count(1)
+    single_threaded, _ = check(collision_solver, instance_ids)
+    collision_solver.set_thread_count(4)
+    multi_threaded, _ = check(collision_solver, instance_ids)
+
+    assert len(single_threaded) == 435
+    # Same records, only the age of the cached contacts changed
+    assert sorted(record[:2] + record[3:] for record in single_threaded) == sorted(
+        record[:2] + record[3:] for record in multi_threaded
+    )
+
+
+def test_thread_count_must_be_positive(collision_solver):
+    with pytest.raises(ValueError):
+        collision_solver.set_thread_count(0)
+
+
+def test_rotated_boxes_use_their_real_shape(collision_solver):
+    # The bounds of both diamonds overlap, their shapes do not
+    create_mask(collision_solver, 1, 0, 0, rotation=45)
+    create_mask(collision_solver, 2, 12, -12, rotation=45)
+
+    assert pairs(collision_solver, [1, 2]) == []
+
+    create_mask(collision_solver, 3, 4, 0, rotation=45)
+    collisions, _ = check(collision_solver, [3])
+
+    assert [record[:2] for record in collisions] == [(1, 3)]
+    assert collisions[0][3] > 0
+
+
+def test_axis_aligned_overlap_takes_the_shallow_axis(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 2, 8)
+    ((_, _, _, overlap, normal_x, normal_y, _, _),), _ = check(collision_solver, [2])
+
+    assert overlap == pytest.approx(2)
+    assert (normal_x, normal_y) == pytest.approx((0, 1))
+
+CIRCLE: int = 1
+CAPSULE: int = 2
+POLYGON: int = 3
+# Bottom left half of the box
+TRIANGLE: "list[Vector2]" = [Vector2(0, 0), Vector2(1, 1), Vector2(0, 1)]
+
+
+def test_circles_collide_by_distance(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 8, 8)
+    collision_solver.set_shape(1, CIRCLE, [])
+    collision_solver.set_shape(2, CIRCLE, [])
+
+    # The boxes overlap in the corner, the circles do not
+    assert pairs(collision_solver, [1, 2]) == []
+
+    # Segment from (11, 4) to (25, 4) with a radius of 3
+    create_mask(collision_solver, 3, 8, 1, 20, 6)
+    collision_solver.set_shape(3, CAPSULE, [])
+
+    assert pairs(collision_solver, [3]) == [(1, 3)]
+
+
+def test_polygons_keep_their_shape_when_made_static(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    collision_solver.set_shape(1, POLYGON, TRIANGLE)
+    collision_solver.set_static(1, True)
+    collision_solver.set_static(1, False)
+
+    # Inside the box, outside the triangle
+    assert collision_solver.query_point(8, 2, -1) == []
+    assert collision_solver.query_point(2, 8, -1) == [1]
+
+
+def test_invalid_shapes_are_rejected(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+
+    with pytest.raises(ValueError):
+        collision_solver.set_shape(1, 4, [])
+
+    with pytest.raises(ValueError):
+        collision_solver.set_shape(1, POLYGON, TRIANGLE[:2])
+
+    with pytest.raises(ValueError):
+        concave = [Vector2(0, 0), Vector2(1, 0), Vector2(0.2, 0.2), Vector2(0, 1)]
+        collision_solver.set_shape(1, POLYGON, concave)
+
+
+def test_point_and_area_queries(collision_solver):
+    create_mask(collision_solver, 1, 0, 0)
+    create_mask(collision_solver, 2, 20, 0, is_static=True)
+    create_mask(collision_solver, 3, 40, 0, collision_group=1)
+    collision_solver.set_collision_group_mask(2, 1)
+
+    assert collision_solver.query_point(5, 5, -1) == [1]
+    assert collision_solver.query_point(15, 5, -1) == []
+    assert sorted(collision_solver.query_aabb(5, 0, 40, 10, -1)) == [1, 2, 3]
+    # Group 2 only sees group 0
+    assert sorted(collision_solver.query_aabb(5, 0, 40, 10, 2)) == [1, 2]
+
+
+def test_raycast_hits_are_sorted_by_distance(collision_solver):
+    create_mask(collision_solver, 1, 40, 0)
+    create_mask(collision_solver, 2, 20, 0)
+    create_mask(collision_solver, 3, 60, 0)
+    collision_solver.set_collidable(3, False)
+    hits = collision_solver.raycast(0, 5, 1, 0, 100, -1)
+
+    assert [instance_id for instance_id, _ in hits] == [2, 1]
+    assert [distance for _, distance in hits] == pytest.approx([20, 40])
+    assert collision_solver.raycast(0, 5, 1, 0, 10, -1) == []
+
+
+def test_shape_cast_reports_the_fraction_travelled(collision_solver):
+    create_mask(collision_solver, 1, 50, 0)
+    create_mask(collision_solver, 2, 0, 0)
+    hits = collision_solver.shape_cast(CIRCLE, 0, 0, 10, 10, 0, 100, 0, -1)
+
+    # Already overlapping mask 2, mask 1 is reached after 40 out of 100
+    assert [instance_id for instance_id, _ in hits] == [2, 1]
+    assert [fraction for _, fraction in hits] == pytest.approx([0, 0.4])
+
+    with pytest.raises(ValueError):
+        collision_solver.shape_cast(POLYGON, 0, 0, 10, 10, 0, 100, 0, -1)
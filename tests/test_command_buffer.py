@@ -0,0 +1,96 @@
+from extro.instances.core.Instance import Instance
+from extro.internal.utils.InstanceRegistry import InstanceRegistry
+import extro.internal.CommandBuffer as CommandBuffer
+import extro.internal.InstanceManager as InstanceManager
+
+
+def test_commands_run_immediately_when_not_deferring():
+    calls: list[int] = []
+
+    assert not CommandBuffer.defer(calls.append, 1)
+    assert calls == []
+
+
+def test_deferred_register_and_unregister_apply_on_commit(deferred):
+    registry = InstanceRegistry("Test")
+    registry.register(1)
+    registry.register(2)
+
+    assert len(registry) == 0
+
+    deferred.commit()
+    assert list(registry.instances) == [1, 2]
+
+    registry.unregister(1)
+    assert 1 in registry
+
+    deferred.commit()
+    assert list(registry.instances) == [2]
+
+
+def test_commit_runs_commands_in_order_and_notifies_once(deferred):
+    changes: list[list[int]] = []
+    registry = InstanceRegistry(
+        "Test", on_list_change=lambda: changes.append(list(registry.instances))
+    )
+    registry.register(1)
+    registry.register(2)
+    registry.unregister(1)
+    registry.register(3)
+    deferred.commit()
+
+    assert changes == [[2, 3]]
+
+
+def test_commands_queued_during_a_commit_run_immediately(deferred):
+    registry = InstanceRegistry("Test")
+    # Registering from inside a command must not wait for another commit
+    deferred.defer(registry.register, 1)
+    deferred.commit()
+
+    assert list(registry.instances) == [1]
+
+
+def test_defer_once_drops_duplicates_until_the_commit(deferred):
+    calls: list[int] = []
+
+    def command(value: int):
+        calls.append(value)
+
+    assert deferred.defer_once(command, 1)
+    assert deferred.defer_once(command, 1)
+    assert deferred.defer_once(command, 2)
+    deferred.commit()
+
+    assert calls == [1, 2]
+
+    deferred.defer_once(command, 1)
+    deferred.commit()
+
+    assert calls == [1, 2, 1]
+
+
+def test_disabling_deferral_commits_pending_commands(deferred):
+    registry = InstanceRegistry("Test")
+    registry.register(1)
+    deferred.set_deferring(False)
+
+    assert list(registry.instances) == [1]
+    assert not deferred.is_deferring
+
+
+def test_deferred_destroy_runs_once(deferred):
+    instance = Instance()
+    destroyed: list[int] = []
+    instance.on_destroy.connect(lambda: destroyed.append(instance.id))
+    deferred.commit()
+
+    instance.destroy()
+    instance.destroy()
+
+    assert instance.id in InstanceManager.instances
+
+    deferred.commit()
+
+    assert instance.id not in InstanceManager.instances
+    assert destroyed == [instance.id]
@@ -0,0 +1,77 @@
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+CONSOLE_PATH: Path = Path(__file__).resolve().parent.parent / "src" / "extro" / "Console.py"
+
+
+@pytest.fixture
+def console(monkeypatch) -> ModuleType:
+    """The real console, with stand-ins for the window and drawing modules it imports."""
+    stubs: dict[str, dict] = {
+        "pyray": {},
+        "extro.Window": {},
+        "extro.Profiler": {},
+        "extro.assets": {},
+        "extro.assets.Fonts": {"Arial": None},
+        "extro.shared": {},
+        "extro.shared.RGBAColor": {"RGBAColor": lambda *channels: channels},
+    }
+
+    for name, attributes in stubs.items():
+        module = ModuleType(name)
+        module.__dict__.update(attributes)
+        monkeypatch.setitem(sys.modules, name, module)
+
+    spec = importlib.util.spec_from_file_location("extro.Console", CONSOLE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def messages(console: ModuleType) -> list[str]:
+    return [console._format(text, args) for _, text, args in console.logs]
+
+
+def test_logs_are_kept_newest_first(console):
+    for index in range(3):
+        console.log("Log {}", console.LogType.DEBUG, index)
+
+    assert messages(console) == ["Log 2", "Log 1", "Log 0"]
+
+
+def test_shrinking_keeps_the_newest_logs(console):
+    for index in range(10):
+        console.log("Log {}", console.LogType.DEBUG, index)
+
+    console.set_max_log_count(3)
+
+    assert messages(console) == ["Log 9", "Log 8", "Log 7"]
+
+    console.log("Log {}", console.LogType.DEBUG, 10)
+
+    assert messages(console) == ["Log 10", "Log 9", "Log 8"]
+
+
+def test_lowering_the_priority_drops_less_important_logs(console):
+    console.log("Debug", console.LogType.DEBUG)
+    console.log("Error", console.LogType.ERROR)
+    console.log("Warning", console.LogType.WARNING)
+    console.set_log_priority(console.LogPriority.WARNING)
+
+    assert messages(console) == ["Warning", "Error"]
+
+    console.log("Ignored", console.LogType.DEBUG)
+
+    assert messages(console) == ["Warning", "Error"]
+
+
+def test_disabled_console_does_not_log(console):
+    console.set_enabled(False)
+    console.log("Ignored", console.LogType.ERROR)
+
+    assert messages(console) == []
@@ -0,0 +1,79 @@
+from extro.internal.utils.DrawOrder import DrawOrder
+
+
+def test_instances_are_drawn_by_zindex_then_insertion():
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 2, 1)
+    draw_order.add(2, 0, 2)
+    draw_order.add(3, 2, 3)
+    draw_order.add(4, -1, 4)
+
+    assert list(draw_order) == [4, 2, 1, 3]
+    assert len(draw_order) == 4
+
+
+def test_instances_sharing_a_batch_group_are_drawn_together():
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 0, "sprites")
+    draw_order.add(2, 0, "rectangles")
+    draw_order.add(3, 0, "sprites")
+
+    assert list(draw_order) == [1, 3, 2]
+
+
+def test_changing_the_zindex_moves_the_instance():
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 0, 1)
+    draw_order.add(2, 1, 2)
+    draw_order.move(1, 5, 1)
+
+    assert list(draw_order) == [2, 1]
+
+    draw_order.move(1, -5, 1)
+
+    assert list(draw_order) == [1, 2]
+
+
+def test_changing_the_batch_group_regroups_the_instance():
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 0, "texture a")
+    draw_order.add(2, 0, "texture b")
+    draw_order.add(3, 0, "texture a")
+    draw_order.move(3, 0, "texture b")
+
+    assert list(draw_order) == [1, 2, 3]
+
+    draw_order.move(1, 0, "texture b")
+
+    # The group of the last member to leave is dropped, its members now join the existing one
+    assert list(draw_order) == [2, 3, 1]
+
+
+def test_remove_drops_empty_buckets():
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 3, 1)
+    draw_order.add(2, 0, 2)
+    draw_order.remove(1)
+    draw_order.remove(1)
+
+    assert list(draw_order) == [2]
+    assert 1 not in draw_order
+    assert draw_order._zindexes == [0]
+
+
+def test_sort_orders_a_subset_and_skips_instances_not_drawn():
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 1, 1)
+    draw_order.add(2, 0, 2)
+    draw_order.add(3, 2, 3)
+
+    assert draw_order.sort({3, 1, 99}) == [1, 3]
+
+
+def test_adding_twice_warns(logs):
+    draw_order = DrawOrder("Test")
+    draw_order.add(1, 0, 1)
+    draw_order.add(1, 4, 1)
+
+    assert list(draw_order) == [1]
+    assert logs[-1][1] == "Test already draws instance 1"
@@ -0,0 +1,93 @@
+from extro.internal.utils.InstanceRegistry import InstanceRegistry, batch_changes
+
+
+def test_register_keeps_registration_order():
+    registry = InstanceRegistry("Test")
+
+    for instance_id in (3, 1, 2):
+        registry.register(instance_id)
+
+    assert list(registry.instances) == [3, 1, 2]
+    assert len(registry) == 3
+    assert 1 in registry
+    assert 4 not in registry
+
+
+def test_unregister_keeps_order_of_the_rest():
+    registry = InstanceRegistry("Test")
+
+    for instance_id in range(5):
+        registry.register(instance_id)
+
+    registry.unregister(1)
+    registry.unregister(4)
+
+    assert list(registry.instances) == [0, 2, 3]
+    assert 1 not in registry
+
+
+def test_duplicate_and_unknown_instances_warn(logs):
+    registry = InstanceRegistry("Test")
+    registry.register(1)
+    registry.register(1)
+    registry.unregister(2)
+
+    assert list(registry.instances) == [1]
+    assert [message for _, message in logs] == [
+        "Test already has instance 1 registered",
+        "Test does not have instance 2 registered",
+    ]
+
+
+def test_preregister_check_rejects_instances():
+    registry = InstanceRegistry(
+        "Test", preregister_check=lambda instance_id: instance_id % 2 == 0
+    )
+    registry.register(1)
+    registry.register(2)
+
+    assert list(registry.instances) == [2]
+
+
+def test_every_change_notifies():
+    changes: list[int] = []
+    registry = InstanceRegistry(
+        "Test", on_list_change=lambda: changes.append(len(registry))
+    )
+    registry.register(1)
+    registry.register(2)
+    registry.unregister(1)
+
+    assert changes == [1, 2, 1]
+
+
+def test_batch_changes_notifies_each_registry_once():
+    changes: list[str] = []
+    first = InstanceRegistry("First", on_list_change=lambda: changes.append("first"))
+    second = InstanceRegistry(
+        "Second", on_list_change=lambda: changes.append("second")
+    )
+
+    with batch_changes():
+        first.register(1)
+        first.register(2)
+
+        # Nested blocks only notify once the outermost one ends
+        with batch_changes():
+            second.register(1)
+            first.unregister(1)
+
+        assert changes == []
+
+    assert changes == ["first", "second"]
+
+
+def test_snapshot_is_a_copy_when_changes_are_immediate():
+    registry = InstanceRegistry("Test")
+    registry.register(1)
+    registry.register(2)
+
+    for instance_id in registry.snapshot():
+        registry.unregister(instance_id)
+
+    assert len(registry) == 0
@@ -0,0 +1,25 @@
+import pytest
+
+# The service imports the solvers through their systems, so this only runs against a full build
+PhysicsService = pytest.importorskip("extro.services.Physics", exc_type=ImportError)
+
+
+def test_changing_the_timestep_drops_unsimulated_time():
+    PhysicsService.set_fixed_timestep(60)
+    PhysicsService.accumulator = 0.5
+
+    try:
+        PhysicsService.set_fixed_timestep(None)
+        assert PhysicsService.accumulator == 0
+
+        PhysicsService.accumulator = 0.5
+        PhysicsService.set_fixed_timestep(30)
+        assert PhysicsService.accumulator == 0
+        assert PhysicsService.fixed_timestep == pytest.approx(1 / 30)
+
+        # Rejected rates leave the current mode alone
+        PhysicsService.accumulator = 0.5
+        PhysicsService.set_fixed_timestep(0)
+        assert PhysicsService.accumulator == 0.5
+    finally:
+        PhysicsService.set_fixed_timestep(None)
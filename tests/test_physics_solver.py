@@ -0,0 +1,227 @@
+import struct
+from types import ModuleType
+
+import pytest
+
+bindings = pytest.importorskip("extro.bindings")
+Angle = bindings.Angle
+Vector2 = bindings.Vector2
+
+# Must match `INTEGRATION_RECORD_FORMAT` and `INTEGRATION_FLAG_*` in `extro.internal.systems.Physics`
+INTEGRATION_RECORD_FORMAT: str = "=iI2f"
+INTEGRATION_FLAG_ROTATION: int = 1 << 1
+INTEGRATION_FLAG_BULLET: int = 1 << 2
+# Must match `COLLISION_RECORD_FORMAT` and `ENDED_PAIR_FORMAT` in `extro.internal.systems.Collision`
+COLLISION_RECORD_FORMAT: str = "=2iI5f"
+ENDED_PAIR_FORMAT: str = "=2i"
+
+
+def create_body(
+    solver: ModuleType, instance_id: int, x: float = 0, y: float = 0
+) -> "tuple[Vector2, Vector2]":
+    """Creates a 10x10 body and returns its position and velocity, which the solver writes in place."""
+    position = Vector2(x, y)
+    velocity = Vector2(0, 0)
+    solver.create_physics_body(
+        instance_id, Vector2(10, 10), position, Angle(0), velocity, Angle(0)
+    )
+    return position, velocity
+
+
+def set_anchored(solver: ModuleType, instance_id: int, is_anchored: bool):
+    # (id, mass, inverse mass, restitution, is dynamic, is anchored), as sent by the physics system
+    inverse_mass: float = 0.0 if is_anchored else 1.0
+    solver.step(
+        [(instance_id, 1.0, inverse_mass, 0.2, not is_anchored, is_anchored)]
+    )
+
+
+def integrate(
+    solver: ModuleType, delta: float = 0.1
+) -> "list[tuple[int, int, float, float]]":
+    return list(
+        struct.iter_unpack(INTEGRATION_RECORD_FORMAT, solver.integrate(delta, 0))
+    )
+
+
+def test_forces_act_again_once_a_body_is_freed(physics_solver):
+    _, velocity = create_body(physics_solver, 1)
+    physics_solver.add_force(1, Vector2(0, 100), Vector2(0, 0))
+    set_anchored(physics_solver, 1, True)
+
+    assert integrate(physics_solver) == []
+
+    set_anchored(physics_solver, 1, False)
+    records = integrate(physics_solver)
+
+    assert [record[0] for record in records] == [1]
+    assert velocity.y == pytest.approx(10)
+
+
+def resolve_approach(solver: ModuleType, velocity: Vector2, age: int) -> float:
+    """Resolves body 1 moving down onto anchored body 2 and returns its velocity afterwards."""
+    velocity.y = 10
+    # (id1, id2, age, overlap, normal x, normal y, contact x, contact y), the contact is right under the center of body 1
+    solver.resolve_collisions(
+        struct.pack(COLLISION_RECORD_FORMAT, 1, 2, age, 0, 0, 1, 5, 10)
+    )
+    return velocity.y
+
+
+def test_persisting_contacts_start_from_their_last_impulse(physics_solver):
+    _, velocity = create_body(physics_solver, 1)
+    create_body(physics_solver, 2, 0, 10)
+    set_anchored(physics_solver, 2, True)
+    # A single damped pass leaves part of the approach, so a warm start is visible
+    physics_solver.set_iterations(1)
+    physics_solver.set_impulse_scaler(0.5)
+
+    cold = resolve_approach(physics_solver, velocity, 0)
+    warm = resolve_approach(physics_solver, velocity, 1)
+
+    assert warm < cold
+
+    physics_solver.end_contacts(struct.pack(ENDED_PAIR_FORMAT, 1, 2))
+
+    assert resolve_approach(physics_solver, velocity, 1) == pytest.approx(cold)
+
+
+def test_new_contacts_ignore_cached_impulses(physics_solver):
+    _, velocity = create_body(physics_solver, 1)
+    create_body(physics_solver, 2, 0, 10)
+    set_anchored(physics_solver, 2, True)
+    physics_solver.set_iterations(1)
+    physics_solver.set_impulse_scaler(0.5)
+
+    cold = resolve_approach(physics_solver, velocity, 0)
+
+    # An age of zero means the pair just started touching again
+    assert resolve_approach(physics_solver, velocity, 0) == pytest.approx(cold)
+
+
+def test_iterations_must_be_positive(physics_solver):
+    with pytest.raises(ValueError):
+        physics_solver.set_iterations(0)
+
+
+def test_forces_accumulate_until_cleared(physics_solver):
+    _, velocity = create_body(physics_solver, 1)
+    physics_solver.add_force(1, Vector2(0, 100), Vector2(0, 0))
+    integrate(physics_solver)
+    integrate(physics_solver)
+
+    assert velocity.y == pytest.approx(20)
+
+    physics_solver.clear_forces(1)
+    integrate(physics_solver)
+
+    assert velocity.y == pytest.approx(20)
+
+
+def test_impulses_apply_once(physics_solver):
+    position, velocity = create_body(physics_solver, 1)
+    physics_solver.add_impulse(1, Vector2(5, 0), Vector2(0, 0))
+    records = integrate(physics_solver)
+
+    assert velocity.x == pytest.approx(5)
+    assert records == [(1, 1, pytest.approx(0.5), 0)]
+    # Positions are left to Python, only the velocity is written in place
+    assert position.x == 0
+
+    integrate(physics_solver)
+
+    assert velocity.x == pytest.approx(5)
+
+
+def test_off_center_forces_spin_the_body(physics_solver):
+    create_body(physics_solver, 1)
+    physics_solver.add_impulse(1, Vector2(0, 5), Vector2(0.5, 0))
+    (record,) = integrate(physics_solver)
+
+    assert record[1] & INTEGRATION_FLAG_ROTATION
+
+
+def test_resting_bodies_are_not_integrated(physics_solver):
+    create_body(physics_solver, 1)
+
+    assert integrate(physics_solver) == []
+
+
+def settle(solver: ModuleType, contacts: "list[tuple[int, int]]", frames: int):
+    """Runs frames where every (upper, lower) pair of bodies is touching, the lower one below the upper one."""
+    for age in range(frames):
+        integrate(solver, 0.01)
+        solver.resolve_collisions(
+            b"".join(
+                struct.pack(COLLISION_RECORD_FORMAT, upper, lower, age, 0, 0, 1, 5, 10)
+                for upper, lower in contacts
+            )
+        )
+
+
+def test_resting_bodies_fall_asleep_and_wake_on_impulses(physics_solver):
+    physics_solver.set_sleep_frames(3)
+    _, velocity = create_body(physics_solver, 1)
+    create_body(physics_solver, 2, 0, 10)
+    set_anchored(physics_solver, 2, True)
+    # Gravity keeps the body active, the contact cancels it every frame
+    physics_solver.add_force(1, Vector2(0, 100), Vector2(0, 0))
+    settle(physics_solver, [(1, 2)], 2)
+
+    assert not physics_solver.is_sleeping(1)
+
+    settle(physics_solver, [(1, 2)], 2)
+
+    assert physics_solver.is_sleeping(1)
+    assert velocity.y == 0
+
+    physics_solver.add_impulse(1, Vector2(0, -50), Vector2(0, 0))
+
+    assert not physics_solver.is_sleeping(1)
+    integrate(physics_solver, 0.01)
+    assert velocity.y < 0
+
+
+def test_touching_bodies_sleep_and_wake_together(physics_solver):
+    physics_solver.set_sleep_frames(3)
+    create_body(physics_solver, 1)
+    create_body(physics_solver, 2, 0, 10)
+    create_body(physics_solver, 3, 0, 20)
+    set_anchored(physics_solver, 3, True)
+
+    for instance_id in (1, 2):
+        physics_solver.add_force(instance_id, Vector2(0, 100), Vector2(0, 0))
+
+    settle(physics_solver, [(1, 2), (2, 3)], 4)
+
+    assert physics_solver.is_sleeping(1) and physics_solver.is_sleeping(2)
+
+    physics_solver.wake(2)
+
+    assert not physics_solver.is_sleeping(1)
+
+
+def test_sleeping_can_be_disabled(physics_solver):
+    physics_solver.set_sleep_frames(0)
+    create_body(physics_solver, 1)
+    create_body(physics_solver, 2, 0, 10)
+    set_anchored(physics_solver, 2, True)
+    physics_solver.add_force(1, Vector2(0, 100), Vector2(0, 0))
+    settle(physics_solver, [(1, 2)], 10)
+
+    assert not physics_solver.is_sleeping(1)
+
+
+def test_bullets_are_flagged_for_sweeping(physics_solver):
+    create_body(physics_solver, 1)
+    physics_solver.set_bullet(1, True)
+    physics_solver.add_impulse(1, Vector2(100, 0), Vector2(0, 0))
+    (record,) = integrate(physics_solver)
+
+    assert record[1] & INTEGRATION_FLAG_BULLET
+
+    physics_solver.set_bullet(1, False)
+    physics_solver.wake(1)
+    (record,) = integrate(physics_solver)
+
+    assert not record[1] & INTEGRATION_FLAG_BULLET
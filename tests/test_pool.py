@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+from extro.instances.core.Instance import Instance
+from extro.utils.Pool import Pool
+import extro.internal.ComponentManager as ComponentManager
+import extro.internal.InstanceManager as InstanceManager
+
+
+def test_acquire_creates_instances_when_empty():
+    pool = Pool(Instance)
+    first = pool.acquire()
+    second = pool.acquire()
+
+    assert first is not second
+    assert first.id in InstanceManager.instances
+    assert len(pool) == 0
+
+
+def test_released_instances_are_reused():
+    pool = Pool(Instance)
+    instance = pool.acquire()
+    pool.release(instance)
+
+    assert len(pool) == 1
+    assert pool.acquire() is instance
+    assert instance.id in InstanceManager.instances
+
+
+def test_reset_runs_on_every_acquire():
+    reset: list[Instance] = []
+    pool = Pool(Instance, reset=reset.append)
+    instance = pool.acquire()
+    pool.release(instance)
+    pool.acquire()
+
+    assert reset == [instance, instance]
+
+
+def test_parked_instances_are_hidden_until_acquired():
+    pool = Pool(Instance)
+    instance = pool.acquire()
+    drawable = SimpleNamespace(is_visible=True)
+    ComponentManager.drawables[instance.id] = drawable  # type: ignore
+
+    try:
+        pool.release(instance)
+        assert not drawable.is_visible
+
+        pool.acquire()
+        assert drawable.is_visible
+    finally:
+        del ComponentManager.drawables[instance.id]
+
+
+def test_releasing_twice_warns(logs):
+    pool = Pool(Instance)
+    instance = pool.acquire()
+    pool.release(instance)
+    pool.release(instance)
+
+    assert len(pool) == 1
+    assert logs[-1][1] == f"Instance {instance.id} was already released to the pool"
+
+
+def test_full_pool_destroys_released_instances():
+    pool = Pool(Instance, max_size=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    assert len(pool) == 1
+    assert second.id not in InstanceManager.instances
+
+
+def test_destroyed_parked_instances_are_skipped():
+    pool = Pool(Instance)
+    instance = pool.acquire()
+    pool.release(instance)
+    instance.destroy()
+
+    assert pool.acquire() is not instance
+
+
+def test_clear_destroys_parked_instances():
+    pool = Pool(Instance)
+    instance = pool.acquire()
+    pool.release(instance)
+    pool.clear()
+
+    assert len(pool) == 0
+    assert instance.id not in InstanceManager.instances
+
+
+def test_parked_physics_bodies_keep_their_forces():
+    pool = Pool(Instance)
+    instance = pool.acquire()
+    anchored: list[bool] = []
+    # The `is_anchored` setter clears forces, parking must go around it
+    physics_body = SimpleNamespace(is_anchored=False, _anchor=anchored.append)
+    ComponentManager.physics_bodies[instance.id] = physics_body  # type: ignore
+
+    try:
+        pool.release(instance)
+        assert anchored == [True]
+
+        pool.acquire()
+        assert anchored == [True, False]
+        assert physics_body.is_anchored is False
+    finally:
+        del ComponentManager.physics_bodies[instance.id]
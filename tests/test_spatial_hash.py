@@ -0,0 +1,51 @@
+from extro.internal.utils.SpatialHash import SpatialHash
+
+
+def test_query_finds_instances_in_touched_cells():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.update(1, 0, 0, 5, 5)
+    spatial_hash.update(2, 25, 25, 5, 5)
+    spatial_hash.update(3, -15, 0, 30, 5)
+
+    assert spatial_hash.query(0, 0, 5, 5) == {1, 3}
+    assert spatial_hash.query(20, 20, 5, 5) == {2}
+    assert spatial_hash.query(100, 100, 5, 5) == set()
+    assert len(spatial_hash) == 3
+
+
+def test_update_moves_the_instance():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.update(1, 0, 0, 5, 5)
+    spatial_hash.update(1, 50, 50, 5, 5)
+
+    assert spatial_hash.query(0, 0, 5, 5) == set()
+    assert spatial_hash.query(50, 50, 5, 5) == {1}
+
+
+def test_growing_bounds_cover_every_cell():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.update(1, 0, 0, 5, 5)
+    spatial_hash.update(1, 0, 0, 35, 5)
+
+    assert spatial_hash.query(30, 0, 1, 1) == {1}
+
+
+def test_remove_drops_the_instance_and_its_cells():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.update(1, 0, 0, 15, 15)
+    spatial_hash.update(2, 0, 0, 5, 5)
+    spatial_hash.remove(1)
+    spatial_hash.remove(1)
+
+    assert spatial_hash.query(0, 0, 20, 20) == {2}
+    assert 1 not in spatial_hash
+    assert list(spatial_hash._cells) == [(0, 0)]
+
+
+def test_clear_removes_everything():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.update(1, 0, 0, 5, 5)
+    spatial_hash.clear()
+
+    assert len(spatial_hash) == 0
+    assert spatial_hash.query(0, 0, 5, 5) == set()